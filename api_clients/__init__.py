@@ -2,10 +2,17 @@
 
 
 # Local imports.
-from .api_client import OneOffAPI
+from .api_client import BasePulporoAPI, OneOffAPI
+from .async_api_client import AsyncOneOffAPI
+from .outbox import FlushResult
+from .response_cache import ResponseCache
 
 
 # Public symbols.
 __all__ = [
-    'OneOffAPI'
+    'AsyncOneOffAPI',
+    'BasePulporoAPI',
+    'FlushResult',
+    'OneOffAPI',
+    'ResponseCache',
 ]
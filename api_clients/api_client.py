@@ -1,48 +1,471 @@
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
 
-from typing import Literal, TYPE_CHECKING
+from typing import Any, Callable, Iterator, Literal, Sequence, cast
 
-from requests import (
-    get, post, patch, delete,
-    Response
-)
+from requests import RequestException, Response, Session
+from requests.adapters import HTTPAdapter
 
+from utils import Flow, month_span, parse_date_string
 from utils.data_types import JsonDict
 
+from .json_stream import iter_json_array
+from .local_store import LocalFlowStore
+from .outbox import FlushResult, Outbox, OutboxOperation
+from .response_cache import CacheEntry, CacheKey, ResponseCache
+
 
 class BasePulporoAPI:
+    """
+    Base class of every Pulporo client.
+
+    All instances share one app-wide `Session`, so connections to the API
+    are kept alive and reused instead of being opened for every request.
+    Pool size and timeouts are read from environment variables:
+        PULPORO_POOL_SIZE - max connections kept per host (default 10)
+        PULPORO_CONNECT_TIMEOUT - seconds to wait for a connection (default 3.05)
+        PULPORO_READ_TIMEOUT - seconds to wait for a response (default 10)
+
+    GET responses are kept in one app-wide `ResponseCache` configured with:
+        PULPORO_CACHE_SIZE - max number of cached responses (default 64, 0 disables)
+        PULPORO_CACHE_TTL - seconds a response is served without revalidation (default 60)
+        PULPORO_DETAIL_CACHE_SIZE - max number of cached flow details (default 1024)
+
+    Identical GETs sent at the same time by any clients share one request.
+
+    Flows received from the API are mirrored to a local SQLite database:
+        PULPORO_LOCAL_DB - path of the database (default ~/.pulporo/flows.sqlite3)
+
+    Queued mutations are kept in a durable outbox journal until flushed:
+        PULPORO_OUTBOX - path of the journal (default ~/.pulporo/outbox.jsonl)
+        PULPORO_OUTBOX_BATCH - max operations sent by one flush (default 20)
+    """
+    _shared_session: Session | None = None
+    _shared_cache: ResponseCache | None = None
+    _shared_local_store: LocalFlowStore | None = None
+    _shared_outbox: Outbox | None = None
+    _session_lock: Lock = Lock()
+    _in_flight: dict[CacheKey, Future] = {}
+    _in_flight_lock: Lock = Lock()
+    _request_stats: dict[str, int] = {'requests': 0, 'coalesced': 0}
+    _unpaginated_endpoints: set[str] = set()  # Endpoints answering page requests with the full list
+
     def __init__(self) -> None:
         self._url = os.getenv("PULPORO_API_URL", "http://localhost:8000/")
+        self.pool_size: int = int(os.getenv("PULPORO_POOL_SIZE", "10"))
+        self._timeout: tuple[float, float] = (
+            float(os.getenv("PULPORO_CONNECT_TIMEOUT", "3.05")),
+            float(os.getenv("PULPORO_READ_TIMEOUT", "10")),
+        )
+        self.session: Session = self.get_session()
+        self.cache: ResponseCache = self.get_cache()
+
+    @classmethod
+    def get_session(cls) -> Session:
+        """Return the shared session, creating it with a sized pool on first use."""
+        with BasePulporoAPI._session_lock:
+            if BasePulporoAPI._shared_session is None:
+                pool_size: int = int(os.getenv("PULPORO_POOL_SIZE", "10"))
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session = Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                BasePulporoAPI._shared_session = session
+            return BasePulporoAPI._shared_session
+
+    @classmethod
+    def get_cache(cls) -> ResponseCache:
+        """Return the shared response cache, creating it on first use."""
+        with BasePulporoAPI._session_lock:
+            if BasePulporoAPI._shared_cache is None:
+                BasePulporoAPI._shared_cache = ResponseCache(
+                    max_size=int(os.getenv("PULPORO_CACHE_SIZE", "64")),
+                    ttl=float(os.getenv("PULPORO_CACHE_TTL", "60")),
+                    max_details=int(os.getenv("PULPORO_DETAIL_CACHE_SIZE", "1024")),
+                )
+            return BasePulporoAPI._shared_cache
+
+    @classmethod
+    def reset_cache(cls) -> None:
+        """Drop the shared response cache so it is rebuilt from current settings."""
+        with BasePulporoAPI._session_lock:
+            BasePulporoAPI._shared_cache = None
+            BasePulporoAPI._unpaginated_endpoints.clear()
+
+    @classmethod
+    def get_local_store(cls) -> LocalFlowStore:
+        """Return the shared local mirror, opening it on first use."""
+        with BasePulporoAPI._session_lock:
+            if BasePulporoAPI._shared_local_store is None:
+                default_path: str = os.path.join(os.path.expanduser('~'), '.pulporo', 'flows.sqlite3')
+                BasePulporoAPI._shared_local_store = LocalFlowStore(os.getenv("PULPORO_LOCAL_DB", default_path))
+            return BasePulporoAPI._shared_local_store
+
+    @classmethod
+    def reset_local_store(cls) -> None:
+        """Close the shared local mirror so it is reopened from current settings."""
+        with BasePulporoAPI._session_lock:
+            if BasePulporoAPI._shared_local_store is not None:
+                BasePulporoAPI._shared_local_store.close()
+                BasePulporoAPI._shared_local_store = None
+
+    @property
+    def local_store(self) -> LocalFlowStore:
+        return self.get_local_store()
+
+    @classmethod
+    def get_outbox(cls) -> Outbox:
+        """Return the shared outbox, replaying its journal on first use."""
+        with BasePulporoAPI._session_lock:
+            if BasePulporoAPI._shared_outbox is None:
+                default_path: str = os.path.join(os.path.expanduser('~'), '.pulporo', 'outbox.jsonl')
+                BasePulporoAPI._shared_outbox = Outbox(os.getenv("PULPORO_OUTBOX", default_path))
+            return BasePulporoAPI._shared_outbox
+
+    @classmethod
+    def reset_outbox(cls) -> None:
+        """Forget the shared outbox so it is replayed from current settings."""
+        with BasePulporoAPI._session_lock:
+            BasePulporoAPI._shared_outbox = None
+
+    @property
+    def outbox(self) -> Outbox:
+        return self.get_outbox()
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        """Zero counters of sent and coalesced requests."""
+        with BasePulporoAPI._in_flight_lock:
+            BasePulporoAPI._request_stats = {'requests': 0, 'coalesced': 0}
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return counters of sent and coalesced requests and of the response cache."""
+        return {**BasePulporoAPI._request_stats, **self.cache.stats}
+
+    def _count_request(self) -> None:
+        with BasePulporoAPI._in_flight_lock:
+            BasePulporoAPI._request_stats['requests'] += 1
+
+    def _coalesce(self, key: CacheKey, send_request: Callable[[], Any]) -> Any:
+        """
+        Send request unless an identical one is already in flight,
+        in which case wait for it and share its result.
+        """
+        with BasePulporoAPI._in_flight_lock:
+            future: Future | None = BasePulporoAPI._in_flight.get(key)
+            is_leader: bool = future is None
+            if future is None:
+                future = BasePulporoAPI._in_flight[key] = Future()
+            else:
+                BasePulporoAPI._request_stats['coalesced'] += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = send_request()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with BasePulporoAPI._in_flight_lock:
+                del BasePulporoAPI._in_flight[key]
+
+    @classmethod
+    def close_session(cls) -> None:
+        """Close the shared session and its pooled connections."""
+        with BasePulporoAPI._session_lock:
+            if BasePulporoAPI._shared_session is not None:
+                BasePulporoAPI._shared_session.close()
+                BasePulporoAPI._shared_session = None
 
 
 class OneOffAPI(BasePulporoAPI):
     """Client for the OneOffs Operations."""
+    STREAM_CHUNK_SIZE: int = 64 * 1024  # Bytes read at once by `iter_flow`
+
+    @staticmethod
+    def _pk_to_int(pk: str) -> int | None:
+        """Convert path primary key like '12/' to int."""
+        pk = pk.strip('/')
+        return int(pk) if pk.isdigit() else None
 
     def get_flow(
         self,
         endpoint: Literal['outflows/', 'inflows/'],
         param_dict: dict[str, int] | None = None,
-        pk: int | None = None
-    ) -> list[JsonDict] | list | JsonDict:
+        pk: int | None = None,
+        revalidate: bool = False
+    ) -> list[JsonDict] | list | JsonDict | None:
         """
         Retrieve data from the specified endpoint.
+        Fresh responses are served from the cache, stale ones are
+        revalidated with a conditional request. Concurrent identical
+        calls share one request.
 
         Args:
             endpoint (Literal['outflows/', 'inflows/']): The endpoint to retrieve data from.
             param_dict (dict, optional): Dictionary of query parameters to include in the request. Defaults to None.
             pk (int, optional): Primary key to retrieve a specific record. Defaults to None.
+            revalidate (bool, optional): Ask the server even when cached response is fresh. Defaults to False.
 
         Returns:
-            list[dict] | list | dict: List of dicts of empty list when get many and dict when call by pk.
+            list[dict] | list | dict | None: List of dicts of empty list when get many and dict when call by pk.
+            None for a temporary id which is not pending anymore, the flow has got its server id.
         """
+        if pk is not None and pk < 0:
+            return self.outbox.pending_flow(endpoint, pk)
+
         endpoint_url: str = self._url + endpoint
         if pk:
             endpoint_url += f'{pk}/'
 
-        response: Response = get(endpoint_url, params=param_dict)
+        cache_key = ResponseCache.make_key(endpoint, param_dict, pk)
+        entry: CacheEntry | None = self.cache.get(cache_key)
+        if entry is not None and not revalidate and self.cache.is_fresh(entry):
+            self.cache.record_hit()
+            return self._with_pending(endpoint, param_dict, entry.data)
+
+        data = self._coalesce(cache_key, lambda: self._request_flow(endpoint_url, param_dict, cache_key, entry))
+        return self._with_pending(endpoint, param_dict, data)
+
+    def iter_flow(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        param_dict: dict[str, int] | None = None
+    ) -> Iterator[JsonDict]:
+        """
+        Retrieve flows from the specified endpoint one by one while the response is being received.
+
+        The flows array is decoded incrementally from the response body,
+        so neither the raw body nor the whole list is held in memory.
+        Streamed responses are not cached nor mirrored. Fresh cached
+        responses are still served from the cache and while mutations
+        wait in the outbox the call falls back to `get_flow`, so pending
+        changes are visible.
+
+        Args:
+            endpoint (Literal['outflows/', 'inflows/']): The endpoint to retrieve data from.
+            param_dict (dict, optional): Dictionary of query parameters to include in the request. Defaults to None.
+
+        Yields:
+            dict: Flows in the order sent by the server.
+
+        Raises:
+            requests.HTTPError: When the server does not respond with 200.
+        """
+        cache_key = ResponseCache.make_key(endpoint, param_dict, None)
+        entry: CacheEntry | None = self.cache.get(cache_key)
+        if len(self.outbox) or (entry is not None and self.cache.is_fresh(entry)):
+            yield from cast(list[JsonDict], self.get_flow(endpoint, param_dict))
+            return
+
+        self._count_request()
+        self.cache.record_miss()
+        with self.session.get(
+            self._url + endpoint, params=param_dict, timeout=self._timeout, stream=True
+        ) as response:
+            response.raise_for_status()
+            yield from iter_json_array(
+                response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE), response.encoding or 'utf-8'
+            )
+
+    def _with_pending(
+        self,
+        endpoint: str,
+        param_dict: dict[str, int] | None,
+        data: list[JsonDict] | list | JsonDict
+    ) -> list[JsonDict] | list | JsonDict:
+        """Apply mutations still waiting in the outbox to a month or detail response."""
+        if not len(self.outbox):
+            return data
+        if isinstance(data, dict):
+            flows = self.outbox.overlay(endpoint, [data]) if 'id' in data else [data]
+            return flows[0] if flows else {}
+        if param_dict is not None and param_dict.keys() == {'year', 'month'}:
+            return self.outbox.overlay(endpoint, data, (param_dict['year'], param_dict['month']))
+        return data
+
+    def _request_flow(
+        self,
+        endpoint_url: str,
+        param_dict: dict[str, int] | None,
+        cache_key: CacheKey,
+        entry: CacheEntry | None
+    ) -> list[JsonDict] | list | JsonDict:
+        """Send (conditional) GET request and update the cache with its response."""
+        headers: dict[str, str] = entry.conditional_headers() if entry else {}
+        self._count_request()
+        response: Response = self.session.get(
+            endpoint_url, params=param_dict, headers=headers, timeout=self._timeout
+        )
+        if entry is not None and response.status_code == 304:
+            self.cache.mark_revalidated(cache_key)
+            return entry.data
+
+        self.cache.record_miss()
         list_of_dicts: list[JsonDict] | list | JsonDict = response.json()
+        if response.status_code == 200:
+            self.cache.store(cache_key, list_of_dicts, response.headers)
+            self._mirror_flows(cache_key[0], param_dict, list_of_dicts)
         return list_of_dicts
 
+    def _mirror_flows(
+        self,
+        endpoint: str,
+        param_dict: dict[str, int] | None,
+        data: list[JsonDict] | list | JsonDict
+    ) -> None:
+        """Save detail or whole month response to the local mirror."""
+        if isinstance(data, dict):
+            if 'id' in data:
+                self.local_store.upsert_flow(endpoint, data)
+        elif param_dict is not None and param_dict.keys() == {'year', 'month'}:
+            year, month = param_dict['year'], param_dict['month']
+            self.local_store.replace_month(endpoint, year, month, self.outbox.overlay(endpoint, data, (year, month)))
+
+    def get_local_flow(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        param_dict: dict[str, int]
+    ) -> list[JsonDict] | None:
+        """
+        Retrieve flows of a month from the local mirror without sending a request.
+
+        Returns:
+            list[dict] | None: Mirrored flows or None when month was never received from the API.
+        """
+        year, month = param_dict['year'], param_dict['month']
+        flows: list[JsonDict] | None = self.local_store.get_month(endpoint, year, month)
+        return None if flows is None else self.outbox.overlay(endpoint, flows, (year, month))
+
+    def sync_flows(self, endpoint: Literal['outflows/', 'inflows/']) -> int:
+        """
+        Request only flows changed since the last sync and merge them into the local mirror.
+
+        The API is asked with `modified_since` set to the newest `last_modification`
+        received so far (everything on the first sync). Flows returned with
+        `deleted: true` are tombstones and are removed locally. Cached months
+        of changed flows are evicted.
+
+        Returns:
+            int: Number of changed and deleted flows.
+        """
+        watermark: str | None = self.local_store.get_watermark(endpoint)
+        params: dict[str, str] = {'modified_since': watermark} if watermark else {}
+        self._count_request()
+        response: Response = self.session.get(self._url + endpoint, params=params, timeout=self._timeout)
+        response.raise_for_status()
+        changes: list[JsonDict] = response.json()
+
+        changed: list[JsonDict] = []
+        deleted_ids: list[int] = []
+        for flow in changes:
+            if flow.get('deleted'):
+                deleted_ids.append(cast(int, flow['id']))
+            else:
+                changed.append(flow)
+            self.cache.invalidate_flow(endpoint, cast(int, flow['id']), dates=(flow.get('date'),))
+            modified = flow.get('last_modification')
+            if modified and (not watermark or parse_date_string(str(modified)) > parse_date_string(watermark)):
+                watermark = str(modified)
+
+        self.local_store.merge_changes(endpoint, changed, deleted_ids, watermark or '')
+        return len(changes)
+
+    def cached_flow(self, endpoint: Literal['outflows/', 'inflows/'], pk: int) -> JsonDict | None:
+        """Return flow detail when it is fresh in the cache, without sending a request."""
+        if pk < 0:
+            return self.outbox.pending_flow(endpoint, pk)
+        entry: CacheEntry | None = self.cache.get(ResponseCache.make_key(endpoint, pk=pk))
+        if entry is None or not self.cache.is_fresh(entry):
+            return None
+        self.cache.record_hit()
+        return cast(JsonDict, self._with_pending(endpoint, None, entry.data))
+
+    def get_flow_range(
+        self,
+        endpoints: Sequence[Literal['outflows/', 'inflows/']],
+        start: tuple[int, int],
+        end: tuple[int, int],
+        max_workers: int | None = None
+    ) -> Iterator[tuple[str, Flow]]:
+        """
+        Retrieve flows of several endpoints for every month from start to end.
+
+        Months are requested concurrently by a bounded pool of threads
+        and yielded month by month in date order as soon as every
+        endpoint of the month has arrived, while later months keep loading.
+
+        Args:
+            endpoints (Sequence[Literal['outflows/', 'inflows/']]): Endpoints to retrieve data from.
+            start (tuple[int, int]): The (year, month) of the first month.
+            end (tuple[int, int]): The (year, month) of the last month, included.
+            max_workers (int, optional): Max requests in flight. Defaults to the pool size.
+
+        Yields:
+            tuple[str, Flow]: Endpoint and compact flow record, ordered by flow date.
+        """
+        executor = ThreadPoolExecutor(max_workers=max_workers or self.pool_size)
+        try:
+            futures: list[list[tuple[str, Future]]] = [
+                [
+                    (endpoint, executor.submit(self.get_flow, endpoint, {'year': year, 'month': month}))
+                    for endpoint in endpoints
+                ]
+                for year, month in month_span(start, end)
+            ]
+            for month_futures in futures:
+                month_flows: list[tuple[str, Flow]] = [
+                    (endpoint, Flow.from_json(flow)) for endpoint, future in month_futures for flow in future.result()
+                ]
+                month_flows.sort(key=lambda item: str(item[1].date))
+                yield from month_flows
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_flow_page(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        param_dict: dict[str, int] | None,
+        page: int,
+        page_size: int
+    ) -> tuple[int, list[JsonDict]]:
+        """
+        Retrieve one page of flows from the specified endpoint.
+
+        Args:
+            endpoint (Literal['outflows/', 'inflows/']): The endpoint to retrieve data from.
+            param_dict (dict, optional): Dictionary of query parameters to include in the request.
+            page (int): Number of the page starting from 1.
+            page_size (int): Number of flows on one page.
+
+        Returns:
+            tuple[int, list[dict]]: Total number of flows and flows of the page.
+            When API does not paginate, the page is cut from the full list,
+            which is requested and cached once for all pages.
+        """
+        flows: list[JsonDict] | None = None
+        if endpoint not in self._unpaginated_endpoints:
+            params: dict[str, int] = {**(param_dict or {}), 'page': page, 'page_size': page_size}
+            data = self.get_flow(endpoint, params)
+            if isinstance(data, dict):
+                return cast(int, data['count']), cast(list[JsonDict], data['results'])
+            # Page params were ignored, keep the full list under the key without them
+            BasePulporoAPI._unpaginated_endpoints.add(endpoint)
+            self.cache.rekey(ResponseCache.make_key(endpoint, params), ResponseCache.make_key(endpoint, param_dict))
+            flows = cast(list[JsonDict], data)
+
+        if flows is None:
+            flows = cast(list[JsonDict], self.get_flow(endpoint, param_dict))
+        start: int = (page - 1) * page_size
+        return len(flows), flows[start:start + page_size]
+
     def post_flow(
         self,
         endpoint: Literal['outflows/', 'inflows/'],
@@ -50,6 +473,7 @@ class OneOffAPI(BasePulporoAPI):
     ) -> Response:
         """
         Send a POST request to the specified endpoint.
+        Evict cached month of the new flow.
 
         Args:
             endpoint (Literal['outflows/', 'inflows/']): The endpoint to send the POST request to.
@@ -59,7 +483,11 @@ class OneOffAPI(BasePulporoAPI):
             Response: The response from the endpoint.
         """
         endpoint_url: str = self._url + endpoint
-        response: Response = post(endpoint_url, json=json)
+        self._count_request()
+        response: Response = self.session.post(endpoint_url, json=json, timeout=self._timeout)
+        self.cache.invalidate_flow(endpoint, dates=(json.get('date'),))
+        if response.status_code == 201:
+            self.local_store.upsert_flow(endpoint, response.json())
         return response
 
     def patch_flow(
@@ -70,17 +498,25 @@ class OneOffAPI(BasePulporoAPI):
     ) -> Response:
         """
         Send a PATCH request to the specified endpoint.
+        Evict cached old and new month of the flow and its detail.
 
         Args:
             endpoint (Literal['outflows/', 'inflows/']): The endpoint to send the PATCH request to.
-            json (dict): The JSON payload to include in the PATCH request.
+            json (dict): Changed fields of the flow.
             pk (str): The primary key to identify the specific record to update.
 
         Returns:
             Response: The response from the endpoint.
         """
         endpoint_url: str = self._url + endpoint + pk
-        response: Response = patch(endpoint_url, json=json)
+        self._count_request()
+        response: Response = self.session.patch(endpoint_url, json=json, timeout=self._timeout)
+        dates: tuple[Any, ...] = (json.get('date'),)
+        if response.status_code == 200:
+            flow: JsonDict = response.json()
+            self.local_store.upsert_flow(endpoint, flow)
+            dates += (flow.get('date'),)  # Payload has the date only when it was changed
+        self.cache.invalidate_flow(endpoint, self._pk_to_int(pk), dates=dates)
         return response
 
     def delete_flow(
@@ -90,6 +526,7 @@ class OneOffAPI(BasePulporoAPI):
     ) -> Response:
         """
         Send a DELETE request to the specified endpoint.
+        Evict cached month of the flow and its detail.
 
         Args:
             endpoint (Literal['outflows/', 'inflows/']): The endpoint to send the DELETE request to.
@@ -99,5 +536,129 @@ class OneOffAPI(BasePulporoAPI):
             Response: The response from the endpoint.
         """
         final_endpoint: str = self._url + endpoint + pk
-        response: Response = delete(final_endpoint)
+        self._count_request()
+        response: Response = self.session.delete(final_endpoint, timeout=self._timeout)
+        self.cache.invalidate_flow(endpoint, self._pk_to_int(pk))
+        if response.status_code == 204 and (flow_pk := self._pk_to_int(pk)) is not None:
+            self.local_store.delete_flow(endpoint, flow_pk)
         return response
+
+    def queue_post(self, endpoint: Literal['outflows/', 'inflows/'], json: JsonDict) -> JsonDict:
+        """
+        Queue creation of a flow in the outbox and add it to the local mirror
+        under a temporary negative id until the API assigns the real one.
+
+        Returns:
+            dict: The optimistic flow.
+        """
+        operation = OutboxOperation('POST', endpoint, self.outbox.new_temp_id(), json)
+        self.outbox.append(operation)
+        flow: JsonDict = {**json, 'id': operation.pk}
+        self.local_store.upsert_flow(endpoint, flow)
+        return flow
+
+    def queue_patch(self, endpoint: Literal['outflows/', 'inflows/'], json: JsonDict, pk: int) -> None:
+        """
+        Queue update of a flow in the outbox and apply it to the local mirror.
+
+        Raises:
+            ValueError: When pk is not an integer id.
+        """
+        self.outbox.append(OutboxOperation('PATCH', endpoint, pk, json))
+        if (flow := self.local_store.get_flow(endpoint, pk)) is not None:
+            self.local_store.upsert_flow(endpoint, {**flow, **json})
+
+    def queue_delete(self, endpoint: Literal['outflows/', 'inflows/'], pk: int) -> None:
+        """
+        Queue removal of a flow in the outbox and remove it from the local mirror.
+
+        Raises:
+            ValueError: When pk is not an integer id.
+        """
+        self.outbox.append(OutboxOperation('DELETE', endpoint, pk))
+        self.local_store.delete_flow(endpoint, pk)
+
+    def flush_outbox(self, batch_size: int | None = None) -> FlushResult:
+        """
+        Send a batch of queued mutations in journal order.
+
+        Operations on one flow keep their order: when one of them cannot be sent,
+        later ones on the same flow wait for the next flush. Server errors are
+        retried on the next flush, rejected operations (4xx) are dropped and
+        reported, and a connection error stops the flush.
+
+        Returns:
+            FlushResult: Numbers of sent and pending operations, list of rejected ones
+                and flows returned by the API for sent PATCHes.
+        """
+        result = FlushResult()
+        if not self.outbox.flush_lock.acquire(blocking=False):
+            result.pending = len(self.outbox)
+            return result  # Another flush is running
+
+        try:
+            batch_size = batch_size or int(os.getenv("PULPORO_OUTBOX_BATCH", "20"))
+            blocked: set[tuple[str, int]] = set()
+            for operation in self.outbox.pending()[:batch_size]:
+                if operation.flow_key in blocked or (operation.pk < 0 and operation.method != 'POST'):
+                    blocked.add(operation.flow_key)
+                    continue
+                try:
+                    response: Response = self._send_operation(operation)
+                except RequestException:
+                    break
+
+                if response.status_code < 300 or (operation.method == 'DELETE' and response.status_code == 404):
+                    self._operation_sent(operation, response)
+                    result.sent += 1
+                    if operation.method == 'PATCH' and response.status_code == 200:
+                        result.patched.append((operation.endpoint, response.json()))
+                elif response.status_code >= 500:
+                    blocked.add(operation.flow_key)
+                else:
+                    self._operation_rejected(operation)
+                    result.failed.append(operation)
+        finally:
+            self.outbox.flush_lock.release()
+
+        result.pending = len(self.outbox)
+        return result
+
+    def _send_operation(self, operation: OutboxOperation) -> Response:
+        """Send queued operation with the matching request method."""
+        endpoint = cast(Literal['outflows/', 'inflows/'], operation.endpoint)
+        if operation.method == 'POST':
+            return self.post_flow(endpoint, cast(JsonDict, operation.json))
+        if operation.method == 'PATCH':
+            return self.patch_flow(endpoint, cast(JsonDict, operation.json), f'{operation.pk}/')
+        return self.delete_flow(endpoint, f'{operation.pk}/')
+
+    def _operation_sent(self, operation: OutboxOperation, response: Response) -> None:
+        """Acknowledge operation and replace temporary id of a created flow."""
+        server_pk: int | None = None
+        if operation.method == 'POST':
+            server_pk = response.json()['id']
+            self.local_store.delete_flow(operation.endpoint, operation.pk)
+        self.outbox.ack(operation, server_pk)
+
+    def _operation_rejected(self, operation: OutboxOperation) -> None:
+        """Drop rejected operation and its optimistic effects from the cache and the local mirror."""
+        self.outbox.ack(operation)
+        if operation.method == 'POST':
+            self.local_store.delete_flow(operation.endpoint, operation.pk)
+            return
+        self.cache.invalidate_flow(operation.endpoint, operation.pk)
+        self._restore_local_flow(cast(Literal['outflows/', 'inflows/'], operation.endpoint), operation.pk)
+
+    def _restore_local_flow(self, endpoint: Literal['outflows/', 'inflows/'], pk: int) -> None:
+        """
+        Replace optimistic local copy of a flow with the one kept by the API.
+        When it cannot be received, mirrored months and delta sync of the endpoint
+        are forgotten, so the next request or sync rewrites them.
+        """
+        try:
+            flow = self.get_flow(endpoint, pk=pk, revalidate=True)  # Mirrored on success
+        except (RequestException, ValueError):
+            flow = None
+        if not isinstance(flow, dict) or flow.get('id') != pk:
+            self.local_store.forget_synced(endpoint)
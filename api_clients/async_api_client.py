@@ -0,0 +1,64 @@
+import asyncio
+
+from typing import Any, Callable, Literal
+
+from requests import Response
+
+from utils.data_types import JsonDict
+
+from .api_client import OneOffAPI
+
+
+class AsyncOneOffAPI:
+    """
+    Asyncio counterpart of `OneOffAPI` for the OneOffs Operations.
+
+    Each call runs the blocking client in a worker thread, so Textual handlers
+    can await it without blocking the event loop. Several requests may be
+    in flight at once (e.g. with `asyncio.gather`), bounded by the size
+    of the shared connection pool.
+    """
+
+    def __init__(self, max_in_flight: int | None = None) -> None:
+        self.sync_api = OneOffAPI()
+        self._limiter = asyncio.Semaphore(max_in_flight or self.sync_api.pool_size)
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run blocking client method in a thread, limiting requests in flight."""
+        async with self._limiter:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def get_flow(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        param_dict: dict[str, int] | None = None,
+        pk: int | None = None,
+        revalidate: bool = False
+    ) -> list[JsonDict] | list | JsonDict | None:
+        """Awaitable version of `OneOffAPI.get_flow`."""
+        return await self._run(self.sync_api.get_flow, endpoint, param_dict, pk, revalidate)
+
+    async def post_flow(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        json: JsonDict
+    ) -> Response:
+        """Awaitable version of `OneOffAPI.post_flow`."""
+        return await self._run(self.sync_api.post_flow, endpoint, json)
+
+    async def patch_flow(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        json: JsonDict,
+        pk: str
+    ) -> Response:
+        """Awaitable version of `OneOffAPI.patch_flow`."""
+        return await self._run(self.sync_api.patch_flow, endpoint, json, pk)
+
+    async def delete_flow(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        pk: str
+    ) -> Response:
+        """Awaitable version of `OneOffAPI.delete_flow`."""
+        return await self._run(self.sync_api.delete_flow, endpoint, pk)
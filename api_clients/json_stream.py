@@ -0,0 +1,93 @@
+import codecs
+import json
+
+from typing import Any, Iterable, Iterator
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+_SCALAR_END = _WHITESPACE + ',]'  # Characters that may follow an array item
+
+
+def _skip_whitespace(buffer: str, pos: int) -> int:
+    """Return position of the first non-whitespace character at or after pos."""
+    while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def iter_json_array(chunks: Iterable[bytes | str], encoding: str = 'utf-8') -> Iterator[Any]:
+    """
+    Decode items of a top-level JSON array from chunks of its text one by one.
+
+    Only the item being decoded and the rest of the current chunk are held
+    in memory, so items are available before the whole body is received.
+
+    Args:
+        chunks (Iterable[bytes | str]): Pieces of the JSON text, e.g. `Response.iter_content()`.
+        encoding (str): Encoding of byte chunks. Defaults to 'utf-8'.
+
+    Yields:
+        Any: Decoded array items in order.
+
+    Raises:
+        json.JSONDecodeError: When the text is not a JSON array.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    chunk_iter = iter(chunks)
+    buffer: str = ''
+    pos: int = 0
+    exhausted: bool = False
+
+    def read_more() -> bool:
+        nonlocal buffer, pos, exhausted
+        for chunk in chunk_iter:
+            text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                buffer = buffer[pos:] + text
+                pos = 0
+                return True
+        if not exhausted:
+            buffer = buffer[pos:] + decoder.decode(b'', final=True)
+            pos = 0
+            exhausted = True
+        return False
+
+    def next_token() -> str:
+        nonlocal pos
+        pos = _skip_whitespace(buffer, pos)
+        while pos >= len(buffer):
+            if not read_more():
+                raise json.JSONDecodeError('Unexpected end of JSON array', buffer, pos)
+            pos = _skip_whitespace(buffer, pos)
+        return buffer[pos]
+
+    if next_token() != '[':
+        raise json.JSONDecodeError('Expected JSON array', buffer, pos)
+    pos += 1
+    if next_token() == ']':
+        return
+
+    while True:
+        next_token()
+        while True:
+            try:
+                item, end = _DECODER.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+                read_more()
+                continue
+            # Objects, arrays and strings end with their closing character, while a number
+            # or literal is complete only when followed by a delimiter, e.g. '1.' may be '1.5'
+            if buffer[pos] in '{["' or (end < len(buffer) and buffer[end] in _SCALAR_END) or exhausted:
+                break
+            read_more()
+        pos = end
+        yield item
+
+        token = next_token()
+        pos += 1
+        if token == ']':
+            return
+        if token != ',':
+            raise json.JSONDecodeError("Expected ',' or ']'", buffer, pos - 1)
@@ -0,0 +1,169 @@
+import json
+import os
+import sqlite3
+import time
+
+from threading import Lock
+from typing import Any
+
+from utils import shift_month
+from utils.data_types import JsonDict
+
+
+class LocalFlowStore:
+    """
+    Local SQLite mirror of flows indexed by endpoint and date.
+
+    Holds every flow the client has seen so data can be shown before
+    the API answers and read while it is unreachable.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS flows (
+        endpoint TEXT NOT NULL,
+        id INTEGER NOT NULL,
+        date TEXT,
+        payload TEXT NOT NULL,
+        PRIMARY KEY (endpoint, id)
+    );
+    CREATE INDEX IF NOT EXISTS flows_by_date ON flows (endpoint, date);
+    CREATE TABLE IF NOT EXISTS synced_months (
+        endpoint TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        month INTEGER NOT NULL,
+        synced_at REAL NOT NULL,
+        PRIMARY KEY (endpoint, year, month)
+    );
+    CREATE TABLE IF NOT EXISTS sync_state (
+        endpoint TEXT PRIMARY KEY,
+        watermark TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS snapshots (
+        name TEXT PRIMARY KEY,
+        payload TEXT NOT NULL
+    );
+    """
+
+    def __init__(self, path: str) -> None:
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = Lock()
+        with self._lock, self._connection:
+            self._connection.executescript(self.SCHEMA)
+
+    @staticmethod
+    def month_range(year: int, month: int) -> tuple[str, str]:
+        """Return first day of the month and of the next one as 'YYYY-MM-DD'."""
+        next_year, next_month = shift_month(year, month, 1)
+        return f'{year:04}-{month:02}-01', f'{next_year:04}-{next_month:02}-01'
+
+    def get_month(self, endpoint: str, year: int, month: int) -> list[JsonDict] | None:
+        """
+        Return flows of the month ordered by date or None when neither
+        the month nor the whole endpoint (delta sync) was ever synced.
+        """
+        start, end = self.month_range(year, month)
+        with self._lock:
+            synced = self._connection.execute(
+                'SELECT 1 FROM synced_months WHERE endpoint = ? AND year = ? AND month = ? '
+                'UNION ALL SELECT 1 FROM sync_state WHERE endpoint = ?',
+                (endpoint, year, month, endpoint)
+            ).fetchone()
+            if synced is None:
+                return None
+            rows = self._connection.execute(
+                'SELECT payload FROM flows WHERE endpoint = ? AND date >= ? AND date < ? ORDER BY date, id',
+                (endpoint, start, end)
+            ).fetchall()
+        return [json.loads(payload) for payload, in rows]
+
+    def replace_month(self, endpoint: str, year: int, month: int, flows: list[JsonDict]) -> None:
+        """Make mirrored month exactly match flows returned by the API."""
+        start, end = self.month_range(year, month)
+        with self._lock, self._connection:
+            self._connection.execute(
+                'DELETE FROM flows WHERE endpoint = ? AND date >= ? AND date < ?',
+                (endpoint, start, end)
+            )
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO flows (endpoint, id, date, payload) VALUES (?, ?, ?, ?)',
+                [(endpoint, flow['id'], flow.get('date'), json.dumps(flow)) for flow in flows]
+            )
+            self._connection.execute(
+                'INSERT OR REPLACE INTO synced_months (endpoint, year, month, synced_at) VALUES (?, ?, ?, ?)',
+                (endpoint, year, month, time.time())
+            )
+
+    def get_flow(self, endpoint: str, pk: int) -> JsonDict | None:
+        """Return mirrored flow by primary key."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT payload FROM flows WHERE endpoint = ? AND id = ?', (endpoint, pk)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def all_flows(self) -> list[tuple[str, JsonDict]]:
+        """Return every mirrored flow with its endpoint."""
+        with self._lock:
+            rows = self._connection.execute('SELECT endpoint, payload FROM flows ORDER BY date, id').fetchall()
+        return [(endpoint, json.loads(payload)) for endpoint, payload in rows]
+
+    def upsert_flow(self, endpoint: str, flow: dict[str, Any]) -> None:
+        """Insert or update a single flow."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO flows (endpoint, id, date, payload) VALUES (?, ?, ?, ?)',
+                (endpoint, flow['id'], flow.get('date'), json.dumps(flow))
+            )
+
+    def delete_flow(self, endpoint: str, pk: int) -> None:
+        """Remove a single flow."""
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM flows WHERE endpoint = ? AND id = ?', (endpoint, pk))
+
+    def get_watermark(self, endpoint: str) -> str | None:
+        """Return last_modification of the newest change received by delta sync."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT watermark FROM sync_state WHERE endpoint = ?', (endpoint,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def merge_changes(self, endpoint: str, flows: list[JsonDict], deleted_ids: list[int], watermark: str) -> None:
+        """Apply changed flows and tombstones of a delta sync and move the watermark."""
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO flows (endpoint, id, date, payload) VALUES (?, ?, ?, ?)',
+                [(endpoint, flow['id'], flow.get('date'), json.dumps(flow)) for flow in flows]
+            )
+            self._connection.executemany(
+                'DELETE FROM flows WHERE endpoint = ? AND id = ?',
+                [(endpoint, pk) for pk in deleted_ids]
+            )
+            self._connection.execute(
+                'INSERT OR REPLACE INTO sync_state (endpoint, watermark) VALUES (?, ?)',
+                (endpoint, watermark)
+            )
+
+    def forget_synced(self, endpoint: str) -> None:
+        """Mark months and delta sync of endpoint as never synced, so they are fully received again."""
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM synced_months WHERE endpoint = ?', (endpoint,))
+            self._connection.execute('DELETE FROM sync_state WHERE endpoint = ?', (endpoint,))
+
+    def get_snapshot(self, name: str) -> Any:
+        """Return data saved under name, e.g. the last shown table of a view."""
+        with self._lock:
+            row = self._connection.execute('SELECT payload FROM snapshots WHERE name = ?', (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_snapshot(self, name: str, data: Any) -> None:
+        """Replace data saved under name."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO snapshots (name, payload) VALUES (?, ?)', (name, json.dumps(data))
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,163 @@
+import json
+import os
+import uuid
+
+from dataclasses import asdict, dataclass, field
+from threading import Lock
+from typing import Any, Literal
+
+from utils.data_types import JsonDict
+
+from .response_cache import month_of
+
+
+@dataclass
+class OutboxOperation:
+    """Mutation waiting to be sent to the API"""
+    method: Literal['POST', 'PATCH', 'DELETE']
+    endpoint: str
+    pk: int  # Negative temporary id for flows not created on the server yet
+    json: JsonDict | None = None
+    op_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def __post_init__(self) -> None:
+        """Refuse operations the API could never accept, so they do not block the journal."""
+        if self.method not in ('POST', 'PATCH', 'DELETE'):
+            raise ValueError(f'Unknown outbox method {self.method!r}')
+        if not isinstance(self.pk, int) or isinstance(self.pk, bool):
+            raise ValueError(f'{self.method} of {self.endpoint} needs an integer id, got {self.pk!r}')
+
+    @property
+    def flow_key(self) -> tuple[str, int]:
+        return self.endpoint, self.pk
+
+
+@dataclass
+class FlushResult:
+    """Summary of one outbox flush"""
+    sent: int = 0
+    failed: list[OutboxOperation] = field(default_factory=list)
+    pending: int = 0
+    patched: list[tuple[str, JsonDict]] = field(default_factory=list)  # Endpoint and flow returned for sent PATCHes
+
+
+class Outbox:
+    """
+    Durable append-only journal of mutations waiting to be sent to the API.
+
+    Every operation is written and fsynced before it is applied locally,
+    and acknowledged with another journal line once the API accepted it,
+    so nothing is lost on a crash or network drop. The journal is replayed
+    on start and compacted once every operation is acknowledged.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = Lock()
+        self.flush_lock = Lock()
+        self._pending: list[OutboxOperation] = []
+        self._next_temp_id: int = -1
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._replay()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _replay(self) -> None:
+        """Rebuild pending operations from the journal."""
+        if not os.path.exists(self.path):
+            return
+        operations: dict[str, OutboxOperation] = {}
+        with open(self.path, encoding='utf-8') as journal:
+            for line in journal:
+                try:
+                    record: dict[str, Any] = json.loads(line)
+                    if record.pop('type') == 'op':
+                        operation = OutboxOperation(**record)
+                    else:
+                        acked = operations.pop(record['op_id'], None)
+                        if acked is not None and isinstance(record.get('pk'), int):
+                            self._remap(acked.flow_key, record['pk'], list(operations.values()))
+                        continue
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue  # Line cut short by a crash or not a valid record
+                operations[operation.op_id] = operation
+                self._next_temp_id = min(self._next_temp_id, operation.pk - 1)
+        self._pending = list(operations.values())
+        self._compact()
+
+    def _write(self, record: dict[str, Any]) -> None:
+        with open(self.path, 'a', encoding='utf-8') as journal:
+            journal.write(json.dumps(record) + '\n')
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def _compact(self) -> None:
+        """Rewrite journal with pending operations only."""
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as journal:
+            for operation in self._pending:
+                journal.write(json.dumps({'type': 'op', **asdict(operation)}) + '\n')
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _remap(flow_key: tuple[str, int], pk: int, operations: list[OutboxOperation]) -> None:
+        """Point operations on a temporary id to the id assigned by the server."""
+        for operation in operations:
+            if operation.flow_key == flow_key:
+                operation.pk = pk
+
+    def new_temp_id(self) -> int:
+        with self._lock:
+            temp_id = self._next_temp_id
+            self._next_temp_id -= 1
+            return temp_id
+
+    def append(self, operation: OutboxOperation) -> None:
+        """Durably queue an operation."""
+        with self._lock:
+            self._write({'type': 'op', **asdict(operation)})
+            self._pending.append(operation)
+
+    def ack(self, operation: OutboxOperation, pk: int | None = None) -> None:
+        """
+        Mark operation as done. For POST `pk` is the id given by the server
+        and replaces the temporary one in later operations.
+        """
+        with self._lock:
+            self._write({'type': 'ack', 'op_id': operation.op_id, 'pk': pk})
+            self._pending.remove(operation)
+            if pk is not None:
+                self._remap(operation.flow_key, pk, self._pending)
+            if not self._pending:
+                self._compact()
+
+    def pending(self, endpoint: str | None = None) -> list[OutboxOperation]:
+        """Return pending operations in journal order."""
+        with self._lock:
+            return [op for op in self._pending if endpoint is None or op.endpoint == endpoint]
+
+    def pending_flow(self, endpoint: str, pk: int) -> JsonDict | None:
+        """Return flow created by a pending POST, with later pending changes applied."""
+        return next((flow for flow in self.overlay(endpoint, []) if flow['id'] == pk), None)
+
+    def overlay(self, endpoint: str, flows: list[JsonDict], month: tuple[int, int] | None = None) -> list[JsonDict]:
+        """
+        Return flows of a response with pending operations applied.
+        With `month` keep only flows dated in that (year, month).
+        """
+        operations = self.pending(endpoint)
+        if not operations:
+            return flows
+
+        by_id: dict[Any, JsonDict] = {flow['id']: flow for flow in flows}
+        for operation in operations:
+            if operation.method == 'POST':
+                by_id[operation.pk] = {**(operation.json or {}), 'id': operation.pk}
+            elif operation.method == 'PATCH' and operation.pk in by_id:
+                by_id[operation.pk] = {**by_id[operation.pk], **(operation.json or {})}
+            elif operation.method == 'DELETE':
+                by_id.pop(operation.pk, None)
+        return [flow for flow in by_id.values() if month is None or month_of(flow.get('date')) == month]
@@ -0,0 +1,202 @@
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Mapping
+
+CacheKey = tuple[str, tuple[tuple[str, Any], ...], int | None]
+
+
+def month_of(date: Any) -> tuple[int, int] | None:
+    """Return (year, month) of a 'YYYY-MM-DD' date string or None when it is not parsable."""
+    try:
+        year, month = str(date).split('-')[:2]
+        return int(year), int(month)
+    except ValueError:
+        return None
+
+
+@dataclass
+class CacheEntry:
+    """Decoded response body with validators used for revalidation"""
+    data: Any
+    etag: str | None = None
+    last_modified: str | None = None
+    stored_at: float = field(default_factory=time.monotonic)
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Return headers turning a GET into a conditional request."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def flows_in(data: Any) -> list[dict]:
+    """Return flows held by a list, paginated or detail response."""
+    if isinstance(data, list):
+        return [flow for flow in data if isinstance(flow, dict) and 'id' in flow]
+    if isinstance(data, dict):
+        if isinstance(data.get('results'), list):
+            return flows_in(data['results'])
+        if 'id' in data:
+            return [data]
+    return []
+
+
+class ResponseCache:
+    """
+    Thread-safe bounded LRU cache of GET responses.
+
+    Entries younger than `ttl` seconds are served without touching the network.
+    Older ones are revalidated with ETag / Last-Modified and reused on 304.
+    Flow details keyed by (endpoint, pk) live in a separate LRU of `max_details`
+    entries which is pre-filled with every flow of stored list responses.
+    """
+
+    def __init__(self, max_size: int = 64, ttl: float = 60.0, max_details: int = 1024) -> None:
+        self.max_size = max_size
+        self.max_details = max_details
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self._details: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self._flow_months: dict[tuple[str, int], tuple[int, int]] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries or key in self._details
+
+    @staticmethod
+    def make_key(endpoint: str, param_dict: Mapping[str, Any] | None = None, pk: int | None = None) -> CacheKey:
+        """Build key from endpoint, sorted query params and primary key."""
+        return endpoint, tuple(sorted((param_dict or {}).items())), pk
+
+    def _bucket(self, key: CacheKey) -> OrderedDict[CacheKey, CacheEntry]:
+        """Return LRU holding the key: details for keys with pk, responses otherwise."""
+        return self._details if key[2] is not None else self._entries
+
+    def get(self, key: CacheKey) -> CacheEntry | None:
+        """Return entry and mark it as most recently used."""
+        with self._lock:
+            bucket = self._bucket(key)
+            entry = bucket.get(key)
+            if entry is not None:
+                bucket.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Check whether entry can be served without revalidation."""
+        return time.monotonic() - entry.stored_at < self.ttl
+
+    def store(self, key: CacheKey, data: Any, headers: Mapping[str, str] | None = None) -> None:
+        """Save response data and its validators, evicting least recently used entries."""
+        if self.max_size <= 0:
+            return
+        headers = headers or {}
+        entry = CacheEntry(data, headers.get('ETag'), headers.get('Last-Modified'))
+        with self._lock:
+            flows = flows_in(data)
+            self._index_flows(key[0], flows)
+            if key[2] is None:
+                self._prefill_details(key[0], flows)
+            self._put(self._bucket(key), key, entry)
+
+    def rekey(self, key: CacheKey, new_key: CacheKey) -> None:
+        """Move entry to other key, e.g. when query params did not change the response."""
+        with self._lock:
+            bucket = self._bucket(key)
+            entry = bucket.pop(key, None)
+            if entry is not None:
+                self._put(bucket, new_key, entry)
+
+    def _put(self, bucket: OrderedDict[CacheKey, CacheEntry], key: CacheKey, entry: CacheEntry) -> None:
+        """Insert entry as most recently used and trim bucket to its size."""
+        bucket[key] = entry
+        bucket.move_to_end(key)
+        max_size = self.max_details if bucket is self._details else self.max_size
+        while len(bucket) > max_size:
+            bucket.popitem(last=False)
+
+    def _prefill_details(self, endpoint: str, flows: list[dict]) -> None:
+        """Store every flow of a list response as its detail entry."""
+        if self.max_details <= 0:
+            return
+        for flow in flows:
+            self._put(self._details, self.make_key(endpoint, pk=flow['id']), CacheEntry(flow))
+
+    def mark_revalidated(self, key: CacheKey) -> None:
+        """Restart entry TTL after server answered 304 Not Modified."""
+        with self._lock:
+            entry = self._bucket(key).get(key)
+            if entry is not None:
+                entry.stored_at = time.monotonic()
+            self.revalidations += 1
+            self.hits += 1
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def _index_flows(self, endpoint: str, flows: list[dict]) -> None:
+        """Remember the month of every flow in response to find it on invalidation."""
+        for flow in flows:
+            if month := month_of(flow.get('date')):
+                self._flow_months[(endpoint, flow['id'])] = month
+
+    def flow_month(self, endpoint: str, pk: int) -> tuple[int, int] | None:
+        """Return (year, month) the flow was last seen in."""
+        return self._flow_months.get((endpoint, pk))
+
+    def invalidate_flow(self, endpoint: str, pk: int | None = None, dates: tuple[Any, ...] = ()) -> None:
+        """
+        Evict only the entries a mutation of a flow touches:
+        months of the given dates, the month flow was last seen in and its detail.
+        Evict the whole endpoint when no month can be determined.
+        """
+        months: set[tuple[int, int]] = {month for date in dates if (month := month_of(date))}
+        with self._lock:
+            if pk is not None:
+                self._details.pop(self.make_key(endpoint, pk=pk), None)
+                if known_month := self._flow_months.pop((endpoint, pk), None):
+                    months.add(known_month)
+            if not months:
+                stale_keys = [key for key in self._entries if key[0] == endpoint]
+            else:
+                stale_keys = [
+                    key for key in self._entries
+                    if key[0] == endpoint and (dict(key[1]).get('year'), dict(key[1]).get('month')) in months
+                ]
+            for key in stale_keys:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._details.clear()
+            self._flow_months.clear()
+            self.hits = self.misses = self.revalidations = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return counters describing cache efficiency."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'size': len(self._entries),
+            'details': len(self._details),
+        }
@@ -1,9 +1,20 @@
 """Forms provides a comprehensive set of forms for various tasks within the application."""
 
+from typing import TYPE_CHECKING
 
-# Local imports.
-from .fields import NotBlinkingInput, NotBlinkingTextArea
-from .forms import InflowsForm, OutflowsForm
+from utils.lazy_import import lazy_getattr
+
+if TYPE_CHECKING:
+    from .fields import NotBlinkingInput, NotBlinkingTextArea
+    from .forms import InflowsForm, OutflowsForm
+
+
+__getattr__ = lazy_getattr(__name__, {
+    'NotBlinkingInput': '.fields',
+    'NotBlinkingTextArea': '.fields',
+    'OutflowsForm': '.forms',
+    'InflowsForm': '.forms',
+})
 
 
 # Public symbols.
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Literal, TYPE_CHECKING
+from typing import Any, Literal, TYPE_CHECKING
 
 from textual import on
 from textual.app import ComposeResult
@@ -12,7 +12,7 @@ from .custom_validators import (
     ValueValidator
 )
 from .fields import NotBlinkingTextArea, NotBlinkingInput
-from utils import format_date_string
+from utils import Flow, format_date_string
 
 if TYPE_CHECKING:
     from utils.data_types import JsonDict, FormField
@@ -22,6 +22,11 @@ class BaseFormWidget(Static):
     """
     A base class for form widgets providing common functionality and layout.
 
+    Form state is tracked incrementally: every change event updates only the
+    field that sent it, in `dirty_fields` (fields differing from `initial_values`)
+    and `invalid_fields` (bitmap with one bit per required field, set while invalid).
+    The submit button is driven by that state, so the form is never rebuilt on a keystroke.
+
     Attributes:
         DEFAULT_CSS (str): Default CSS for the widget.
         FIELD_TYPES (dict): Mapping of field types to their respective classes and arguments.
@@ -90,7 +95,7 @@ class BaseFormWidget(Static):
     def __init__(
         self,
         submit_button_name: Literal['Create', 'Update'],
-        json: dict | None = None,
+        json: dict | Flow | None = None,
         *,
         name: str | None = None,
         id: str | None = None,
@@ -100,8 +105,14 @@ class BaseFormWidget(Static):
         super().__init__(name=name, id=id, classes=classes, disabled=disabled)
         self.submit_button_name: str = submit_button_name
         self.fields: dict[str, FormField] = {}
-        self.required_fields: dict[str, bool] = {}
-        self.json = json
+        self.required_bits: dict[str, int] = {}  # Bit of required field in invalid_fields
+        self.invalid_fields: int = 0
+        self.initial_values: JsonDict = {}
+        self.dirty_fields: set[str] = set()
+        self.json = None if json is None else self.record_to_json(json)
+
+        self.creation_date: str | None = None
+        self.last_modification: str | None = None
 
         if self.json:
             self.creation_date = self.json.pop('creation_date', None)
@@ -109,6 +120,7 @@ class BaseFormWidget(Static):
 
         self.create_fields()
         self.create_required_fields()
+        self.reset_dirty_state()
 
     def create_fields(self) -> None:
         """Create and populate the fields based on FORM_FIELDS."""
@@ -117,16 +129,87 @@ class BaseFormWidget(Static):
             field: FormField = field_class(**arguments)
             field.id = field_name
             self.fields[field_name] = field
-            if self.json:
-                if not isinstance(field, NotBlinkingTextArea):
-                    field.value = self.json.get(field_name, '')
-                else:
-                    field.text = self.json.get(field_name, '')
+        if self.json:
+            self.fill_fields(self.json)
+
+    def fill_fields(self, json: dict) -> None:
+        """Set values of the fields from json."""
+        for field_name, field in self.fields.items():
+            if not isinstance(field, NotBlinkingTextArea):
+                field.value = json.get(field_name, '')
+            else:
+                field.text = json.get(field_name, '')
+
+    @staticmethod
+    def record_to_json(json: dict | Flow) -> dict:
+        """Return editable dict of the record. Id of a `Flow` is not a form field."""
+        if not isinstance(json, Flow):
+            return json
+        json_dict: dict = json.to_json()
+        json_dict.pop('id', None)
+        return json_dict
+
+    def clear_fields(self) -> None:
+        """Set every field back to its default value, e.g. before the form is reused."""
+        for field_name, field_type in self.FORM_FIELDS:
+            field = self.fields[field_name]
+            arguments: dict = self.FIELD_TYPES[field_type][1]
+            if isinstance(field, NotBlinkingTextArea):
+                field.text = arguments.get('text', '')
+            elif isinstance(field, Checkbox):
+                field.value = arguments.get('value', False)
+            else:
+                field.value = arguments.get('value', '')
+        self.reset_dirty_state()
+        if self.is_mounted:
+            self.query_one('#form-submit-button', Button).disabled = True
+
+    def set_json(self, json: dict | Flow) -> None:
+        """Replace data shown by the form, e.g. with a fresher version of the record."""
+        json = self.record_to_json(json)
+        self.creation_date = json.pop('creation_date', self.creation_date)
+        self.last_modification = json.pop('last_modification', self.last_modification)
+        self.json = json
+        self.fill_fields(json)
+        self.reset_dirty_state()
+        if self.is_mounted:
+            self.query_one('#creation-date', Static).update(self.date_label('Creation Date', self.creation_date))
+            self.query_one('#last-modification', Static).update(
+                self.date_label('Last Modification', self.last_modification)
+            )
+
+    @staticmethod
+    def date_label(label: str, date: str | None) -> str:
+        """Return label with formatted date or empty string when date is unknown."""
+        return f'{label}: {format_date_string(date)}' if date else ''
 
     def create_required_fields(self):
-        """Create the list of required fields."""
-        for field_name in self.REQUIRED_FIELDS:
-            self.required_fields[field_name] = False
+        """Assign a bit to each required field, all invalid until validated."""
+        for bit, field_name in enumerate(self.REQUIRED_FIELDS):
+            self.required_bits[field_name] = 1 << bit
+        self.invalid_fields = (1 << len(self.REQUIRED_FIELDS)) - 1
+
+    def reset_dirty_state(self) -> None:
+        """Take current values of the fields as unchanged ones."""
+        self.initial_values = self.form_to_dict()
+        self.dirty_fields.clear()
+
+    @property
+    def is_dirty(self) -> bool:
+        """True when any field differs from its initial value."""
+        return bool(self.dirty_fields)
+
+    def changed_values(self) -> 'JsonDict':
+        """Return current values of the changed fields only."""
+        return {
+            field_name: self.field_value(field_name)
+            for field_name in self.fields if field_name in self.dirty_fields
+        }
+
+    def field_value(self, field_name: str) -> Any:
+        """Return current value of a single field."""
+        field = self.fields[field_name]
+        return field.text if isinstance(field, NotBlinkingTextArea) else field.value
 
     def form_to_dict(self) -> 'JsonDict':
         """Return a dictionary representation of the form."""
@@ -143,8 +226,8 @@ class BaseFormWidget(Static):
 
         if self.json is not None:
             yield Static()
-            yield Static(f'Creation Date: {format_date_string(self.creation_date)}')
-            yield Static(f'Last Modification: {format_date_string(self.last_modification)}')
+            yield Static(self.date_label('Creation Date', self.creation_date), id='creation-date')
+            yield Static(self.date_label('Last Modification', self.last_modification), id='last-modification')
         with Horizontal(id='form-action-buttons'):
             yield Button('Cancel', variant='warning', id='form-cancel-button')
             yield Static()
@@ -152,20 +235,41 @@ class BaseFormWidget(Static):
 
     @on(NotBlinkingInput.Changed)
     def update_required_fields(self, event: NotBlinkingInput.Changed) -> None:
-        """Update the state of required fields based on input changes."""
-        if event.input.id not in self.REQUIRED_FIELDS:
-            return
+        """Update validity and dirty state of the changed input."""
+        field_name = event.input.id
+        bit = self.required_bits.get(field_name or '')
+        if bit is not None:
+            if event.validation_result is not None and event.validation_result.is_valid:
+                self.invalid_fields &= ~bit
+            else:
+                self.invalid_fields |= bit
+        self.update_dirty_field(field_name, event.value)
 
-        if event.validation_result is not None and event.validation_result.is_valid:
-            self.required_fields[event.input.id] = True
-        else:
-            self.required_fields[event.input.id] = False
+    @on(NotBlinkingTextArea.Changed)
+    def update_text_area(self, event: NotBlinkingTextArea.Changed) -> None:
+        """Update dirty state of the changed text area."""
+        self.update_dirty_field(event.text_area.id, event.text_area.text)
+
+    @on(Checkbox.Changed)
+    def update_checkbox(self, event: Checkbox.Changed) -> None:
+        """Update dirty state of the changed checkbox."""
+        self.update_dirty_field(event.checkbox.id, event.value)
 
-        is_form_changed = self.json == self.form_to_dict()
-        submit_button = self.query_one('#form-submit-button')
+    def update_dirty_field(self, field_name: str | None, value: Any) -> None:
+        """Compare one field with its initial value and refresh submit button."""
+        if field_name not in self.fields:
+            return
+        if value == self.initial_values.get(field_name):
+            self.dirty_fields.discard(field_name)
+        else:
+            self.dirty_fields.add(field_name)
+        self.update_submit_button()
 
-        submit_button.disabled = not self.is_form_valid() or is_form_changed
+    def update_submit_button(self) -> None:
+        """Allow submit when form is valid and, for existing record, changed."""
+        is_unchanged = self.json is not None and not self.dirty_fields
+        self.query_one('#form-submit-button', Button).disabled = not self.is_form_valid() or is_unchanged
 
-    def is_form_valid(self):
+    def is_form_valid(self) -> bool:
         """Check if the form is valid based on the required fields."""
-        return all(self.required_fields.values())
+        return not self.invalid_fields
@@ -1,42 +1,67 @@
-from typing import Type, cast
+from time import perf_counter
 
+STARTED_AT: float = perf_counter()  # Taken before the heavy imports to include them in startup time
+
+import os
+
+from collections import OrderedDict
+from typing import cast
+
+from textual import work
 from textual.app import App, ComposeResult
 from textual.containers import Container
+from textual.widget import Widget
 from textual.widgets import (
     Button,
+    DataTable,
     Footer,
     Header,
 )
 
-from screens import CreateNewPopup
+import screens
+import views
+from api_clients import BasePulporoAPI, FlushResult, OneOffAPI
+from utils.startup import startup_timer
+from views import Ledger
 
-from views import (
-    Dashboard,
-    Investment,
-    Ledger,
-    Liabilities,
-    Media,
-    Recurring,
-    Reminders
-)
+startup_timer.restart(STARTED_AT)
+startup_timer.mark('import')
 
 
 class LeftNavMenu(Container):
-    """Menu used to switch between basic views"""
-    MENU_BUTTONS: dict = {
-        'DashboardBt': (Dashboard, 'Dashboard'),
-        'LedgerBt': (Ledger, 'Ledger'),
-        'RecurringBt': (Recurring, 'Recurring'),
-        'InvestmentBt': (Investment, 'Investment'),
-        'LiabilitiesBt': (Liabilities, 'Liabilities'),
-        'RemindersBt': (Reminders, 'Reminders'),
-        'MediaBt': (Media, 'Media'),
+    """
+    Menu used to switch between basic views.
+
+    Views left by the user stay mounted but hidden, so coming back to
+    them is instant and keeps their state. Hidden views are evicted
+    least recently used first once there are more of them than
+    PULPORO_VIEW_CACHE_SIZE (default 3, 0 disables the cache) or their
+    weight exceeds PULPORO_VIEW_CACHE_BUDGET (default 0, no budget).
+    Weight approximates memory held by a view as the number of its
+    widgets and table rows.
+
+    Views are named after their classes in `views` and imported on first use.
+    """
+    MENU_BUTTONS: dict[str, str] = {
+        'DashboardBt': 'Dashboard',
+        'LedgerBt': 'Ledger',
+        'RecurringBt': 'Recurring',
+        'InvestmentBt': 'Investment',
+        'LiabilitiesBt': 'Liabilities',
+        'RemindersBt': 'Reminders',
+        'MediaBt': 'Media',
     }
     clicked = 'LedgerBt'
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.max_cached_views: int = int(os.getenv('PULPORO_VIEW_CACHE_SIZE', '3'))
+        self.cache_budget: int = int(os.getenv('PULPORO_VIEW_CACHE_BUDGET', '0'))
+        self.cached_views: OrderedDict[str, Widget] = OrderedDict()  # Hidden views, least recently used first
+
     def compose(self) -> ComposeResult:
         """Compose menu of MENU_BUTTONS"""
-        for bt_id, (view_class, view_name) in self.MENU_BUTTONS.items():
+        for bt_id, view_name in self.MENU_BUTTONS.items():
             yield Button(view_name, id=bt_id)
 
     def on_mount(self) -> None:
@@ -55,14 +80,37 @@ class LeftNavMenu(Container):
         self.get_child_by_id(button_id, Button).variant = 'primary'
         self.get_child_by_id(self.clicked, Button).variant = 'default'
         self.clicked = button_id
-        self.swap_view(*self.MENU_BUTTONS[button_id])
+        self.swap_view(self.MENU_BUTTONS[button_id])
 
-    def swap_view(self, view_class: Type[Container], view_name: str) -> None:
-        """Swap view inside MainApp"""
+    def swap_view(self, view_name: str) -> None:
+        """Swap view inside MainApp, showing the cached view when there is one"""
         main_app_wrapper = self.app.query_one('#main-app')
         for child in main_app_wrapper.children:
-            child.remove()
-        main_app_wrapper.mount(view_class(id=view_name))
+            if child.display and child.id is not None:
+                child.display = False
+                self.cached_views[child.id] = child
+
+        view: Widget | None = self.cached_views.pop(view_name, None)
+        if view is None:
+            main_app_wrapper.mount(getattr(views, view_name)(id=view_name))
+        else:
+            view.display = True
+        self.evict_views()
+
+    def evict_views(self) -> None:
+        """Remove least recently used hidden views over the count limit or the budget"""
+        while self.cached_views and (
+            len(self.cached_views) > self.max_cached_views
+            or (self.cache_budget and sum(map(self.view_weight, self.cached_views.values())) > self.cache_budget)
+        ):
+            _, view = self.cached_views.popitem(last=False)
+            view.remove()
+
+    @staticmethod
+    def view_weight(view: Widget) -> int:
+        """Approximate memory held by a view: count of its widgets and table rows"""
+        widgets: list[Widget] = view.walk_children(Widget, with_self=True)
+        return len(widgets) + sum(widget.row_count for widget in widgets if isinstance(widget, DataTable))
 
 
 class PulporoApp(App):
@@ -109,6 +157,7 @@ class PulporoApp(App):
     """
 
     TITLE = 'Pulporo 🐙'
+    OUTBOX_FLUSH_INTERVAL: float = 2.0  # Seconds between sending batches of queued changes
     BINDINGS = [
         ('ctrl+d', 'toggle_dark', 'Dark Mode'),
         ('ctrl+n', 'create_new', 'Create New'),
@@ -123,6 +172,43 @@ class PulporoApp(App):
                 yield Ledger(id='Ledger')
         yield Footer()
 
+    def on_mount(self) -> None:
+        """Send changes queued in the outbox, also those left by previous session"""
+        self.call_after_refresh(startup_timer.mark, 'first_paint')
+        self.flush_outbox()
+        self.set_interval(self.OUTBOX_FLUSH_INTERVAL, self.flush_outbox)
+
+    @work(thread=True, group='outbox', exit_on_error=False)
+    def flush_outbox(self) -> None:
+        """Send a batch of queued changes to the API outside the event loop"""
+        api = OneOffAPI()
+        if not len(api.outbox):
+            return
+        result: FlushResult = api.flush_outbox()
+        if result.sent or result.failed:
+            self.call_from_thread(self.outbox_flushed, result)
+
+    def outbox_flushed(self, result: FlushResult) -> None:
+        """
+        Report rejected changes and show ids assigned by the API in the Ledger.
+        When only updates were sent, their returned flows are applied to the rows in place.
+        """
+        for operation in result.failed:
+            self.notify(f'Pulporo API rejected {operation.method} of {operation.endpoint}', severity='error')
+        ledgers = self.query(Ledger)
+        if not ledgers:
+            return
+        if result.failed or result.sent > len(result.patched):
+            ledgers.first().reload_table()
+            return
+        for endpoint, flow in result.patched:
+            ledgers.first().patch_flow_row(endpoint, flow)
+
+    def on_unmount(self) -> None:
+        """Close pooled API connections and local mirror when the app exits"""
+        BasePulporoAPI.close_session()
+        BasePulporoAPI.reset_local_store()
+
     def action_create_new(self) -> None:
         """
         Display a popup screen for creating new database entries.
@@ -132,9 +218,12 @@ class PulporoApp(App):
         to the database.
         """
         def reload_if_required(boolean: bool):
-            if boolean and isinstance(self.query_one('#main-app').children[0], Ledger):
-                self.query_one(Ledger).reload_table()
-        self.push_screen(CreateNewPopup('CreateNewPopup'), reload_if_required)
+            ledgers = self.query(Ledger)  # Shown or kept hidden in the view cache
+            if boolean and ledgers:
+                ledgers.first().reload_table()
+            if boolean:
+                self.flush_outbox()
+        screens.CreateNewPopup.open(self, 'CreateNewPopup', callback=reload_if_required)
 
     def action_toggle_left_panel(self) -> None:
         """
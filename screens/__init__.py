@@ -1,11 +1,22 @@
 """Popups used by views"""
 
+from typing import TYPE_CHECKING
 
-# Local imports.
-from .confirmation_popup import ConfirmPopup
-from .create_new import CreateNewPopup
-from .io_detail import IODetail
-from .month_year_popup import MonthYearPopup
+from utils.lazy_import import lazy_getattr
+
+if TYPE_CHECKING:
+    from .confirmation_popup import ConfirmPopup
+    from .create_new import CreateNewPopup
+    from .io_detail import IODetail
+    from .month_year_popup import MonthYearPopup
+
+
+__getattr__ = lazy_getattr(__name__, {
+    'ConfirmPopup': '.confirmation_popup',
+    'CreateNewPopup': '.create_new',
+    'IODetail': '.io_detail',
+    'MonthYearPopup': '.month_year_popup',
+})
 
 
 # Public symbols.
@@ -1,11 +1,12 @@
 from textual import on
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal
-from textual.screen import ModalScreen
 from textual.widgets import Static, Button
 
+from .pooled_screen import PooledScreen
 
-class ConfirmPopup(ModalScreen):
+
+class ConfirmPopup(PooledScreen):
     """ModalScreen to ask user for confirmation of certain action"""
 
     DEFAULT_CSS = """
@@ -41,6 +42,11 @@ class ConfirmPopup(ModalScreen):
         super().__init__(*args, **kwargs)
         self.message = message
 
+    def reset(self, message) -> None:
+        """Ask with a new message"""
+        self.message = message
+        self.query_one('#confirm-popup-message', Static).update(message)
+
     def compose(self) -> ComposeResult:
         with Container(id='confirm-popup-body'):
             yield Static(self.message, id='confirm-popup-message')
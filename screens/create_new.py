@@ -5,7 +5,6 @@ from textual import on
 from textual.app import ComposeResult
 from textual.containers import Container, VerticalScroll, Center
 from textual.events import Click
-from textual.screen import ModalScreen
 from textual.widgets import (
     Button,
     OptionList,
@@ -17,11 +16,13 @@ from api_clients import OneOffAPI
 
 from forms import OutflowsForm, InflowsForm
 
+from .pooled_screen import PooledScreen
+
 if TYPE_CHECKING:
-    from utils.data_types import FormType, JsonDict
+    from utils.data_types import FormType
 
 
-class CreateNewPopup(ModalScreen):
+class CreateNewPopup(PooledScreen):
     DEFAULT_CSS = """
     CreateNewPopup {
         align: center middle;
@@ -59,7 +60,6 @@ class CreateNewPopup(ModalScreen):
         self.one_off_api = OneOffAPI()
         self.created = False
         self.form_name: str = ''
-        self.form_default_data: JsonDict | None = None
         self.options: list[Option | Separator] = [
             Option('Outflow One-off', id='outflow-one-off'),
             Separator(),
@@ -70,6 +70,15 @@ class CreateNewPopup(ModalScreen):
             'outflow-one-off': OptionT(OutflowsForm, 'outflows/'),
             'inflow-one-off': OptionT(InflowsForm, 'inflows/'),
         }
+        self.forms: dict[str, FormType] = {}  # Built once in compose, hidden until their option is selected
+
+    def reset(self, *args, **kwargs) -> None:
+        """Show list of forms again with forms cleared"""
+        if self.form is not None:
+            self.hide_form()
+        for form in self.forms.values():
+            form.clear_fields()
+        self.created = False
 
     def compose(self) -> ComposeResult:
         with Container(id='new-popup-body'):
@@ -78,6 +87,11 @@ class CreateNewPopup(ModalScreen):
             with Center():
                 with VerticalScroll(id='form-list-wrapper'):
                     yield OptionList(*self.options, id="form-list")
+                    for form_name, option in self.forms_dict.items():
+                        form = cast('FormType', option.form_class('Create', id=f'{form_name}-form'))
+                        form.display = False
+                        self.forms[form_name] = form
+                        yield form
 
     def on_click(self, event: Click):
         """Close popup when clicked on the background"""
@@ -87,28 +101,25 @@ class CreateNewPopup(ModalScreen):
     def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
         """Mount selected form from OptionList to popup"""
         selected_form_id: str = cast(str, event.option.id)
-        self.query_one('#form-list').remove()
-        self.form = cast('FormType', self.forms_dict[selected_form_id].form_class('Create', id='popup-form'))
+        self.query_one('#form-list').display = False
+        self.form = self.forms[selected_form_id]
         self.form_name = selected_form_id
-        self.form_default_data = self.form.form_to_dict()
-        self.query_one('#form-list-wrapper').mount(self.form)
+        self.form.display = True
 
     @on(Button.Pressed, '#form-submit-button')
     def send_request(self) -> None:
-        """Send request and remove form from DOM when accepted"""
-        f_name = self.form_name  # shorter names for better readability
-        f_dict = self.forms_dict
-
-        form = self.query_one(f_dict[f_name].form_class)
-        self.one_off_api.post_flow(f_dict[f_name].endpoint, form.form_to_dict())
-        self.remove_form_from_dom()
+        """Queue creation of the flow in the outbox and hide the form"""
+        form = cast('FormType', self.form)
+        self.one_off_api.queue_post(self.forms_dict[self.form_name].endpoint, form.form_to_dict())
+        self.hide_form()
         self.created = True
 
     @on(Button.Pressed, '#form-cancel-button')
-    def remove_form_from_dom(self) -> None:
-        """Remove form from dom on cancel button click"""
-        self.query_one('#popup-form').remove()
-        option_list = OptionList(*self.options, id="form-list")
-        self.query_one('#form-list-wrapper').mount(option_list)
+    def hide_form(self) -> None:
+        """Hide and clear form on cancel button click and show list of forms again"""
+        form = cast('FormType', self.form)
+        form.display = False
+        form.clear_fields()
+        self.query_one('#form-list').display = True
         self.form = None
 
@@ -1,19 +1,23 @@
-from typing import Literal
+from typing import Literal, TYPE_CHECKING
 
-from requests import Response
 from textual import on
 from textual.app import ComposeResult
 from textual.containers import Container, Center, VerticalScroll
 from textual.events import Click
-from textual.screen import ModalScreen
 from textual.widgets import Static, Button
 
-from forms import OutflowsForm, InflowsForm, NotBlinkingInput
+from forms import OutflowsForm, InflowsForm
 from api_clients import OneOffAPI
 from screens import ConfirmPopup
+from utils import Flow
 
+from .pooled_screen import PooledScreen
 
-class IODetail(ModalScreen):
+if TYPE_CHECKING:
+    from utils.data_types import JsonDict
+
+
+class IODetail(PooledScreen):
     """
     Modal screen that shows all IOs detail
     and allow to delete or patch it
@@ -58,13 +62,49 @@ class IODetail(ModalScreen):
         'inflows/': InflowsForm,
     }
 
-    def __init__(self, data: dict, flow_type: Literal['outflows/', 'inflows/'], *args, **kwargs) -> None:
+    def __init__(
+        self,
+        data: 'JsonDict | Flow',
+        flow_type: Literal['outflows/', 'inflows/'],
+        *args,
+        **kwargs
+    ) -> None:
         super().__init__(*args, **kwargs)
         self.api = OneOffAPI()
         self.flow_type: Literal['outflows/', 'inflows/'] = flow_type
-        self.pk = data.pop('id')
-        self.form = self.FORMS_DICT[flow_type]('Update', json=data)
-        self.form_default_data: dict = self.form.form_to_dict()  # Holds form value from initialization
+        self.flow: Flow = data if isinstance(data, Flow) else Flow.from_json(data)
+        self.pk: int = self.flow_pk(self.flow)
+        self.form = self.FORMS_DICT[flow_type]('Update', json=self.flow)
+        self.forms: dict[str, OutflowsForm | InflowsForm] = {flow_type: self.form}  # Kept for reuse
+
+    @staticmethod
+    def flow_pk(flow: Flow) -> int:
+        """
+        Return id of the shown flow, only saved or queued flows can be updated and deleted.
+
+        Raises:
+            ValueError: When the flow has no integer id.
+        """
+        if not isinstance(flow.id, int):
+            raise ValueError(f'Flow without id cannot be shown in IODetail: {flow.id!r}')
+        return flow.id
+
+    def reset(self, data: 'JsonDict | Flow', flow_type: Literal['outflows/', 'inflows/']) -> None:
+        """Show other flow reusing form of its type, the form is built on first use of the type"""
+        self.flow_type = flow_type
+        self.flow = data if isinstance(data, Flow) else Flow.from_json(data)
+        self.pk = self.flow_pk(self.flow)
+        self.form.display = False
+        form = self.forms.get(flow_type)
+        if form is None:
+            form = self.FORMS_DICT[flow_type]('Update', json=self.flow)
+            self.forms[flow_type] = form
+            self.query_one('#detail-form-wrapper').mount(form, before=0)
+        else:
+            form.set_json(self.flow)
+            form.query_one('#form-submit-button', Button).disabled = True
+            form.display = True
+        self.form = form
 
     def compose(self) -> ComposeResult:
         with Container(id='io-detail-body'):
@@ -79,10 +119,19 @@ class IODetail(ModalScreen):
     def on_click(self, event: Click):
         """Close popup when clicked on the background"""
         background_click = self.get_widget_at(event.screen_x, event.screen_y)[0] is self
-        form_not_changed = self.form_default_data == self.form.form_to_dict()
-        if background_click and form_not_changed:
+        if background_click and not self.form.is_dirty:
             self.dismiss()
 
+    def refresh_data(self, data: 'JsonDict | Flow') -> None:
+        """
+        Show fresher version of the record, e.g. after background revalidation.
+        Ignored when user has already changed the form.
+        """
+        if self.form.is_dirty:
+            return
+        self.flow = data if isinstance(data, Flow) else Flow.from_json(data)
+        self.form.set_json(self.flow)
+
     @on(Button.Pressed, '#form-cancel-button')
     def close_popup(self) -> None:
         """Close popup on cancel button click"""
@@ -90,34 +139,25 @@ class IODetail(ModalScreen):
 
     @on(Button.Pressed, '#form-submit-button')
     def patch_io(self) -> None:
-        """Send PATCH request for IO and send back `PATCH` string"""
-        json: dict = self.form.form_to_dict()
-        pk = f'{self.pk}/'
-        response: Response = self.api.patch_flow(endpoint=self.flow_type, json=json, pk=pk)
-        if response.status_code == 200:
-            self.dismiss('PATCH')
+        """Queue update of changed fields only in the outbox and send back `PATCH` string"""
+        json: dict = self.form.changed_values()
+        self.api.queue_patch(self.flow_type, json, self.pk)
+        self.dismiss('PATCH')
 
     @on(Button.Pressed, '#delete-io')
     def delete_io(self) -> None:
         """
         Display Confirmation Popup to double-check does user want to remove IO
-        if yes - send DELETE request, reload ledger and close popup
+        if yes - queue removal in the outbox, reload ledger and close popup
         else - just close the confirmation popup
         """
         def delete_io(accepted: bool) -> None:
-            """Send DELETE request for IO and send back `PATCH` string"""
+            """Queue removal of IO in the outbox and send back `DELETE` string"""
             if not accepted:
                 return
-            response: Response = self.api.delete_flow(self.flow_type, f'{self.pk}/')
-            if response.status_code == 204:
-                self.dismiss('DELETE')
+            self.api.queue_delete(self.flow_type, self.pk)
+            self.dismiss('DELETE')
 
         message = 'Do you want to remove this flow?\nYou cannot revers this action.'
-        self.app.push_screen(ConfirmPopup(message=message), delete_io)
-
-    @on(NotBlinkingInput.Changed)
-    def update_validation(self) -> None:
-        """Disallow user to send PATCH request when form was not changed"""
-        if self.form_default_data == self.form.form_to_dict():
-            self.query_one('#form-submit-button').disabled = True
+        ConfirmPopup.open(self.app, message=message, callback=delete_io)
 
@@ -4,11 +4,12 @@ from textual import on
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal
 from textual.events import Click
-from textual.screen import ModalScreen
 from textual.widgets import Button
 
+from .pooled_screen import PooledScreen
 
-class MonthYearPopup(ModalScreen):
+
+class MonthYearPopup(PooledScreen):
     """
     ModalScreen display month calendar
     and returns chosen year and month on dismissal
@@ -93,6 +94,16 @@ class MonthYearPopup(ModalScreen):
         """Color button on mount"""
         self.update_button_colors_if_current_year()
 
+    def reset(self, year, month) -> None:
+        """Show calendar of the new date"""
+        for button in self.query('.month-bt').results(Button):
+            button.variant = 'default'
+        self.popup_year = year
+        self.year = year
+        self.month = month
+        self.query_one('#this-year', Button).label = str(self.popup_year)
+        self.update_button_colors_if_current_year()
+
     def on_click(self, event: Click) -> None:
         """Remove widget from DOM when clicked on background"""
         if self.get_widget_at(event.screen_x, event.screen_y)[0] is self:
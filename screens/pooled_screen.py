@@ -0,0 +1,56 @@
+from abc import abstractmethod
+from typing import Any, Callable, TypeVar
+
+from textual.app import App
+from textual.screen import ModalScreen
+
+PooledScreenT = TypeVar('PooledScreenT', bound='PooledScreen')
+
+
+class PooledScreen(ModalScreen):
+    """
+    Modal screen built once per app and reused afterwards.
+
+    `open` installs the first instance in the app, so dismissing it keeps
+    its widget tree. Every following `open` calls `reset` with new data
+    and shows the same instance instead of composing a new one.
+    Subclasses must implement `reset`.
+    """
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if getattr(cls.reset, '__isabstractmethod__', False):
+            raise TypeError(f'{cls.__name__} must implement reset to be pooled')
+
+    @classmethod
+    def open(
+        cls: type[PooledScreenT],
+        app: App,
+        *args: Any,
+        callback: Callable[[Any], Any] | None = None,
+        **kwargs: Any
+    ) -> PooledScreenT:
+        """
+        Show pooled instance reset with args, building it on first use.
+
+        Args:
+            app (App): App showing the screen.
+            callback (Callable, optional): Called with the dismiss result. Defaults to None.
+            *args, **kwargs: Data of the screen, passed to `__init__` or `reset`.
+        """
+        name: str = cls.__name__
+        screen: PooledScreenT
+        if not app.is_screen_installed(name):
+            screen = cls(*args, **kwargs)
+            app.install_screen(screen, name)
+        elif (installed := app.get_screen(name)) in app.screen_stack:
+            screen = cls(*args, **kwargs)  # Pooled one is still shown, use a throwaway instance
+        else:
+            screen = installed  # type: ignore[assignment]
+            screen.reset(*args, **kwargs)
+        app.push_screen(screen, callback)
+        return screen
+
+    @abstractmethod
+    def reset(self, *args: Any, **kwargs: Any) -> None:
+        """Show new data in the already composed screen, taking the same arguments as `__init__`."""
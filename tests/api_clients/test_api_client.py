@@ -0,0 +1,456 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from api_clients import BasePulporoAPI, OneOffAPI
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    BasePulporoAPI.close_session()
+    BasePulporoAPI.reset_cache()
+    BasePulporoAPI.reset_stats()
+    yield
+    BasePulporoAPI.close_session()
+    BasePulporoAPI.reset_cache()
+
+
+def mock_response(mocker, status_code=200, json=None, headers=None):
+    response = mocker.Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = json
+    return response
+
+
+def test_clients_share_one_session():
+    assert OneOffAPI().session is OneOffAPI().session
+
+
+def test_pool_size_from_env(monkeypatch):
+    monkeypatch.setenv('PULPORO_POOL_SIZE', '3')
+    adapter = OneOffAPI().session.get_adapter('http://localhost:8000/')
+    assert adapter._pool_maxsize == 3
+
+
+def test_close_session_creates_new_one():
+    session = OneOffAPI().session
+    BasePulporoAPI.close_session()
+    assert OneOffAPI().session is not session
+
+
+def test_get_flow_uses_session_and_timeout(mocker, monkeypatch):
+    monkeypatch.setenv('PULPORO_READ_TIMEOUT', '5')
+    api = OneOffAPI()
+    get = mocker.patch.object(api.session, 'get', return_value=mock_response(mocker, json=[]))
+
+    assert api.get_flow('outflows/', {'year': 2024, 'month': 5}) == []
+    get.assert_called_once_with(
+        api._url + 'outflows/',
+        params={'year': 2024, 'month': 5},
+        headers={},
+        timeout=(3.05, 5.0)
+    )
+
+
+################################################
+#              Testing Response Cache          #
+################################################
+
+def test_fresh_month_served_from_cache(mocker):
+    api = OneOffAPI()
+    get = mocker.patch.object(api.session, 'get', return_value=mock_response(mocker, json=[{'id': 1}]))
+
+    api.get_flow('outflows/', {'year': 2024, 'month': 5})
+    assert api.get_flow('outflows/', {'month': 5, 'year': 2024}) == [{'id': 1}]
+    assert get.call_count == 1
+    assert api.cache.stats == {'hits': 1, 'misses': 1, 'revalidations': 0, 'size': 1, 'details': 1}
+
+
+def test_stale_month_revalidated_with_etag(mocker, monkeypatch):
+    monkeypatch.setenv('PULPORO_CACHE_TTL', '0')
+    api = OneOffAPI()
+    get = mocker.patch.object(
+        api.session, 'get',
+        return_value=mock_response(mocker, json=[{'id': 1}], headers={'ETag': '"v1"'})
+    )
+    api.get_flow('outflows/', {'year': 2024, 'month': 5})
+
+    get.return_value = mock_response(mocker, status_code=304)
+    assert api.get_flow('outflows/', {'year': 2024, 'month': 5}) == [{'id': 1}]
+    assert get.call_args.kwargs['headers'] == {'If-None-Match': '"v1"'}
+    assert api.cache.revalidations == 1
+
+
+def test_cache_evicts_least_recently_used(mocker, monkeypatch):
+    monkeypatch.setenv('PULPORO_CACHE_SIZE', '2')
+    api = OneOffAPI()
+    mocker.patch.object(api.session, 'get', return_value=mock_response(mocker, json=[]))
+    for month in (1, 2, 1, 3):
+        api.get_flow('outflows/', {'year': 2024, 'month': month})
+
+    assert api.cache.make_key('outflows/', {'year': 2024, 'month': 1}) in api.cache
+    assert api.cache.make_key('outflows/', {'year': 2024, 'month': 2}) not in api.cache
+
+
+def test_error_response_not_cached(mocker):
+    api = OneOffAPI()
+    mocker.patch.object(api.session, 'get', return_value=mock_response(mocker, status_code=500, json={}))
+    api.get_flow('outflows/', {'year': 2024, 'month': 5})
+    assert len(api.cache) == 0
+
+
+def month_key(api, endpoint, month):
+    return api.cache.make_key(endpoint, {'year': 2024, 'month': month})
+
+
+def warm_months(api, mocker):
+    def get(url, params=None, **kwargs):
+        flows = [{'id': params['month'], 'date': f"2024-{params['month']:02}-10"}] if params else {}
+        return mock_response(mocker, json=flows)
+
+    mocker.patch.object(api.session, 'get', side_effect=get)
+    for endpoint in ('outflows/', 'inflows/'):
+        for month in (4, 5, 6):
+            api.get_flow(endpoint, {'year': 2024, 'month': month})
+
+
+def test_post_evicts_only_month_of_new_flow(mocker):
+    api = OneOffAPI()
+    warm_months(api, mocker)
+    mocker.patch.object(api.session, 'post')
+
+    api.post_flow('outflows/', {'title': 'Rent', 'date': '2024-05-02'})
+    assert month_key(api, 'outflows/', 5) not in api.cache
+    assert month_key(api, 'outflows/', 4) in api.cache
+    assert month_key(api, 'inflows/', 5) in api.cache
+
+
+def test_patch_evicts_old_and_new_month_and_detail(mocker):
+    api = OneOffAPI()
+    warm_months(api, mocker)
+    api.get_flow('outflows/', pk=4)
+    mocker.patch.object(api.session, 'patch')
+
+    api.patch_flow('outflows/', {'date': '2024-06-01'}, '4/')
+    assert month_key(api, 'outflows/', 4) not in api.cache
+    assert month_key(api, 'outflows/', 6) not in api.cache
+    assert api.cache.make_key('outflows/', pk=4) not in api.cache
+    assert month_key(api, 'outflows/', 5) in api.cache
+
+
+def test_delete_evicts_month_flow_was_seen_in(mocker):
+    api = OneOffAPI()
+    warm_months(api, mocker)
+    mocker.patch.object(api.session, 'delete')
+
+    api.delete_flow('inflows/', '6/')
+    assert month_key(api, 'inflows/', 6) not in api.cache
+    assert month_key(api, 'inflows/', 5) in api.cache
+    assert month_key(api, 'outflows/', 6) in api.cache
+
+
+def test_delete_of_unknown_flow_evicts_endpoint(mocker):
+    api = OneOffAPI()
+    warm_months(api, mocker)
+    mocker.patch.object(api.session, 'delete')
+
+    api.delete_flow('inflows/', '99/')
+    assert all(month_key(api, 'inflows/', month) not in api.cache for month in (4, 5, 6))
+    assert month_key(api, 'outflows/', 5) in api.cache
+
+
+def test_get_flow_page_reads_paginated_response(mocker):
+    api = OneOffAPI()
+    get = mocker.patch.object(
+        api.session, 'get',
+        return_value=mock_response(mocker, json={'count': 250, 'results': [{'id': 101}]})
+    )
+    assert api.get_flow_page('outflows/', {'year': 2024}, 2, 100) == (250, [{'id': 101}])
+    assert get.call_args.kwargs['params'] == {'year': 2024, 'page': 2, 'page_size': 100}
+
+
+def test_get_flow_page_slices_unpaginated_response(mocker):
+    api = OneOffAPI()
+    flows = [{'id': num} for num in range(5)]
+    mocker.patch.object(api.session, 'get', return_value=mock_response(mocker, json=flows))
+    assert api.get_flow_page('outflows/', None, 2, 2) == (5, [{'id': 2}, {'id': 3}])
+
+
+def test_unpaginated_response_requested_once_for_all_pages(mocker):
+    api = OneOffAPI()
+    flows = [{'id': num} for num in range(5)]
+    get = mocker.patch.object(api.session, 'get', return_value=mock_response(mocker, json=flows))
+    pages = [api.get_flow_page('outflows/', {'year': 2024, 'month': 5}, page, 2)[1] for page in (1, 2, 3)]
+
+    assert pages == [[{'id': 0}, {'id': 1}], [{'id': 2}, {'id': 3}], [{'id': 4}]]
+    assert get.call_count == 1
+    assert len(api.cache) == 1
+
+
+def test_list_response_prefills_flow_details(mocker):
+    api = OneOffAPI()
+    get = mocker.patch.object(
+        api.session, 'get',
+        return_value=mock_response(mocker, json=[{'id': 1, 'title': 'Rent'}, {'id': 2, 'title': 'Food'}])
+    )
+    api.get_flow('outflows/', {'year': 2024, 'month': 5})
+
+    assert api.cached_flow('outflows/', 2) == {'id': 2, 'title': 'Food'}
+    assert api.get_flow('outflows/', pk=1) == {'id': 1, 'title': 'Rent'}
+    assert api.cached_flow('inflows/', 1) is None
+    assert get.call_count == 1
+
+
+def test_revalidate_skips_fresh_cache(mocker):
+    api = OneOffAPI()
+    get = mocker.patch.object(api.session, 'get', return_value=mock_response(mocker, json=[{'id': 1}]))
+    api.get_flow('outflows/', {'year': 2024, 'month': 5})
+
+    get.return_value = mock_response(mocker, json={'id': 1, 'title': 'Rent'})
+    assert api.get_flow('outflows/', pk=1, revalidate=True) == {'id': 1, 'title': 'Rent'}
+    assert get.call_count == 2
+
+
+def test_concurrent_identical_gets_share_one_request(mocker):
+    api = OneOffAPI()
+    release = threading.Event()
+
+    def slow_get(*args, **kwargs):
+        release.wait(timeout=2)
+        return mock_response(mocker, json=[{'id': 1}])
+
+    get = mocker.patch.object(api.session, 'get', side_effect=slow_get)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(api.get_flow('outflows/', {'year': 2024, 'month': 5})))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    while api.stats['coalesced'] < 2:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert get.call_count == 1
+    assert results == [[{'id': 1}]] * 3
+    assert api.stats['requests'] == 1
+    assert api.stats['coalesced'] == 2
+
+
+def test_coalesced_request_error_reaches_every_caller(mocker):
+    api = OneOffAPI()
+    mocker.patch.object(api.session, 'get', side_effect=ConnectionError)
+    with pytest.raises(ConnectionError):
+        api.get_flow('outflows/', {'year': 2024, 'month': 5})
+    assert not BasePulporoAPI._in_flight
+
+
+def test_month_response_mirrored_locally(mocker):
+    api = OneOffAPI()
+    flows = [{'id': 1, 'date': '2024-05-02'}]
+    mocker.patch.object(api.session, 'get', return_value=mock_response(mocker, json=flows))
+    assert api.get_local_flow('outflows/', {'year': 2024, 'month': 5}) is None
+
+    api.get_flow('outflows/', {'year': 2024, 'month': 5})
+    assert api.get_local_flow('outflows/', {'year': 2024, 'month': 5}) == flows
+
+
+################################################
+#              Testing Outbox Flush            #
+################################################
+
+def test_queued_post_is_visible_before_flush(mocker):
+    api = OneOffAPI()
+    mocker.patch.object(api.session, 'get', return_value=mock_response(mocker, json=[]))
+    flow = api.queue_post('outflows/', {'title': 'Rent', 'date': '2024-05-02'})
+
+    assert flow['id'] < 0
+    assert api.get_flow('outflows/', {'year': 2024, 'month': 5}) == [flow]
+    assert api.get_flow('outflows/', pk=flow['id']) == flow
+
+
+def test_flush_sends_operations_in_order_with_server_ids(mocker):
+    api = OneOffAPI()
+    flow = api.queue_post('outflows/', {'title': 'Rent', 'date': '2024-05-02'})
+    api.queue_patch('outflows/', {'title': 'Flat'}, flow['id'])
+    post = mocker.patch.object(api.session, 'post', return_value=mock_response(mocker, 201, {'id': 42}))
+    patch = mocker.patch.object(api.session, 'patch', return_value=mock_response(mocker, 200, {'id': 42}))
+
+    result = api.flush_outbox()
+    assert (result.sent, result.pending, result.failed) == (2, 0, [])
+    post.assert_called_once()
+    assert patch.call_args.args[0] == api._url + 'outflows/42/'
+
+
+def test_acked_temporary_id_is_not_found_and_cannot_be_queued(mocker):
+    api = OneOffAPI()
+    flow = api.queue_post('outflows/', {'title': 'Rent', 'date': '2024-05-02'})
+    mocker.patch.object(api.session, 'post', return_value=mock_response(mocker, 201, {'id': 42}))
+    api.flush_outbox()
+
+    assert api.get_flow('outflows/', pk=flow['id']) is None
+    with pytest.raises(ValueError):
+        api.queue_patch('outflows/', {'title': 'Flat'}, None)  # type: ignore[arg-type]
+    assert not len(api.outbox)
+
+
+def test_flush_reports_flows_returned_for_patches(mocker):
+    api = OneOffAPI()
+    api.queue_patch('outflows/', {'title': 'Flat'}, 4)
+    flow = {'id': 4, 'title': 'Flat', 'date': '2024-05-02'}
+    patch = mocker.patch.object(api.session, 'patch', return_value=mock_response(mocker, 200, flow))
+
+    result = api.flush_outbox()
+    assert patch.call_args.kwargs['json'] == {'title': 'Flat'}
+    assert result.patched == [('outflows/', flow)]
+
+
+def test_flush_keeps_order_per_flow_after_server_error(mocker):
+    api = OneOffAPI()
+    api.queue_patch('outflows/', {'title': 'A'}, 1)
+    api.queue_patch('outflows/', {'title': 'B'}, 1)
+    api.queue_delete('outflows/', 2)
+    mocker.patch.object(api.session, 'patch', return_value=mock_response(mocker, 503))
+    delete = mocker.patch.object(api.session, 'delete', return_value=mock_response(mocker, 204))
+
+    result = api.flush_outbox()
+    assert (result.sent, result.pending) == (1, 2)
+    assert api.session.patch.call_count == 1
+    delete.assert_called_once()
+
+
+def test_flush_stops_on_connection_error(mocker):
+    api = OneOffAPI()
+    api.queue_delete('outflows/', 1)
+    api.queue_delete('outflows/', 2)
+    delete = mocker.patch.object(api.session, 'delete', side_effect=requests.ConnectionError)
+
+    assert api.flush_outbox().pending == 2
+    assert delete.call_count == 1
+
+
+def test_flush_drops_rejected_operation(mocker):
+    api = OneOffAPI()
+    flow = api.queue_post('outflows/', {'title': '', 'date': '2024-05-02'})
+    mocker.patch.object(api.session, 'post', return_value=mock_response(mocker, 400, {}))
+
+    result = api.flush_outbox()
+    assert [operation.pk for operation in result.failed] == [flow['id']]
+    assert result.pending == 0
+    assert api.local_store.get_flow('outflows/', flow['id']) is None
+
+
+def test_rejected_patch_restores_mirrored_flow(mocker):
+    api = OneOffAPI()
+    flow = {'id': 4, 'title': 'Rent', 'date': '2024-05-02'}
+    api.local_store.replace_month('outflows/', 2024, 5, [flow])
+    api.queue_patch('outflows/', {'title': 'BAD'}, 4)
+    mocker.patch.object(api.session, 'patch', return_value=mock_response(mocker, 400, {}))
+    mocker.patch.object(api.session, 'get', return_value=mock_response(mocker, json=flow))
+
+    api.flush_outbox()
+    assert api.local_store.get_flow('outflows/', 4) == flow
+
+
+def test_rejected_delete_forgets_sync_when_flow_cannot_be_received(mocker):
+    api = OneOffAPI()
+    api.local_store.replace_month('outflows/', 2024, 5, [{'id': 4, 'title': 'Rent', 'date': '2024-05-02'}])
+    api.local_store.merge_changes('outflows/', [], [], '2024-05-02T10:00:00Z')
+    api.queue_delete('outflows/', 4)
+    mocker.patch.object(api.session, 'delete', return_value=mock_response(mocker, 403, {}))
+    mocker.patch.object(api.session, 'get', side_effect=requests.ConnectionError)
+
+    api.flush_outbox()
+    assert api.local_store.get_month('outflows/', 2024, 5) is None
+    assert api.local_store.get_watermark('outflows/') is None
+
+
+################################################
+#              Testing Delta Sync              #
+################################################
+
+def test_delta_sync_merges_changes_and_tombstones(mocker):
+    api = OneOffAPI()
+    get = mocker.patch.object(api.session, 'get', return_value=mock_response(mocker, json=[
+        {'id': 1, 'date': '2024-05-01', 'last_modification': '2024-05-01T10:00:00Z'},
+        {'id': 2, 'date': '2024-05-02', 'last_modification': '2024-05-03T10:00:00.5Z'},
+    ]))
+    assert api.sync_flows('outflows/') == 2
+    assert get.call_args.kwargs['params'] == {}
+    assert [flow['id'] for flow in api.get_local_flow('outflows/', {'year': 2024, 'month': 5})] == [1, 2]
+
+    get.return_value = mock_response(mocker, json=[
+        {'id': 1, 'deleted': True, 'last_modification': '2024-05-04T10:00:00Z'},
+    ])
+    assert api.sync_flows('outflows/') == 1
+    assert get.call_args.kwargs['params'] == {'modified_since': '2024-05-03T10:00:00.5Z'}
+    assert [flow['id'] for flow in api.get_local_flow('outflows/', {'year': 2024, 'month': 5})] == [2]
+    assert api.local_store.get_watermark('outflows/') == '2024-05-04T10:00:00Z'
+
+
+################################################
+#              Testing Range Fetch             #
+################################################
+
+def test_flow_range_fetches_months_concurrently_in_date_order(mocker):
+    api = OneOffAPI()
+    barrier = threading.Barrier(6, timeout=2)
+
+    def get_flow(endpoint, param_dict=None, pk=None, revalidate=False):
+        barrier.wait()  # Fails unless every month of both endpoints is in flight
+        month = param_dict['month']
+        day = 20 if endpoint == 'outflows/' else 10
+        return [{'id': month, 'date': f'2024-{month:02}-{day}'}]
+
+    mocker.patch.object(api, 'get_flow', side_effect=get_flow)
+    flows = list(api.get_flow_range(['outflows/', 'inflows/'], (2024, 1), (2024, 3)))
+
+    assert [(endpoint, flow['date']) for endpoint, flow in flows] == [
+        ('inflows/', '2024-01-10'), ('outflows/', '2024-01-20'),
+        ('inflows/', '2024-02-10'), ('outflows/', '2024-02-20'),
+        ('inflows/', '2024-03-10'), ('outflows/', '2024-03-20'),
+    ]
+
+
+def test_flow_range_yields_first_month_before_later_ones_arrive(mocker):
+    api = OneOffAPI()
+    release = threading.Event()
+
+    def get_flow(endpoint, param_dict=None, pk=None, revalidate=False):
+        if param_dict['month'] == 2:
+            release.wait(timeout=2)
+        return [{'id': param_dict['month'], 'date': f"2024-{param_dict['month']:02}-01"}]
+
+    mocker.patch.object(api, 'get_flow', side_effect=get_flow)
+    flows = api.get_flow_range(['outflows/'], (2024, 1), (2024, 2))
+    assert next(flows)[1]['id'] == 1
+    release.set()
+    assert next(flows)[1]['id'] == 2
+
+
+################################################
+#              Testing Streaming               #
+################################################
+
+def test_iter_flow_streams_response_without_caching(mocker):
+    api = OneOffAPI()
+    response = mocker.MagicMock(status_code=200, encoding=None)
+    response.__enter__.return_value = response
+    response.iter_content.return_value = iter([b'[{"id": 1, "date": "2024-05-01"},', b' {"id": 2, "date": "2024-05-02"}]'])
+    get = mocker.patch.object(api.session, 'get', return_value=response)
+
+    assert [flow['id'] for flow in api.iter_flow('outflows/', {'year': 2024, 'month': 5})] == [1, 2]
+    assert get.call_args.kwargs['stream'] is True
+    assert api.cache.stats['size'] == 0
+
+
+def test_iter_flow_serves_fresh_cache(mocker):
+    api = OneOffAPI()
+    get = mocker.patch.object(api.session, 'get', return_value=mock_response(mocker, json=[{'id': 1}]))
+    api.get_flow('outflows/', {'year': 2024, 'month': 5})
+
+    assert list(api.iter_flow('outflows/', {'year': 2024, 'month': 5})) == [{'id': 1}]
+    get.assert_called_once()
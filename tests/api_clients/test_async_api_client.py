@@ -0,0 +1,32 @@
+import asyncio
+import threading
+
+from api_clients import AsyncOneOffAPI, OneOffAPI
+
+
+async def test_get_flow_runs_outside_event_loop(mocker):
+    loop_thread = threading.get_ident()
+    calls = []
+
+    def get_flow(self, endpoint, param_dict=None, pk=None, revalidate=False):
+        calls.append(threading.get_ident())
+        return [{'endpoint': endpoint}]
+
+    mocker.patch.object(OneOffAPI, 'get_flow', get_flow)
+    api = AsyncOneOffAPI()
+    assert await api.get_flow('outflows/', {'year': 2024, 'month': 5}) == [{'endpoint': 'outflows/'}]
+    assert calls[0] != loop_thread
+
+
+async def test_requests_run_concurrently(mocker):
+    barrier = threading.Barrier(2, timeout=2)
+
+    def get_flow(self, endpoint, param_dict=None, pk=None, revalidate=False):
+        barrier.wait()  # Fails unless both requests are in flight together
+        return endpoint
+
+    mocker.patch.object(OneOffAPI, 'get_flow', get_flow)
+    api = AsyncOneOffAPI()
+    params = {'year': 2024, 'month': 5}
+    result = await asyncio.gather(api.get_flow('outflows/', params), api.get_flow('inflows/', params))
+    assert result == ['outflows/', 'inflows/']
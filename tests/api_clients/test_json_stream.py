@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from api_clients.json_stream import iter_json_array
+
+
+def chunked(text: str, size: int) -> list[bytes]:
+    data = text.encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 3, 64, 4096])
+def test_items_decoded_across_chunk_boundaries(size):
+    items = [{'id': 1, 'title': 'Zażółć gęślą jaźń', 'value': '12.50'}, 12345, None, [1.5, 'a']]
+    assert list(iter_json_array(chunked(json.dumps(items), size))) == items
+
+
+@pytest.mark.parametrize('chunks', [['[1.', '5]'], ['[1e', '5]'], ['[-', '1,tr', 'ue]']])
+def test_scalar_split_across_chunks(chunks):
+    assert list(iter_json_array(chunks)) == json.loads(''.join(chunks))
+
+
+def test_empty_array():
+    assert list(iter_json_array([b' [ ', b' ] '])) == []
+
+
+def test_items_yielded_before_body_ends():
+    def chunks():
+        yield b'[{"id": 1},'
+        raise AssertionError('Read past the first item')
+
+    assert next(iter_json_array(chunks())) == {'id': 1}
+
+
+@pytest.mark.parametrize('text', ['{"results": []}', '[1, 2', '[1 2]'])
+def test_invalid_array_raises(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array([text.encode()]))
@@ -0,0 +1,42 @@
+import pytest
+
+from api_clients.local_store import LocalFlowStore
+
+
+@pytest.fixture
+def store():
+    local_store = LocalFlowStore(':memory:')
+    yield local_store
+    local_store.close()
+
+
+def test_month_never_synced_returns_none(store):
+    assert store.get_month('outflows/', 2024, 5) is None
+
+
+def test_replace_month_mirrors_api_response(store):
+    store.replace_month('outflows/', 2024, 5, [{'id': 1, 'date': '2024-05-31'}, {'id': 2, 'date': '2024-05-01'}])
+    store.replace_month('outflows/', 2024, 6, [{'id': 3, 'date': '2024-06-01'}])
+    assert store.get_month('outflows/', 2024, 5) == [{'id': 2, 'date': '2024-05-01'}, {'id': 1, 'date': '2024-05-31'}]
+
+    store.replace_month('outflows/', 2024, 5, [{'id': 2, 'date': '2024-05-01'}])
+    assert store.get_month('outflows/', 2024, 5) == [{'id': 2, 'date': '2024-05-01'}]
+    assert store.get_month('outflows/', 2024, 6) == [{'id': 3, 'date': '2024-06-01'}]
+    assert store.get_month('inflows/', 2024, 5) is None
+
+
+def test_upsert_and_delete_flow(store):
+    store.replace_month('inflows/', 2024, 12, [])
+    store.upsert_flow('inflows/', {'id': 4, 'date': '2024-12-24', 'title': 'Gift'})
+    assert store.get_month('inflows/', 2024, 12) == [{'id': 4, 'date': '2024-12-24', 'title': 'Gift'}]
+    assert store.get_flow('inflows/', 4)['title'] == 'Gift'
+
+    store.delete_flow('inflows/', 4)
+    assert store.get_month('inflows/', 2024, 12) == []
+    assert store.get_flow('inflows/', 4) is None
+
+
+def test_all_flows_of_every_endpoint(store):
+    store.replace_month('outflows/', 2024, 5, [{'id': 1, 'date': '2024-05-31'}])
+    store.upsert_flow('inflows/', {'id': 1, 'date': '2024-01-02'})
+    assert store.all_flows() == [('inflows/', {'id': 1, 'date': '2024-01-02'}), ('outflows/', {'id': 1, 'date': '2024-05-31'})]
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from api_clients.outbox import Outbox, OutboxOperation
+
+
+def test_pending_operations_survive_restart(tmp_path):
+    path = str(tmp_path / 'outbox.jsonl')
+    outbox = Outbox(path)
+    created = OutboxOperation('POST', 'outflows/', outbox.new_temp_id(), {'title': 'Rent'})
+    outbox.append(created)
+    outbox.append(OutboxOperation('DELETE', 'outflows/', 7))
+
+    replayed = Outbox(path)
+    assert [op.op_id for op in replayed.pending()] == [op.op_id for op in outbox.pending()]
+    assert replayed.new_temp_id() == created.pk - 1
+
+
+def test_ack_replaces_temporary_id_also_after_restart(tmp_path):
+    path = str(tmp_path / 'outbox.jsonl')
+    outbox = Outbox(path)
+    created = OutboxOperation('POST', 'outflows/', -1, {'title': 'Rent'})
+    outbox.append(created)
+    outbox.append(OutboxOperation('PATCH', 'outflows/', -1, {'title': 'Flat'}))
+    outbox.ack(created, pk=42)
+
+    assert [op.pk for op in outbox.pending()] == [42]
+    assert [op.pk for op in Outbox(path).pending()] == [42]
+
+
+def test_journal_compacted_when_everything_acked(tmp_path):
+    path = tmp_path / 'outbox.jsonl'
+    outbox = Outbox(str(path))
+    operation = OutboxOperation('DELETE', 'inflows/', 3)
+    outbox.append(operation)
+    outbox.ack(operation)
+    assert path.read_text() == ''
+
+
+def test_truncated_journal_line_is_skipped(tmp_path):
+    path = tmp_path / 'outbox.jsonl'
+    outbox = Outbox(str(path))
+    outbox.append(OutboxOperation('DELETE', 'inflows/', 3))
+    with open(path, 'a') as journal:
+        journal.write('{"type": "op", "meth')
+    assert len(Outbox(str(path))) == 1
+
+
+def test_operation_without_integer_id_refused():
+    with pytest.raises(ValueError):
+        OutboxOperation('PATCH', 'outflows/', None, {'title': 'Flat'})  # type: ignore[arg-type]
+
+
+def test_invalid_journal_record_is_skipped(tmp_path):
+    path = tmp_path / 'outbox.jsonl'
+    outbox = Outbox(str(path))
+    outbox.append(OutboxOperation('DELETE', 'inflows/', 3))
+    with open(path, 'a') as journal:
+        journal.write(json.dumps({'type': 'op', 'method': 'PATCH', 'endpoint': 'outflows/', 'pk': None}) + '\n')
+
+    replayed = Outbox(str(path))
+    assert [op.pk for op in replayed.pending()] == [3]
+
+
+def test_overlay_applies_pending_operations_to_month(tmp_path):
+    outbox = Outbox(str(tmp_path / 'outbox.jsonl'))
+    outbox.append(OutboxOperation('POST', 'outflows/', -1, {'title': 'Gym', 'date': '2024-05-03'}))
+    outbox.append(OutboxOperation('PATCH', 'outflows/', 1, {'date': '2024-06-01'}))
+    outbox.append(OutboxOperation('DELETE', 'outflows/', 2))
+    outbox.append(OutboxOperation('POST', 'inflows/', -2, {'title': 'Pay', 'date': '2024-05-03'}))
+    flows = [{'id': 1, 'date': '2024-05-01'}, {'id': 2, 'date': '2024-05-02'}, {'id': 3, 'date': '2024-05-02'}]
+
+    assert outbox.overlay('outflows/', flows, (2024, 5)) == [
+        {'id': 3, 'date': '2024-05-02'},
+        {'title': 'Gym', 'date': '2024-05-03', 'id': -1},
+    ]
+    assert outbox.pending_flow('inflows/', -2) == {'title': 'Pay', 'date': '2024-05-03', 'id': -2}
@@ -0,0 +1,15 @@
+import pytest
+
+from api_clients import BasePulporoAPI
+
+
+@pytest.fixture(autouse=True)
+def in_memory_local_store(monkeypatch, tmp_path):
+    """Keep local flow mirror of every test in memory and its outbox in a temporary directory"""
+    monkeypatch.setenv('PULPORO_LOCAL_DB', ':memory:')
+    monkeypatch.setenv('PULPORO_OUTBOX', str(tmp_path / 'outbox.jsonl'))
+    BasePulporoAPI.reset_local_store()
+    BasePulporoAPI.reset_outbox()
+    yield
+    BasePulporoAPI.reset_local_store()
+    BasePulporoAPI.reset_outbox()
@@ -0,0 +1,87 @@
+from textual.app import App, ComposeResult
+from textual.widgets import Button
+
+from forms import OutflowsForm
+from forms.fields import NotBlinkingTextArea
+
+
+RECORD = {
+    'title': 'Rent',
+    'value': '1200.00',
+    'date': '2024-05-01',
+    'prediction': False,
+    'notes': 'May',
+}
+
+
+class FormApp(App):
+    def compose(self) -> ComposeResult:
+        yield OutflowsForm('Update', json=dict(RECORD))
+
+
+def submit_disabled(form: OutflowsForm) -> bool:
+    return form.query_one('#form-submit-button', Button).disabled
+
+
+async def test_update_form_starts_clean_and_valid():
+    app = FormApp()
+    async with app.run_test() as pilot:
+        form = app.query_one(OutflowsForm)
+        await pilot.pause()
+        assert not form.is_dirty
+        assert form.is_form_valid()
+        assert submit_disabled(form)
+
+
+async def test_changed_field_is_dirty_until_reverted():
+    app = FormApp()
+    async with app.run_test() as pilot:
+        form = app.query_one(OutflowsForm)
+        form.fields['title'].value = 'Rent June'
+        await pilot.pause()
+        assert form.dirty_fields == {'title'}
+        assert form.changed_values() == {'title': 'Rent June'}
+        assert not submit_disabled(form)
+
+        form.fields['title'].value = 'Rent'
+        await pilot.pause()
+        assert not form.is_dirty
+        assert submit_disabled(form)
+
+
+async def test_notes_and_checkbox_are_tracked():
+    app = FormApp()
+    async with app.run_test() as pilot:
+        form = app.query_one(OutflowsForm)
+        form.query_one('#notes', NotBlinkingTextArea).text = 'May and June'
+        form.fields['prediction'].value = True
+        await pilot.pause()
+        assert form.dirty_fields == {'notes', 'prediction'}
+        assert not submit_disabled(form)
+
+
+async def test_invalid_required_field_sets_its_bit():
+    app = FormApp()
+    async with app.run_test() as pilot:
+        form = app.query_one(OutflowsForm)
+        form.fields['title'].value = ''
+        await pilot.pause()
+        assert form.invalid_fields == form.required_bits['title']
+        assert submit_disabled(form)
+
+        form.fields['title'].value = 'Rent June'
+        await pilot.pause()
+        assert form.invalid_fields == 0
+        assert not submit_disabled(form)
+
+
+async def test_set_json_resets_dirty_state():
+    app = FormApp()
+    async with app.run_test() as pilot:
+        form = app.query_one(OutflowsForm)
+        form.fields['value'].value = '1300.00'
+        await pilot.pause()
+        form.set_json({**RECORD, 'value': '1300.00'})
+        await pilot.pause()
+        assert not form.is_dirty
+        assert form.initial_values['value'] == '1300.00'
@@ -4,6 +4,7 @@ from textual.containers import Container, Horizontal
 from textual.widgets import Static, Button
 
 from screens import ConfirmPopup
+from screens.pooled_screen import PooledScreen
 
 
 @pytest.fixture
@@ -52,3 +53,23 @@ async def test_confirm_method(confirm_popup):
         await app.push_screen(confirm_popup, check_callback)
         await pilot.click('#yes-button')
 
+
+
+async def test_open_reuses_pooled_popup():
+    app = App()
+    async with app.run_test() as pilot:
+        first = ConfirmPopup.open(app, message='First?')
+        await pilot.pause()
+        first.dismiss(False)
+        await pilot.pause()
+
+        second = ConfirmPopup.open(app, message='Second?')
+        await pilot.pause()
+        assert second is first
+        assert str(second.query_one('#confirm-popup-message', Static).renderable) == 'Second?'
+
+
+def test_pooled_screen_without_reset_refused():
+    with pytest.raises(TypeError):
+        class NotResettable(PooledScreen):
+            pass
@@ -46,3 +46,22 @@ async def test_click_on_background_dismiss(create_new):
         assert len(app.screen_stack) == 1
 
 
+
+
+async def test_open_reuses_popup_with_cleared_forms():
+    app = App()
+    async with app.run_test() as pilot:
+        first = CreateNewPopup.open(app)
+        await pilot.pause()
+        first.query_one('#form-list', OptionList).action_select()  # Opens first option, outflow form
+        await pilot.pause()
+        first.form.fields['title'].value = 'Rent'
+        first.dismiss(False)
+        await pilot.pause()
+
+        second = CreateNewPopup.open(app)
+        await pilot.pause()
+        assert second is first
+        assert second.form is None
+        assert second.query_one('#form-list', OptionList).display
+        assert second.forms['outflow-one-off'].fields['title'].value == ''
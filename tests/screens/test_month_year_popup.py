@@ -98,4 +98,17 @@ async def test_change_this_year(popup):
         await app.push_screen(popup, check_date)
         await pilot.click('#next-year')
         await pilot.click('#this-year')
-        await pilot.click(f'#{MONTH_IDS[date.month]}')
\ No newline at end of file
+        await pilot.click(f'#{MONTH_IDS[date.month]}')
+
+async def test_reopened_popup_highlights_only_new_month():
+    app = App()
+    async with app.run_test() as pilot:
+        popup = MonthYearPopup.open(app, 2024, 5)
+        await pilot.pause()
+        await pilot.click('#Jul')
+        await pilot.pause()
+
+        assert MonthYearPopup.open(app, 2024, 7) is popup
+        await pilot.pause()
+        highlighted = [button.id for button in popup.query('.month-bt').results(Button) if button.variant == 'primary']
+        assert highlighted == ['Jul']
@@ -1,8 +1,13 @@
+import subprocess
+import sys
+
+from pathlib import Path
+
 import pytest
 
 from textual.widgets import Button
 
-from main import PulporoApp
+from main import LeftNavMenu, PulporoApp
 from screens import CreateNewPopup
 from views import Ledger, Media
 
@@ -13,7 +18,7 @@ from views import Ledger, Media
 
 async def test_toggle_left_panel(mocker):
     app = PulporoApp()
-    mocker.patch.object(Ledger, 'request_table_data', return_value=[[]])
+    mocker.patch.object(Ledger, 'request_table_data', return_value=[()])
 
     async with app.run_test() as pilot:
         body = app.query_one('#body')
@@ -33,7 +38,7 @@ async def test_toggle_left_panel(mocker):
 
 async def test_create_new(mocker):
     app = PulporoApp()
-    mocker.patch.object(Ledger, 'request_table_data', return_value=[[]])
+    mocker.patch.object(Ledger, 'request_table_data', return_value=[()])
 
     async with app.run_test() as pilot:
         assert len(app.screen_stack) == 1
@@ -50,7 +55,7 @@ async def test_create_new(mocker):
 
 async def test_on_mount(mocker):
     app = PulporoApp()
-    mocker.patch.object(Ledger, 'request_table_data', return_value=[[]])
+    mocker.patch.object(Ledger, 'request_table_data', return_value=[()])
 
     async with app.run_test(size=(132, 33)):
         assert app.query_one('#LedgerBt', Button).variant == 'primary'
@@ -70,7 +75,7 @@ view_buttons = (
 @pytest.mark.parametrize('left_menu_button, el_class', view_buttons)
 async def test_open_view_and_check_button(left_menu_button, el_class, mocker):
     app = PulporoApp()
-    mocker.patch.object(Ledger, 'request_table_data', return_value=[[]])
+    mocker.patch.object(Ledger, 'request_table_data', return_value=[()])
 
     def compose_mock():
         yield Button(label="Mock Button")
@@ -81,3 +86,58 @@ async def test_open_view_and_check_button(left_menu_button, el_class, mocker):
         await pilot.click(f'#{left_menu_button}')
         assert app.query_one(f'#{el_class}')
         assert app.query_one(f'#{left_menu_button}', Button).variant == 'primary'
+
+
+async def test_view_kept_alive_when_switching_back(mocker):
+    app = PulporoApp()
+    request = mocker.patch.object(Ledger, 'request_table_data', return_value=[()])
+
+    async with app.run_test(size=(132, 33)) as pilot:
+        await app.workers.wait_for_complete()
+        ledger = app.query_one(Ledger)
+        shown_month = 1 if ledger.month != 1 else 2
+        ledger.month = shown_month
+
+        await pilot.click('#DashboardBt')
+        assert not ledger.display
+        await pilot.click('#LedgerBt')
+        await pilot.pause()
+
+        assert app.query_one('#Ledger') is ledger
+        assert ledger.display and app.query_one('#Dashboard').display is False
+        assert ledger.month == shown_month
+        assert request.call_count == 1
+
+
+async def test_least_recently_used_views_evicted(mocker, monkeypatch):
+    monkeypatch.setenv('PULPORO_VIEW_CACHE_SIZE', '1')
+    app = PulporoApp()
+    mocker.patch.object(Ledger, 'request_table_data', return_value=[()])
+
+    async with app.run_test(size=(132, 33)) as pilot:
+        await pilot.click('#DashboardBt')
+        await pilot.click('#RecurringBt')
+        await pilot.pause()
+
+        assert [child.id for child in app.query_one('#main-app').children] == ['Dashboard', 'Recurring']
+        assert list(app.query_one(LeftNavMenu).cached_views) == ['Dashboard']
+
+
+async def test_views_over_budget_evicted(mocker, monkeypatch):
+    monkeypatch.setenv('PULPORO_VIEW_CACHE_BUDGET', '1')
+    app = PulporoApp()
+    mocker.patch.object(Ledger, 'request_table_data', return_value=[()])
+
+    async with app.run_test(size=(132, 33)) as pilot:
+        await pilot.click('#DashboardBt')
+        await pilot.pause()
+
+        assert [child.id for child in app.query_one('#main-app').children] == ['Dashboard']
+
+
+def test_startup_imports_only_first_view():
+    loaded = subprocess.run(
+        [sys.executable, '-c', 'import sys, main; print(sorted(m for m in sys.modules if m.startswith(("views.", "screens.", "forms."))))'],
+        capture_output=True, text=True, check=True, cwd=Path(__file__).parent.parent
+    ).stdout
+    assert loaded.strip() == "['views.ledger']"
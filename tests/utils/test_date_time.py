@@ -1,4 +1,4 @@
-from utils import format_date_string
+from utils import format_date_string, month_span, parse_date_string, shift_month
 
 
 def test_string_with_microseconds():
@@ -11,3 +11,22 @@ def test_string_without_microseconds():
     assert result == '2024-06-20 12:30:45'
 
 
+
+
+def test_shift_month_within_year():
+    assert shift_month(2024, 5, 2) == (2024, 7)
+
+
+def test_shift_month_across_years():
+    assert shift_month(2024, 1, -1) == (2023, 12)
+    assert shift_month(2024, 12, 1) == (2025, 1)
+    assert shift_month(2024, 3, -15) == (2022, 12)
+
+
+def test_parse_date_string():
+    assert parse_date_string('2024-06-20T12:30:45.5Z') > parse_date_string('2024-06-20T12:30:45Z')
+
+
+def test_month_span():
+    assert month_span((2023, 11), (2024, 2)) == [(2023, 11), (2023, 12), (2024, 1), (2024, 2)]
+    assert month_span((2024, 2), (2024, 1)) == []
@@ -0,0 +1,48 @@
+import sys
+
+from utils import Flow
+
+
+PAYLOAD = {
+    'title': 'Rent', 'value': '1200.00', 'date': '2024-05-01', 'prediction': False,
+    'notes': '', 'id': 7, 'creation_date': '2024-04-30T10:00:00Z', 'last_modification': '2024-04-30T10:00:00Z',
+}
+
+
+def test_flow_keeps_payload_order_and_values():
+    flow = Flow.from_json(PAYLOAD)
+    assert flow.id == 7 and flow.title == 'Rent'
+    assert flow.keys() == tuple(PAYLOAD)
+    assert flow.values() == tuple(PAYLOAD.values())
+    assert flow.headers == tuple(key.capitalize() for key in PAYLOAD)
+    assert flow.to_json() == PAYLOAD
+    assert flow == PAYLOAD
+
+
+def test_flow_reads_like_json_dict():
+    flow = Flow.from_json({'id': 1, 'title': 'Gift'})
+    assert flow['title'] == 'Gift'
+    assert flow.get('prediction', 'missing') == 'missing'
+    assert 'prediction' not in flow
+    assert dict(flow.items()) == {'id': 1, 'title': 'Gift'}
+
+
+def test_flow_preserves_unknown_keys():
+    flow = Flow.from_json({'id': 1, 'category': 'Home'})
+    assert flow['category'] == 'Home'
+    assert flow.values() == (1, 'Home')
+
+
+def test_flows_of_one_endpoint_share_shape():
+    first, second = Flow.decode_many([PAYLOAD, {**PAYLOAD, 'id': 8}])
+    assert first.headers is second.headers
+
+
+def test_flow_is_smaller_than_json_dict():
+    assert sys.getsizeof(Flow.from_json(PAYLOAD)) < sys.getsizeof(dict(PAYLOAD))
+
+
+def test_headers_of_payload_share_interned_shape():
+    payload = {'id': 1, 'title': 'Rent', 'value': '10.00'}
+    assert Flow.headers_of(payload) == ('Id', 'Title', 'Value')
+    assert Flow.headers_of(dict(payload)) is Flow.from_json(payload).headers
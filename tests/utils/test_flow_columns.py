@@ -0,0 +1,52 @@
+from utils.flow_columns import FlowColumns, FlowTotals, format_cents, to_cents
+
+
+HEADER = ('No', 'Id', 'Title', 'Value', 'Date', 'Prediction')
+ROWS = [
+    (1, 1, 'Rent', '1200.00', '2024-05-01', False),
+    (2, 2, 'Food', '45.99', '2024-05-10', True),
+    (3, 3, 'Gym', '30.01', '2024-05-20', True),
+]
+
+
+def test_cents_conversion():
+    assert to_cents('12.5') == 1250
+    assert to_cents(0.1) == 10
+    assert to_cents('') == 0
+    assert format_cents(-1205) == '-12.05'
+
+
+def test_totals_of_rows():
+    totals = FlowColumns.from_rows(HEADER, ROWS).totals()
+    assert totals == FlowTotals(count=3, total=127600, predicted=7600)
+    assert totals.actual == 120000
+    assert totals.average == 42533
+
+
+def test_totals_until_date():
+    assert FlowColumns.from_rows(HEADER, ROWS).totals(until='2024-05-10') == FlowTotals(2, 124599, 4599)
+
+
+def test_totals_of_keys():
+    columns = FlowColumns.from_rows(HEADER, ROWS)
+    assert columns.totals(keys={'2', '3', '9'}) == FlowTotals(2, 7600, 7600)
+    assert columns.totals(until='2024-05-10', keys=['1', '3']) == FlowTotals(1, 120000, 0)
+
+
+def test_incremental_changes_match_rebuild():
+    columns = FlowColumns.from_rows(HEADER, ROWS)
+    columns.remove('1')
+    columns.update('3', '10.00', '2024-05-20', False)
+    columns.add('4', '5.00', '2024-05-21', True)
+
+    rebuilt = FlowColumns.from_rows(HEADER, [
+        ROWS[1], (3, 3, 'Gym', '10.00', '2024-05-20', False), (4, 4, 'Tea', '5.00', '2024-05-21', True)
+    ])
+    assert columns.totals() == rebuilt.totals() == FlowTotals(3, 6099, 5099)
+    assert columns.totals(until='2024-05-20') == rebuilt.totals(until='2024-05-20')
+    assert '1' not in columns and columns.index['3'] == 0
+
+
+def test_columns_without_prediction():
+    columns = FlowColumns.from_rows(('No', 'Id', 'Value'), [(1, 1, '3.00')])
+    assert columns.totals() == FlowTotals(1, 300, 0)
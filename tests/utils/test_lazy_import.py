@@ -0,0 +1,19 @@
+import sys
+
+import pytest
+
+import screens
+
+
+def test_symbol_imported_on_first_access_and_cached(monkeypatch):
+    monkeypatch.delitem(sys.modules, 'screens.month_year_popup', raising=False)
+    monkeypatch.delattr(screens, 'MonthYearPopup', raising=False)
+
+    popup = screens.MonthYearPopup
+    assert popup.__module__ == 'screens.month_year_popup'
+    assert vars(screens)['MonthYearPopup'] is popup
+
+
+def test_unknown_symbol_raises_attribute_error():
+    with pytest.raises(AttributeError, match="module 'screens' has no attribute 'Missing'"):
+        screens.Missing
@@ -0,0 +1,45 @@
+from utils.search_index import SearchIndex
+
+
+FLOWS = [
+    ('outflows/', {'id': 1, 'title': 'Rent May', 'notes': 'Flat on Main street', 'date': '2024-05-01'}),
+    ('outflows/', {'id': 2, 'title': 'Groceries', 'notes': 'rent of a car', 'date': '2024-06-01'}),
+    ('inflows/', {'id': 3, 'title': 'Salary', 'notes': None, 'date': '2024-05-03'}),
+]
+
+
+def found(index, query):
+    return [(result.endpoint, result.pk) for result in index.search(query)]
+
+
+def test_title_matches_rank_above_notes():
+    assert found(SearchIndex.from_flows(FLOWS), 'rent') == [('outflows/', 1), ('outflows/', 2)]
+
+
+def test_prefix_and_typo_match():
+    index = SearchIndex.from_flows(FLOWS)
+    assert found(index, 'sal') == [('inflows/', 3)]
+    assert found(index, 'groceires') == [('outflows/', 2)]
+
+
+def test_all_query_tokens_must_match():
+    index = SearchIndex.from_flows(FLOWS)
+    assert found(index, 'rent car') == [('outflows/', 2)]
+    assert found(index, 'rent salary') == []
+    assert found(index, '') == []
+
+
+def test_replaced_and_removed_flows():
+    index = SearchIndex.from_flows(FLOWS)
+    index.add('outflows/', {'id': 1, 'title': 'Mortgage', 'date': '2024-05-01'})
+    index.remove(('outflows/', 2))
+    assert found(index, 'rent') == []
+    assert found(index, 'mortgage') == [('outflows/', 1)]
+    assert 'groceries' not in index.postings
+
+
+def test_replace_month_keeps_other_months_and_endpoints():
+    index = SearchIndex.from_flows(FLOWS)
+    index.replace_month('outflows/', 2024, 5, [{'id': 4, 'title': 'Rent June', 'date': '2024-05-30'}])
+    assert found(index, 'rent') == [('outflows/', 4), ('outflows/', 2)]
+    assert found(index, 'salary') == [('inflows/', 3)]
@@ -0,0 +1,26 @@
+import json
+
+from utils.startup import StartupTimer
+
+
+def test_report_saved_once_all_milestones_reached(monkeypatch, tmp_path):
+    log = tmp_path / 'startup.jsonl'
+    monkeypatch.setenv('PULPORO_STARTUP_LOG', str(log))
+    timer = StartupTimer()
+
+    timer.mark('import')
+    timer.mark('first_paint')
+    assert not log.exists()
+
+    timer.mark('first_data')
+    timer.mark('first_data')
+    reports = [json.loads(line) for line in log.read_text().splitlines()]
+    assert len(reports) == 1
+    assert 0 <= reports[0]['import'] <= reports[0]['first_paint'] <= reports[0]['first_data']
+
+
+def test_restart_forgets_milestones():
+    timer = StartupTimer(started_at=0.0)
+    timer.mark('import')
+    timer.restart(started_at=1.0)
+    assert timer.marks == {}
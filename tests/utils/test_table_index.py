@@ -0,0 +1,43 @@
+import pytest
+
+from utils.table_index import Condition, TableIndex, parse_filter
+
+
+HEADER = ('No', 'Id', 'Title', 'Value', 'Date', 'Prediction')
+ROWS = [
+    (1, 1, 'Rent', '1200.00', '2024-05-01', False),
+    (2, 2, 'food', '45.99', '2024-05-10', True),
+    (3, 3, 'Gym', '99.00', '2024-05-20', True),
+    (4, 4, 'Bike', '', '2024-05-20', False),
+]
+
+
+def test_order_by_column():
+    index = TableIndex(ROWS)
+    assert index.order(3) == ['4', '2', '3', '1']  # Empty value first, numbers compared as numbers
+    assert index.order(2, reverse=True) == ['1', '3', '2', '4']  # Text compared case-insensitively
+
+
+def test_index_follows_row_changes():
+    index = TableIndex(ROWS)
+    index.order(3)
+    index.remove('1')
+    index.add((3, 3, 'Gym', '10.00', '2024-05-20', True))
+    index.add((5, 5, 'Tea', '50.00', '2024-05-21', False))
+    assert index.order(3) == ['4', '3', '2', '5']
+
+
+def test_select_rows_matching_all_conditions():
+    index = TableIndex(ROWS)
+    assert index.select(parse_filter('value>=45.99 value<1200', HEADER)) == {'2', '3'}
+    assert index.select(parse_filter('date=2024-05-20', HEADER)) == {'3', '4'}
+    assert index.select(parse_filter('Prediction=no date!=2024-05-01', HEADER)) == {'4'}
+    assert index.select([]) == {'1', '2', '3', '4'}
+
+
+def test_parse_filter():
+    assert parse_filter('prediction=yes title=Gym', HEADER) == [Condition(5, '=', True), Condition(2, '=', 'Gym')]
+    with pytest.raises(ValueError):
+        parse_filter('category=Home', HEADER)
+    with pytest.raises(ValueError):
+        parse_filter('value>', HEADER)
@@ -1,10 +1,14 @@
+import threading
 from datetime import datetime
 
+from requests import RequestException
+
 from textual.containers import Horizontal
-from textual.widgets import DataTable, Button
+from textual.widgets import DataTable, Button, Input, OptionList, Static
 from textual.app import App
 
-from views.ledger import LedgerTable, Ledger
+from utils.flow_columns import FlowTotals
+from views.ledger import LedgerTable, Ledger, VirtualLedgerTable
 
 
 MONTHS: list[str] = [
@@ -40,6 +44,247 @@ async def test_populated_ledger_table():
         assert table_row[1] == 4
 
 
+async def test_update_rows_applies_only_changes():
+    app = App()
+    header = ('No', 'Id', 'Title')
+    async with app.run_test() as pilot:
+        ledger_table = LedgerTable([header, (1, 10, 'Rent'), (2, 11, 'Food'), (3, 12, 'Gym')])
+        await app.mount(ledger_table)
+        data_table = app.query_one(DataTable)
+        data_table.move_cursor(row=1)
+
+        ledger_table.update_rows([header, (1, 10, 'Rent'), (2, 11, 'Groceries'), (3, 13, 'Bike')])
+        await pilot.pause()
+
+        assert [data_table.get_row_at(i)[2] for i in range(3)] == ['Rent', 'Groceries', 'Bike']
+        assert '12' not in ledger_table.rows
+        assert data_table.cursor_row == 1
+        assert app.query_one(DataTable) is data_table
+
+
+async def test_month_switch_with_other_ids_rebuilds_table(mocker):
+    app = App()
+    header = ('No', 'Id', 'Title')
+    async with app.run_test() as pilot:
+        ledger_table = LedgerTable([header, *((num, num, f'May {num}') for num in range(1, 101))])
+        await app.mount(ledger_table)
+        data_table = app.query_one(DataTable)
+        remove_row = mocker.spy(data_table, 'remove_row')
+
+        ledger_table.update_rows([header, *((num, 1000 + num, f'Jun {num}') for num in range(1, 101))])
+        await pilot.pause()
+
+        remove_row.assert_not_called()
+        assert data_table.row_count == 100
+        assert data_table.get_row_at(0)[2] == 'Jun 1'
+        assert set(ledger_table.rows) == {str(1000 + num) for num in range(1, 101)}
+
+
+async def test_update_rows_keeps_server_order():
+    app = App()
+    header = ('No', 'Id', 'Title')
+    async with app.run_test() as pilot:
+        ledger_table = LedgerTable([header, (1, 10, 'Rent'), (2, 12, 'Gym')])
+        await app.mount(ledger_table)
+
+        ledger_table.update_rows([header, (1, 10, 'Rent'), (2, 11, 'Food'), (3, 12, 'Gym')])
+        await pilot.pause()
+
+        data_table = app.query_one(DataTable)
+        assert [data_table.get_row_at(i)[1] for i in range(3)] == [10, 11, 12]
+
+
+async def test_footer_totals_follow_row_changes():
+    app = App()
+    header = ('No', 'Id', 'Title', 'Value', 'Date', 'Prediction')
+    async with app.run_test() as pilot:
+        ledger_table = LedgerTable([
+            header, (1, 10, 'Rent', '1000.00', '2024-05-01', False), (2, 11, 'Gym', '50.50', '2024-05-02', True)
+        ])
+        await app.mount(ledger_table)
+        assert ledger_table.flow_columns.totals() == FlowTotals(2, 105050, 5050)
+
+        ledger_table.update_rows([
+            header, (1, 10, 'Rent', '900.00', '2024-05-01', False), (2, 12, 'Food', '20.00', '2024-05-03', True)
+        ])
+        await pilot.pause()
+
+        assert ledger_table.flow_columns.totals() == FlowTotals(2, 92000, 2000)
+        assert 'Total: 920.00' in str(app.query_one('#ledger-footer', Static).renderable)
+
+
+async def test_footer_totals_leave_out_filtered_rows():
+    app = App()
+    async with app.run_test() as pilot:
+        ledger_table = LedgerTable([
+            ('No', 'Id', 'Title', 'Value', 'Date', 'Prediction'),
+            (1, 10, 'Rent', '1000.00', '2024-05-01', False), (2, 11, 'Gym', '50.50', '2024-05-02', True)
+        ])
+        await app.mount(ledger_table)
+        footer: Static = app.query_one('#ledger-footer', Static)
+
+        ledger_table.set_filter('value<100')
+        await pilot.pause()
+        assert 'Flows: 1    Total: 50.50' in str(footer.renderable)
+
+        ledger_table.set_filter('')
+        await pilot.pause()
+        assert 'Flows: 2    Total: 1050.50' in str(footer.renderable)
+
+
+async def test_patch_row_updates_one_row_and_totals(mocker):
+    app = App()
+    async with app.run_test() as pilot:
+        ledger_table = LedgerTable([
+            ('No', 'Id', 'Title', 'Value', 'Date', 'Prediction'),
+            (1, 10, 'Rent', '1000.00', '2024-05-01', False),
+            (2, 11, 'Gym', '50.50', '2024-05-02', True),
+        ])
+        await app.mount(ledger_table)
+        table = ledger_table.query_one(DataTable)
+        update_cell = mocker.spy(table, 'update_cell')
+
+        patched = ledger_table.patch_row(
+            {'id': 11, 'title': 'Gym', 'value': '60.00', 'date': '2024-05-02', 'prediction': True}
+        )
+        await pilot.pause()
+
+        assert patched
+        assert [call.args[0] for call in update_cell.call_args_list] == ['11']
+        assert table.get_row('11') == [2, 11, 'Gym', '60.00', '2024-05-02', True]
+        assert ledger_table.table_content[2] == (2, 11, 'Gym', '60.00', '2024-05-02', True)
+        assert ledger_table.flow_columns.totals() == FlowTotals(2, 106000, 6000)
+        assert not ledger_table.patch_row({'id': 12, 'title': 'Food'})
+
+
+async def test_patched_flow_moved_to_other_month_reloads_table(mocker):
+    app = App()
+    today = datetime.today()
+    shown_date = f'{today.year:04d}-{today.month:02d}-01'
+    request = mocker.patch.object(Ledger, 'request_table_data', return_value=[
+        ('No', 'Id', 'Title', 'Value', 'Date'), (1, 10, 'Rent', '1000.00', shown_date)
+    ])
+    async with app.run_test() as pilot:
+        ledger = Ledger()
+        await app.mount(ledger)
+        await app.workers.wait_for_complete()
+        ledger.patch_flow_row('outflows/', {'id': 10, 'title': 'Flat', 'value': '1000.00', 'date': shown_date})
+        await pilot.pause()
+        assert request.call_count == 1
+        assert ledger.query_one(LedgerTable).rows['10'][2] == 'Flat'
+
+        ledger.patch_flow_row('outflows/', {'id': 10, 'title': 'Flat', 'value': '1000.00', 'date': '1999-01-01'})
+        await app.workers.wait_for_complete()
+        assert request.call_count == 2
+
+
+async def test_sort_and_filter_reorder_existing_rows(mocker):
+    app = App()
+    header = ('No', 'Id', 'Title', 'Value')
+    async with app.run_test() as pilot:
+        ledger_table = LedgerTable([header, (1, 10, 'Rent', '900.00'), (2, 11, 'Food', '20.00'), (3, 12, 'Gym', '50')])
+        await app.mount(ledger_table)
+        data_table = app.query_one(DataTable)
+        add_row = mocker.spy(data_table, 'add_row')
+
+        ledger_table.sort_by_header(DataTable.HeaderSelected(data_table, ledger_table.column_keys[3], 3, None))
+        await pilot.pause()
+        assert [data_table.get_row_at(i)[1] for i in range(3)] == [11, 12, 10]
+        add_row.assert_not_called()
+
+        ledger_table.set_filter('value<100')
+        ledger_table.update_rows([header, (1, 10, 'Rent', '900.00'), (2, 11, 'Food', '70.00'), (3, 12, 'Gym', '50')])
+        await pilot.pause()
+        assert [data_table.get_row_at(i)[1] for i in range(data_table.row_count)] == [12, 11]
+
+        ledger_table.set_filter('')
+        await pilot.pause()
+        assert [data_table.get_row_at(i)[1] for i in range(3)] == [12, 11, 10]
+        assert [call.args[1] for call in add_row.call_args_list] == [10]  # Only the row hidden by the filter
+
+
+async def test_filter_hiding_many_rows_rebuilds_them_at_once(mocker):
+    app = App()
+    header = ('No', 'Id', 'Title', 'Value')
+    async with app.run_test() as pilot:
+        ledger_table = LedgerTable([header, *((num, num, f'Flow {num}', f'{num}.00') for num in range(1, 101))])
+        await app.mount(ledger_table)
+        data_table = app.query_one(DataTable)
+        remove_row = mocker.spy(data_table, 'remove_row')
+
+        ledger_table.sort_column, ledger_table.sort_reverse = 3, True
+        ledger_table.set_filter('value<=10')
+        await pilot.pause()
+
+        remove_row.assert_not_called()
+        assert [data_table.get_row_at(i)[1] for i in range(data_table.row_count)] == list(range(10, 0, -1))
+
+
+async def test_update_rows_rebuilds_on_new_columns():
+    app = App()
+    async with app.run_test() as pilot:
+        ledger_table = LedgerTable([()])
+        await app.mount(ledger_table)
+
+        ledger_table.update_rows([('No', 'Id'), (1, 10)])
+        await pilot.pause()
+
+        data_table = app.query_one(DataTable)
+        assert [str(column.label) for column in data_table.columns.values()] == ['No', 'Id']
+        assert data_table.row_count == 1
+
+
+def fake_page_loader(requested_pages, row_count=100_000):
+    def load(page, page_size):
+        requested_pages.append(page)
+        first = page * page_size
+        rows = [(num + 1, num, f'Flow {num}') for num in range(first, min(first + page_size, row_count))]
+        return row_count, ('No', 'Id', 'Title'), rows
+    return load
+
+
+async def test_virtual_table_loads_only_visible_pages():
+    app = App()
+    requested_pages = []
+    async with app.run_test(size=(80, 24)) as pilot:
+        table = VirtualLedgerTable(fake_page_loader(requested_pages), page_size=50)
+        await app.mount(table)
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        assert table.row_count == 100_000
+        assert requested_pages == [0]
+
+        table.focus()
+        await pilot.press('end')
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        assert table.cursor_row == 99_999
+        assert table.get_row(99_999) == (100_000, 99_999, 'Flow 99999')
+        assert len(table.pages) <= table.MAX_CACHED_PAGES
+
+
+async def test_virtual_table_posts_selected_row():
+    selected = []
+
+    class VirtualApp(App):
+        def on_virtual_ledger_table_row_selected(self, event):
+            selected.append(event.row)
+
+    app = VirtualApp()
+    async with app.run_test() as pilot:
+        table = VirtualLedgerTable(fake_page_loader([], row_count=3), page_size=50)
+        await app.mount(table)
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        table.focus()
+        await pilot.press('down', 'enter')
+        await pilot.pause()
+        assert selected == [(2, 1, 'Flow 1')]
+
+
 async def test_ledger_structure(mocker):
     app = App()
     mocker.patch.object(Ledger, 'request_table_data', return_value=[()])
@@ -65,3 +310,267 @@ async def test_ledger_structure(mocker):
 
 
 
+async def test_ledger_loads_table_in_worker(mocker):
+    app = App()
+    table_data = [('No', 'Id', 'Title'), (1, 7, 'Rent')]
+    request = mocker.patch.object(Ledger, 'request_table_data', return_value=table_data)
+    async with app.run_test() as pilot:
+        ledger = Ledger()
+        await app.mount(ledger)
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        request.assert_called_once_with(ledger.endpoint_url, ledger.year, ledger.month)
+        data_table = app.query_one(DataTable)
+        assert data_table.row_count == 1
+        assert data_table.get_row_at(0)[2] == 'Rent'
+
+
+async def test_ledger_drops_stale_table_data(mocker):
+    app = App()
+    mocker.patch.object(Ledger, 'request_table_data', return_value=[()])
+    async with app.run_test() as pilot:
+        ledger = Ledger()
+        await app.mount(ledger)
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        stale_request = (ledger.endpoint_url, ledger.year - 1, ledger.month)
+        ledger.show_table_data(stale_request, [('No', 'Id'), (1, 7)])
+        await pilot.pause()
+        assert app.query_one(DataTable).row_count == 0
+
+
+async def test_open_flow_details_from_cache_and_revalidate(mocker):
+    app = App()
+    mocker.patch.object(Ledger, 'request_table_data', return_value=[()])
+    cached = {'id': 7, 'title': 'Rent', 'value': '10.00', 'date': '2024-05-01', 'prediction': True, 'notes': ''}
+    fresh = {**cached, 'title': 'Rent May', 'creation_date': '2024-05-01T10:00:00Z',
+             'last_modification': '2024-05-02T10:00:00Z'}
+    mocker.patch.object(Ledger.ONE_OFF_API, 'cached_flow', return_value=cached)
+    get_flow = mocker.patch.object(Ledger.ONE_OFF_API, 'get_flow', return_value=fresh)
+    async_get_flow = mocker.patch.object(Ledger.ASYNC_ONE_OFF_API, 'get_flow')
+
+    async with app.run_test() as pilot:
+        ledger = Ledger()
+        await app.mount(ledger)
+        await ledger.open_flow_details(7)
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        async_get_flow.assert_not_called()
+        get_flow.assert_any_call(ledger.endpoint_url, pk=7, revalidate=True)
+        detail = app.screen
+        assert detail.form.fields['title'].value == 'Rent May'
+        assert cached['title'] == 'Rent'
+
+
+async def test_flow_no_longer_found_reloads_table_instead_of_details(mocker):
+    app = App()
+    request = mocker.patch.object(Ledger, 'request_table_data', return_value=[()])
+    mocker.patch.object(Ledger, 'PREFETCH_MONTHS', 0)
+    mocker.patch.object(Ledger.ONE_OFF_API, 'cached_flow', return_value=None)
+    mocker.patch.object(Ledger.ASYNC_ONE_OFF_API, 'get_flow', return_value=None)
+
+    async with app.run_test():
+        ledger = Ledger()
+        await app.mount(ledger)
+        await app.workers.wait_for_complete()
+        await ledger.open_flow_details(-1)
+        await app.workers.wait_for_complete()
+
+        assert len(app.screen_stack) == 1
+        assert request.call_count == 2
+
+
+async def test_adjacent_months_prefetched_after_load(mocker):
+    app = App()
+    mocker.patch.object(Ledger, 'request_table_data', return_value=[()])
+    mocker.patch.object(Ledger, 'PREFETCH_MONTHS', 2)
+    get_flow = mocker.patch.object(Ledger.ONE_OFF_API, 'get_flow', return_value=[])
+
+    async with app.run_test() as pilot:
+        ledger = Ledger()
+        ledger.year, ledger.month = 2024, 1
+        await app.mount(ledger)
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+
+        prefetched = [call.args[1] for call in get_flow.call_args_list]
+        assert prefetched == [
+            {'year': 2024, 'month': 2},
+            {'year': 2023, 'month': 12},
+            {'year': 2024, 'month': 3},
+            {'year': 2023, 'month': 11},
+        ]
+
+
+async def test_ledger_shows_local_copy_when_api_is_down(mocker):
+    app = App()
+    mocker.patch.object(Ledger, 'request_table_data', side_effect=RequestException)
+    async with app.run_test() as pilot:
+        ledger = Ledger()
+        Ledger.ONE_OFF_API.local_store.replace_month(
+            ledger.endpoint_url, ledger.year, ledger.month,
+            [{'id': 7, 'title': 'Rent', 'date': f'{ledger.year}-{ledger.month:02}-01'}]
+        )
+        await app.mount(ledger)
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        data_table = app.query_one(DataTable)
+        assert data_table.row_count == 1
+        assert data_table.get_row_at(0)[2] == 'Rent'
+        assert not app.query_one(LedgerTable).loading
+
+
+async def test_streamed_rows_shown_in_batches_before_response_ends(mocker):
+    app = App()
+    mocker.patch.object(Ledger, 'STREAM_RESPONSES', True)
+    mocker.patch.object(Ledger, 'STREAM_BATCH_SIZE', 2)
+    mocker.patch.object(Ledger, 'PREFETCH_MONTHS', 0)
+    first_batch_shown = threading.Event()
+    shown_counts = []
+
+    def iter_flow(endpoint, param_dict):
+        yield from ({'id': pk, 'title': f'Flow {pk}'} for pk in (1, 2))
+        assert first_batch_shown.wait(5)
+        yield {'id': 3, 'title': 'Flow 3'}
+
+    mocker.patch.object(Ledger.ONE_OFF_API, 'iter_flow', side_effect=iter_flow)
+    mocker.patch.object(Ledger.ONE_OFF_API, 'get_local_flow', return_value=None)
+    show_streamed_rows = Ledger.show_streamed_rows
+
+    def record_batch(ledger, request, table_data):
+        show_streamed_rows(ledger, request, table_data)
+        shown_counts.append(len(ledger.query_one(LedgerTable).rows))
+        first_batch_shown.set()
+
+    mocker.patch.object(Ledger, 'show_streamed_rows', record_batch)
+
+    async with app.run_test() as pilot:
+        ledger = Ledger()
+        await app.mount(ledger)
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        assert shown_counts == [2, 3]
+        assert ledger.query_one(LedgerTable).table_content == [
+            ('No', 'Id', 'Title'), (1, 1, 'Flow 1'), (2, 2, 'Flow 2'), (3, 3, 'Flow 3')
+        ]
+
+
+async def test_malformed_response_stops_loading(mocker):
+    app = App()
+    mocker.patch.object(Ledger, 'request_table_data', side_effect=ValueError('Expecting value'))
+    mocker.patch.object(Ledger.ONE_OFF_API, 'get_local_flow', return_value=None)
+
+    async with app.run_test() as pilot:
+        ledger = Ledger()
+        await app.mount(ledger)
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        ledger_table = ledger.query_one(LedgerTable)
+        assert not ledger_table.loading
+        assert ledger_table.table_content == [()]
+
+
+def test_format_table_data_consumes_stream():
+    flows = ({'id': num, 'title': f'Flow {num}'} for num in (7, 8))
+    assert Ledger.format_table_data(flows) == [('No', 'Id', 'Title'), (1, 7, 'Flow 7'), (2, 8, 'Flow 8')]
+    assert Ledger.format_table_data(iter([])) == [()]
+
+
+def test_table_flows_reverses_format_table_data():
+    flows = [{'id': 7, 'title': 'Flow 7'}, {'id': 8, 'title': 'Flow 8'}]
+    assert Ledger.table_flows(Ledger.format_table_data(flows)) == flows
+    assert Ledger.table_flows([()]) == []
+
+
+async def test_search_result_opens_its_month_and_row(mocker):
+    app = App()
+    mocker.patch.object(Ledger, 'request_table_data', return_value=[('No', 'Id', 'Title'), (1, 6, 'Gym'), (2, 7, 'Rent')])
+    Ledger.ONE_OFF_API.local_store.replace_month('inflows/', 2023, 2, [{'id': 7, 'title': 'Rent', 'date': '2023-02-05'}])
+    async with app.run_test() as pilot:
+        ledger = Ledger()
+        await app.mount(ledger)
+        await app.workers.wait_for_complete()
+
+        ledger.query_one('#ledger-search', Input).value = 'renr'
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        results = ledger.query_one('#search-results', OptionList)
+        assert results.display and results.option_count == 1
+
+        results.highlighted = 0
+        results.action_select()
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        assert (ledger.endpoint_url, ledger.year, ledger.month) == ('inflows/', 2023, 2)
+        assert app.query_one(DataTable).cursor_row == 1
+        assert not results.display
+
+
+async def test_ledger_starts_with_skeleton_until_data_arrives(mocker):
+    app = App()
+    release = threading.Event()
+    table_data = [('No', 'Id', 'Title'), (1, 7, 'Rent')]
+    mocker.patch.object(Ledger, 'request_table_data', side_effect=lambda *args: release.wait(2) and table_data)
+    async with app.run_test() as pilot:
+        await app.mount(Ledger())
+        await pilot.pause()
+        data_table = app.query_one(DataTable)
+        assert data_table.row_count == LedgerTable.SKELETON_ROWS
+        assert app.query_one(LedgerTable).table_content == [()]
+
+        release.set()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert data_table.get_row_at(0)[2] == 'Rent'
+
+
+async def test_skeleton_rows_cannot_open_details(mocker):
+    app = App()
+    release = threading.Event()
+    mocker.patch.object(Ledger, 'request_table_data', side_effect=lambda *args: release.wait(2) and [()])
+    open_flow_details = mocker.patch.object(Ledger, 'open_flow_details')
+    async with app.run_test() as pilot:
+        await app.mount(Ledger())
+        await pilot.pause()
+        data_table = app.query_one(DataTable)
+        assert data_table.cursor_type == 'none'
+
+        data_table.focus()
+        await pilot.press('enter')
+        await pilot.pause()
+        data_table.post_message(DataTable.RowSelected(data_table, 0, data_table.ordered_rows[0].key))
+        await pilot.pause()
+        open_flow_details.assert_not_called()
+
+        release.set()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert data_table.cursor_type == 'row'
+
+
+async def test_ledger_starts_with_snapshot_of_last_shown_month(mocker):
+    app = App()
+    table_data = [('No', 'Id', 'Title'), (1, 7, 'Rent')]
+    mocker.patch.object(Ledger, 'request_table_data', return_value=table_data)
+    async with app.run_test() as pilot:
+        await app.mount(Ledger())
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        await app.query_one(Ledger).remove()
+
+        mocker.patch.object(Ledger, 'request_table_data', side_effect=RequestException)
+        await app.mount(Ledger())
+        assert app.query_one(LedgerTable).table_content == table_data
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert app.query_one(DataTable).get_row_at(0)[2] == 'Rent'
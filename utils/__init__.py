@@ -2,9 +2,14 @@
 
 
 # Local imports.
-from .date_time import format_date_string
+from .date_time import format_date_string, month_span, parse_date_string, shift_month
+from .flow import Flow
 
 # Public symbols.
 __all__ = [
+    'Flow',
     'format_date_string',
+    'month_span',
+    'parse_date_string',
+    'shift_month',
 ]
@@ -1,14 +1,15 @@
-from typing import Union
+from typing import Union, TYPE_CHECKING
 
-from textual.widgets import Checkbox
+if TYPE_CHECKING:
+    from textual.widgets import Checkbox
 
-from forms import NotBlinkingInput, NotBlinkingTextArea, InflowsForm, OutflowsForm
+    from forms import NotBlinkingInput, NotBlinkingTextArea, InflowsForm, OutflowsForm
 
 # Represent 1D JSON
 JsonDict = dict[str, Union[str, float, int, bool, None]]
 
-# Represent field from every form
-FormField = Union[NotBlinkingInput, Checkbox, NotBlinkingTextArea]
+# Represent field from every form, forms are imported lazily so names are forward references
+FormField = Union['NotBlinkingInput', 'Checkbox', 'NotBlinkingTextArea']
 
 # Represent every form
-FormType = Union[InflowsForm, OutflowsForm]
+FormType = Union['InflowsForm', 'OutflowsForm']
@@ -1,22 +1,64 @@
 from datetime import datetime
 
 
-def format_date_string(date_string: str) -> str:
-    """Formats a date string to YYYY-MM-DD HH:MM:SS format.
+def parse_date_string(date_string: str) -> datetime:
+    """Parses an API date string.
 
     Args:
       date_string: The date string in ISO 8601 format (YYYY-MM-DDTHH:MM:SSZ or YYYY-MM-DDTHH:MM:SS.ssssssZ).
 
     Returns:
-      The formatted date string (YYYY-MM-DD HH:MM:SS).
+      The parsed datetime.
     """
     # Determine if the date string contains microseconds
     if '.' in date_string:
         # Parse with microseconds
-        parsed_date = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S.%fZ")
-    else:
-        # Parse without microseconds
-        parsed_date = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%SZ")
+        return datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S.%fZ")
+    # Parse without microseconds
+    return datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%SZ")
+
+
+def format_date_string(date_string: str) -> str:
+    """Formats a date string to YYYY-MM-DD HH:MM:SS format.
 
+    Args:
+      date_string: The date string in ISO 8601 format (YYYY-MM-DDTHH:MM:SSZ or YYYY-MM-DDTHH:MM:SS.ssssssZ).
+
+    Returns:
+      The formatted date string (YYYY-MM-DD HH:MM:SS).
+    """
     # Format the date to the desired format
-    return parsed_date.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
+    return parse_date_string(date_string).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def shift_month(year: int, month: int, delta: int) -> tuple[int, int]:
+    """Return (year, month) moved by delta months.
+
+    Args:
+      year: The year of the starting month.
+      month: The starting month, 1-12.
+      delta: Number of months to move, negative moves back.
+
+    Returns:
+      The (year, month) tuple of the shifted month.
+    """
+    years, month_index = divmod(month - 1 + delta, 12)
+    return year + years, month_index + 1
+
+
+def month_span(start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
+    """Return every (year, month) from start to end, both included.
+
+    Args:
+      start: The (year, month) of the first month.
+      end: The (year, month) of the last month.
+
+    Returns:
+      The list of (year, month) tuples, empty when end is before start.
+    """
+    months: list[tuple[int, int]] = []
+    current = start
+    while current <= end:
+        months.append(current)
+        current = shift_month(*current, 1)
+    return months
@@ -0,0 +1,121 @@
+from operator import attrgetter
+from typing import Any, Iterable, Iterator, Mapping
+
+
+class _Shape:
+    """Keys of a flow payload in API order with their precomputed table headers and getter."""
+    __slots__ = ('keys', 'extra_keys', 'headers', 'getter')
+
+    def __init__(self, keys: tuple[str, ...]) -> None:
+        self.keys: tuple[str, ...] = keys
+        self.extra_keys: frozenset[str] = frozenset(key for key in keys if key not in Flow.FIELDS)
+        self.headers: tuple[str, ...] = tuple(key.capitalize() for key in keys)
+        self.getter = None if self.extra_keys or len(keys) < 2 else attrgetter(*keys)
+
+
+class Flow:
+    """
+    Compact record of a single inflow or outflow.
+
+    Known fields are stored in slots, so a flow takes a fraction of the
+    memory of its `JsonDict`. Key order of the API payload is kept, and
+    unknown keys are preserved, so `to_json` returns the payload back.
+    Flow supports the read-only part of the mapping protocol, so it can
+    be used wherever a `JsonDict` of a flow is read.
+    """
+    FIELDS: tuple[str, ...] = (
+        'id', 'title', 'value', 'date', 'prediction', 'notes', 'creation_date', 'last_modification'
+    )
+    __slots__ = FIELDS + ('_shape', '_extra')
+    _SHAPES: dict[tuple[str, ...], _Shape] = {}  # Payloads of one endpoint share a shape
+
+    id: int | None
+    title: str | None
+    value: str | float | None
+    date: str | None
+    prediction: bool | None
+    notes: str | None
+    creation_date: str | None
+    last_modification: str | None
+    _shape: _Shape
+    _extra: dict[str, Any] | None
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> 'Flow':
+        """Decode flow from the API payload."""
+        shape: _Shape = cls._shape_of(data)
+        flow = cls.__new__(cls)
+        for name in cls.FIELDS:
+            setattr(flow, name, data.get(name))
+        flow._shape = shape
+        flow._extra = {key: data[key] for key in shape.extra_keys} if shape.extra_keys else None
+        return flow
+
+    @classmethod
+    def _shape_of(cls, data: Mapping[str, Any]) -> _Shape:
+        """Return interned shape of the payload keys."""
+        keys = tuple(data)
+        shape: _Shape | None = cls._SHAPES.get(keys)
+        if shape is None:
+            shape = cls._SHAPES.setdefault(keys, _Shape(keys))
+        return shape
+
+    @classmethod
+    def headers_of(cls, data: Mapping[str, Any]) -> tuple[str, ...]:
+        """Return table headers of a payload without decoding it."""
+        return cls._shape_of(data).headers
+
+    @classmethod
+    def decode_many(cls, data: Iterable[Mapping[str, Any]]) -> list['Flow']:
+        """Decode list or stream of flow payloads."""
+        return [cls.from_json(flow) for flow in data]
+
+    @property
+    def headers(self) -> tuple[str, ...]:
+        """Capitalized keys used as table headers."""
+        return self._shape.headers
+
+    def keys(self) -> tuple[str, ...]:
+        return self._shape.keys
+
+    def values(self) -> tuple:
+        getter = self._shape.getter
+        if getter is not None:
+            return getter(self)
+        return tuple(self[key] for key in self._shape.keys)
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        return zip(self._shape.keys, self.values())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self._shape.keys else default
+
+    def to_json(self) -> dict[str, Any]:
+        """Return the flow as a new `JsonDict`."""
+        return dict(self.items())
+
+    def __getitem__(self, key: str) -> Any:
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        if key in self._shape.keys:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._shape.keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape.keys)
+
+    def __len__(self) -> int:
+        return len(self._shape.keys)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Flow):
+            return self._shape is other._shape and self.values() == other.values()
+        if isinstance(other, Mapping):
+            return self.to_json() == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'Flow({self.to_json()!r})'
@@ -0,0 +1,160 @@
+from array import array
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from itertools import compress
+from typing import Any, Iterable, Sequence
+
+
+def to_cents(value: Any) -> int:
+    """Return value like '12.50' as integer cents or 0 when it is not a number."""
+    try:
+        return int((Decimal(str(value)) * 100).to_integral_value())
+    except (InvalidOperation, ValueError):
+        return 0
+
+
+def format_cents(cents: int) -> str:
+    """Return integer cents as a decimal string like '12.50'."""
+    units, rest = divmod(abs(cents), 100)
+    return f"{'-' if cents < 0 else ''}{units}.{rest:02}"
+
+
+def date_to_int(date: Any) -> int:
+    """Return 'YYYY-MM-DD' date as YYYYMMDD integer or 0 when it is not parsable."""
+    try:
+        year, month, day = str(date)[:10].split('-')
+        return int(year) * 10000 + int(month) * 100 + int(day)
+    except ValueError:
+        return 0
+
+
+@dataclass(frozen=True)
+class FlowTotals:
+    """Aggregates of flows, amounts in integer cents"""
+    count: int = 0
+    total: int = 0
+    predicted: int = 0
+
+    @property
+    def actual(self) -> int:
+        return self.total - self.predicted
+
+    @property
+    def average(self) -> int:
+        return round(self.total / self.count) if self.count else 0
+
+
+class FlowColumns:
+    """
+    Columnar store of loaded flows used for aggregates.
+
+    Values are kept as integer cents, dates as YYYYMMDD integers and
+    predictions as flags in typed arrays, so bulk aggregates run over
+    contiguous machine integers instead of dicts. Running totals are
+    kept up to date on every add, update and remove, so reading the
+    totals after a single row change costs O(1).
+    """
+
+    def __init__(self) -> None:
+        self.keys: list[str] = []
+        self.index: dict[str, int] = {}  # Row key to position in the columns
+        self.cents: array = array('q')
+        self.dates: array = array('l')
+        self.predictions: array = array('b')
+        self._total: int = 0
+        self._predicted: int = 0
+
+    @classmethod
+    def from_rows(cls, header: Sequence[str], rows: Iterable[tuple], key_column: int = 1) -> 'FlowColumns':
+        """
+        Build store from Ledger table rows.
+
+        Args:
+            header (Sequence[str]): Table header, 'Value', 'Date' and 'Prediction' columns are read.
+            rows (Iterable[tuple]): Table rows.
+            key_column (int): Column holding the row key. Defaults to 1, the flow id.
+        """
+        columns = cls()
+        value_at = header.index('Value') if 'Value' in header else None
+        date_at = header.index('Date') if 'Date' in header else None
+        prediction_at = header.index('Prediction') if 'Prediction' in header else None
+        for row in rows:
+            key = str(row[key_column])
+            columns.index[key] = len(columns.keys)
+            columns.keys.append(key)
+            columns.cents.append(0 if value_at is None else to_cents(row[value_at]))
+            columns.dates.append(0 if date_at is None else date_to_int(row[date_at]))
+            columns.predictions.append(prediction_at is not None and bool(row[prediction_at]))
+        columns._total = sum(columns.cents)
+        columns._predicted = sum(compress(columns.cents, columns.predictions))
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.index
+
+    def add(self, key: str, value: Any, date: Any = None, prediction: bool = False) -> None:
+        """Append a row, replacing the row with the same key."""
+        if key in self.index:
+            self.update(key, value, date, prediction)
+            return
+        cents = to_cents(value)
+        self.index[key] = len(self.keys)
+        self.keys.append(key)
+        self.cents.append(cents)
+        self.dates.append(date_to_int(date))
+        self.predictions.append(bool(prediction))
+        self._total += cents
+        self._predicted += cents if prediction else 0
+
+    def update(self, key: str, value: Any, date: Any = None, prediction: bool = False) -> None:
+        """Replace values of the row with key."""
+        position = self.index[key]
+        old_cents, cents = self.cents[position], to_cents(value)
+        self._total += cents - old_cents
+        self._predicted -= old_cents if self.predictions[position] else 0
+        self._predicted += cents if prediction else 0
+        self.cents[position] = cents
+        self.dates[position] = date_to_int(date)
+        self.predictions[position] = bool(prediction)
+
+    def remove(self, key: str) -> None:
+        """Remove the row with key by moving the last row into its place."""
+        position = self.index.pop(key)
+        cents = self.cents[position]
+        self._total -= cents
+        self._predicted -= cents if self.predictions[position] else 0
+
+        last_key = self.keys.pop()
+        last_cents, last_date, last_prediction = self.cents.pop(), self.dates.pop(), self.predictions.pop()
+        if last_key != key:
+            self.keys[position] = last_key
+            self.index[last_key] = position
+            self.cents[position] = last_cents
+            self.dates[position] = last_date
+            self.predictions[position] = last_prediction
+
+    def totals(self, until: Any = None, keys: Iterable[str] | None = None) -> FlowTotals:
+        """
+        Return aggregates of all rows or only of rows dated on or before until and with given keys.
+
+        Args:
+            until (Any, optional): 'YYYY-MM-DD' date of the last included day. Defaults to None.
+            keys (Iterable[str], optional): Keys of included rows, unknown keys are ignored. Defaults to None.
+        """
+        if until is None and keys is None:
+            return FlowTotals(len(self.keys), self._total, self._predicted)
+        selected = [True] * len(self.keys)
+        if keys is not None:
+            selected = [False] * len(self.keys)
+            for key in keys:
+                if key in self.index:
+                    selected[self.index[key]] = True
+        if until is not None:
+            last_day = date_to_int(until)
+            selected = [is_selected and date <= last_day for is_selected, date in zip(selected, self.dates)]
+        cents = list(compress(self.cents, selected))
+        predicted = [is_selected and bool(prediction) for is_selected, prediction in zip(selected, self.predictions)]
+        return FlowTotals(len(cents), sum(cents), sum(compress(self.cents, predicted)))
@@ -0,0 +1,24 @@
+import sys
+
+from importlib import import_module
+from typing import Any, Callable
+
+
+def lazy_getattr(package_name: str, imports: dict[str, str]) -> Callable[[str], Any]:
+    """
+    Return module `__getattr__` (PEP 562) importing public symbols of a package on first access.
+
+    Args:
+        package_name (str): `__name__` of the package.
+        imports (dict[str, str]): Public symbol to the relative module defining it.
+    """
+    package = sys.modules[package_name]
+
+    def __getattr__(name: str) -> Any:
+        if name not in imports:
+            raise AttributeError(f'module {package_name!r} has no attribute {name!r}')
+        value = getattr(import_module(imports[name], package_name), name)
+        setattr(package, name, value)  # Next access does not reach __getattr__
+        return value
+
+    return __getattr__
@@ -0,0 +1,152 @@
+import re
+
+from collections import defaultdict
+from dataclasses import dataclass
+from threading import RLock
+from typing import Any, Iterable, Mapping
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Document id: endpoint and primary key of the flow
+DocumentId = tuple[str, int]
+
+
+def tokenize(text: Any) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(str(text or '').lower())
+
+
+def trigrams(token: str) -> set[str]:
+    """Return trigrams of the token padded with spaces, so short tokens have some too."""
+    padded = f'  {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """Flow matching a search query"""
+    endpoint: str
+    pk: int
+    title: str
+    date: str
+    score: float
+
+
+class SearchIndex:
+    """
+    Inverted index over titles and notes of flows with trigram fuzzy matching.
+
+    Every query token matches indexed tokens equal to it, starting with it
+    (so results show up while typing) or similar to it by trigrams (so typos
+    are tolerated). A flow is a result when all query tokens match it.
+    Title matches score higher than notes matches.
+    The index is updated in place as flows change and can be searched from other thread meanwhile.
+    """
+    FIELDS: dict[str, float] = {'title': 2.0, 'notes': 1.0}  # Indexed field and weight
+    MIN_SIMILARITY: float = 0.4  # Jaccard similarity of trigrams accepted as a typo
+    MAX_RESULTS: int = 50
+
+    def __init__(self) -> None:
+        self.postings: dict[str, dict[DocumentId, float]] = defaultdict(dict)  # Token to document weights
+        self.token_trigrams: dict[str, set[str]] = defaultdict(set)  # Trigram to tokens
+        self.documents: dict[DocumentId, tuple[str, str]] = {}  # Title and date of flows
+        self.document_tokens: dict[DocumentId, set[str]] = {}
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @classmethod
+    def from_flows(cls, flows: Iterable[tuple[str, Mapping[str, Any]]]) -> 'SearchIndex':
+        """Build index from (endpoint, flow) pairs."""
+        index = cls()
+        for endpoint, flow in flows:
+            index.add(endpoint, flow)
+        return index
+
+    def add(self, endpoint: str, flow: Mapping[str, Any]) -> None:
+        """Index a flow, replacing its previous version."""
+        document: DocumentId = (endpoint, flow['id'])
+        with self._lock:
+            if document in self.documents:
+                self.remove(document)
+            self.documents[document] = (str(flow.get('title') or ''), str(flow.get('date') or ''))
+            self.document_tokens[document] = set()
+            for field, weight in self.FIELDS.items():
+                for token in tokenize(flow.get(field)):
+                    self.document_tokens[document].add(token)
+                    if token not in self.postings:
+                        for trigram in trigrams(token):
+                            self.token_trigrams[trigram].add(token)
+                    postings = self.postings[token]
+                    postings[document] = postings.get(document, 0.0) + weight
+
+    def remove(self, document: DocumentId) -> None:
+        """Drop a flow from the index."""
+        with self._lock:
+            if self.documents.pop(document, None) is None:
+                return
+            for token in self.document_tokens.pop(document):
+                del self.postings[token][document]
+                if not self.postings[token]:
+                    del self.postings[token]
+                    for trigram in trigrams(token):
+                        self.token_trigrams[trigram].discard(token)
+
+    def replace_month(self, endpoint: str, year: int, month: int, flows: Iterable[Mapping[str, Any]]) -> None:
+        """Make indexed flows of endpoint dated in the month exactly the given ones."""
+        prefix = f'{year:04d}-{month:02d}'
+        with self._lock:
+            flows = list(flows)
+            kept: set[Any] = {flow['id'] for flow in flows}
+            for document in [
+                document for document, (_, date) in self.documents.items()
+                if document[0] == endpoint and date.startswith(prefix) and document[1] not in kept
+            ]:
+                self.remove(document)
+            for flow in flows:
+                self.add(endpoint, flow)
+
+    def matching_tokens(self, query_token: str) -> dict[str, float]:
+        """Return indexed tokens matching the query token with their similarity from 0 to 1."""
+        query_trigrams = trigrams(query_token)
+        shared: dict[str, int] = defaultdict(int)
+        for trigram in query_trigrams:
+            for token in self.token_trigrams.get(trigram, ()):
+                shared[token] += 1
+
+        matches: dict[str, float] = {}
+        for token, count in shared.items():
+            if token.startswith(query_token):
+                matches[token] = 1.0 if token == query_token else 0.9
+                continue
+            similarity = count / (len(query_trigrams) + len(trigrams(token)) - count)
+            if similarity >= self.MIN_SIMILARITY:
+                matches[token] = similarity
+        return matches
+
+    def search(self, query: str) -> list[SearchResult]:
+        """Return flows matching all tokens of the query, best first."""
+        with self._lock:
+            return self._search(query)
+
+    def _search(self, query: str) -> list[SearchResult]:
+        scores: dict[DocumentId, float] | None = None
+        for query_token in tokenize(query):
+            token_scores: dict[DocumentId, float] = defaultdict(float)
+            for token, similarity in self.matching_tokens(query_token).items():
+                for document, weight in self.postings[token].items():
+                    token_scores[document] = max(token_scores[document], similarity * weight)
+            scores = token_scores if scores is None else {
+                document: score + token_scores[document] for document, score in scores.items()
+                if document in token_scores
+            }
+        if not scores:
+            return []
+
+        # Best score first, newer flows first among equal scores
+        ranked = sorted(scores.items(), key=lambda item: (item[1], self.documents[item[0]][1]), reverse=True)
+        return [
+            SearchResult(endpoint, pk, *self.documents[(endpoint, pk)], score)
+            for (endpoint, pk), score in ranked[:self.MAX_RESULTS]
+        ]
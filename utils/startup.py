@@ -0,0 +1,58 @@
+import json
+import os
+import time
+
+from typing import Any
+
+
+class StartupTimer:
+    """
+    Measures app startup milestones in seconds since the app started:
+        import - modules needed by the first screen are imported
+        first_paint - first screen is displayed
+        first_data - Ledger shows its first data
+
+    Once every milestone is reached the measurement is appended as
+    one JSON line to the file named by PULPORO_STARTUP_LOG, if set,
+    so startup time can be tracked between releases.
+    """
+    MILESTONES: tuple[str, ...] = ('import', 'first_paint', 'first_data')
+
+    def __init__(self, started_at: float | None = None) -> None:
+        self.started_at: float = time.perf_counter() if started_at is None else started_at
+        self.marks: dict[str, float] = {}
+
+    def restart(self, started_at: float) -> None:
+        """Measure from started_at, forgetting reached milestones."""
+        self.started_at = started_at
+        self.marks = {}
+
+    def mark(self, milestone: str) -> None:
+        """Record the first time milestone is reached."""
+        if milestone in self.marks:
+            return
+        self.marks[milestone] = time.perf_counter() - self.started_at
+        if self.is_complete:
+            self.save()
+
+    @property
+    def is_complete(self) -> bool:
+        return all(milestone in self.marks for milestone in self.MILESTONES)
+
+    def report(self) -> dict[str, Any]:
+        """Return milestones in seconds with the time of measurement."""
+        return {'measured_at': time.strftime('%Y-%m-%dT%H:%M:%S'), **{
+            milestone: round(seconds, 4) for milestone, seconds in self.marks.items()
+        }}
+
+    def save(self) -> None:
+        """Append report to PULPORO_STARTUP_LOG when it is set."""
+        path: str | None = os.getenv('PULPORO_STARTUP_LOG')
+        if not path:
+            return
+        with open(path, 'a', encoding='utf-8') as log:
+            log.write(json.dumps(self.report()) + '\n')
+
+
+# App-wide timer, main.py restarts it with the moment it started executing
+startup_timer = StartupTimer()
@@ -0,0 +1,124 @@
+import re
+
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from typing import Any, Iterable, Sequence
+
+FILTER_PATTERN = re.compile(r'^(?P<column>\w+)(?P<operator>>=|<=|!=|=|>|<)(?P<operand>.*)$')
+TRUE_WORDS = ('true', 'yes', '1')
+FALSE_WORDS = ('false', 'no', '0')
+
+
+def sort_key(value: Any) -> tuple:
+    """
+    Return key ordering cell values of one column: empty cells first,
+    then numbers (also numeric strings like '12.50') and then text.
+    """
+    if value is None or value == '':
+        return (0, 0)
+    if isinstance(value, (bool, int, float)):
+        return (1, value)
+    try:
+        return (1, float(value))
+    except (TypeError, ValueError):
+        return (2, str(value).lower())
+
+
+@dataclass(frozen=True)
+class Condition:
+    """Filter condition comparing one column with an operand"""
+    column: int
+    operator: str
+    operand: Any
+
+
+def parse_filter(expression: str, header: Sequence[str]) -> list[Condition]:
+    """
+    Parse filter expression like 'value>=100 date<2024-05-15 prediction=no'.
+
+    Conditions are separated by whitespace and all of them must match.
+    Column names are compared case-insensitively with the header.
+
+    Raises:
+        ValueError: When a condition or a column name is invalid.
+    """
+    columns: dict[str, int] = {name.lower(): position for position, name in enumerate(header)}
+    conditions: list[Condition] = []
+    for part in expression.split():
+        match = FILTER_PATTERN.match(part)
+        if match is None or match['column'].lower() not in columns or not match['operand']:
+            raise ValueError(f'Invalid filter condition: {part}')
+        operand: Any = match['operand']
+        if operand.lower() in TRUE_WORDS + FALSE_WORDS and match['column'].lower() == 'prediction':
+            operand = operand.lower() in TRUE_WORDS
+        conditions.append(Condition(columns[match['column'].lower()], match['operator'], operand))
+    return conditions
+
+
+class TableIndex:
+    """
+    Sorted indexes over the columns of table rows.
+
+    Every column index is a sorted list of (sort key, row key) pairs,
+    built on first use and kept up to date on row changes, so sorting
+    by a column and selecting rows by ranges need no full pass over rows.
+    """
+
+    def __init__(self, rows: Iterable[tuple] = (), key_column: int = 1) -> None:
+        self.key_column: int = key_column
+        self.rows: dict[str, tuple] = {str(row[key_column]): row for row in rows}
+        self.columns: dict[int, list[tuple[tuple, str]]] = {}
+
+    def column(self, position: int) -> list[tuple[tuple, str]]:
+        """Return sorted index of the column at position."""
+        index = self.columns.get(position)
+        if index is None:
+            index = sorted((sort_key(row[position]), key) for key, row in self.rows.items())
+            self.columns[position] = index
+        return index
+
+    def order(self, position: int, reverse: bool = False) -> list[str]:
+        """Return row keys ordered by the column at position."""
+        keys = [key for _, key in self.column(position)]
+        return keys[::-1] if reverse else keys
+
+    def add(self, row: tuple) -> None:
+        """Add or replace a row."""
+        key = str(row[self.key_column])
+        if key in self.rows:
+            self.remove(key)
+        self.rows[key] = row
+        for position, index in self.columns.items():
+            insort(index, (sort_key(row[position]), key))
+
+    def remove(self, key: str) -> None:
+        """Remove the row with key."""
+        row = self.rows.pop(key)
+        for position, index in self.columns.items():
+            entry = (sort_key(row[position]), key)
+            del index[bisect_left(index, entry)]
+
+    def select(self, conditions: Iterable[Condition]) -> set[str]:
+        """Return keys of rows matching all conditions."""
+        selected: set[str] | None = None
+        for condition in conditions:
+            matching = self._match(condition)
+            selected = matching if selected is None else selected & matching
+        return set(self.rows) if selected is None else selected
+
+    def _match(self, condition: Condition) -> set[str]:
+        """Return keys of rows matching the condition using the column index."""
+        index = self.column(condition.column)
+        operand = sort_key(condition.operand)
+        # Entries with an equal sort key lie between these bounds, whatever the row key
+        low = bisect_left(index, (operand,))
+        high = bisect_right(index, (operand, chr(0x10FFFF)))
+        ranges: dict[str, list[slice]] = {
+            '=': [slice(low, high)],
+            '!=': [slice(0, low), slice(high, None)],
+            '>': [slice(high, None)],
+            '>=': [slice(low, None)],
+            '<': [slice(0, low)],
+            '<=': [slice(0, high)],
+        }
+        return {key for part in ranges[condition.operator] for _, key in index[part]}
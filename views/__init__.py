@@ -1,14 +1,28 @@
 """Views are the feature classes used by main.py"""
 
+from typing import TYPE_CHECKING
 
-# Local imports.
-from .dashboard import Dashboard
-from .investment import Investment
-from .ledger import Ledger
-from .liabilities import Liabilities
-from .media import Media
-from .recurring import Recurring
-from .reminders import Reminders
+from utils.lazy_import import lazy_getattr
+
+if TYPE_CHECKING:
+    from .dashboard import Dashboard
+    from .investment import Investment
+    from .ledger import Ledger
+    from .liabilities import Liabilities
+    from .media import Media
+    from .recurring import Recurring
+    from .reminders import Reminders
+
+
+__getattr__ = lazy_getattr(__name__, {
+    'Dashboard': '.dashboard',
+    'Investment': '.investment',
+    'Ledger': '.ledger',
+    'Liabilities': '.liabilities',
+    'Media': '.media',
+    'Recurring': '.recurring',
+    'Reminders': '.reminders',
+})
 
 
 # Public symbols.
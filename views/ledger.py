@@ -1,44 +1,517 @@
+import os
+
+from collections import OrderedDict
 from datetime import datetime
-from typing import Literal, Sequence, cast, TYPE_CHECKING
+from functools import partial
+from itertools import islice
+from typing import Callable, ClassVar, Iterable, Literal, Sequence, cast, TYPE_CHECKING
 
-from textual import on
+from requests import RequestException
+from rich.cells import set_cell_size
+from rich.segment import Segment
+from textual import on, work
 from textual.app import ComposeResult
+from textual.binding import Binding, BindingType
 from textual.containers import Container, Horizontal
+from textual.events import Click
+from textual.geometry import Size
+from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
 from textual.widgets import (
     Button,
     DataTable,
+    Input,
+    OptionList,
+    Static,
 )
-from textual.widgets.data_table import RowKey
+from textual.widgets.option_list import Option
+from textual.widgets.data_table import ColumnKey, RowKey
+from textual.worker import get_current_worker
 
-from screens import MonthYearPopup
-from screens import IODetail
+import screens
 
-from api_clients import OneOffAPI
+from api_clients import AsyncOneOffAPI, OneOffAPI
+from utils import Flow, shift_month
+from utils.flow_columns import FlowColumns, FlowTotals, format_cents
+from utils.search_index import SearchIndex, SearchResult
+from utils.startup import startup_timer
+from utils.table_index import Condition, TableIndex, parse_filter
 
 if TYPE_CHECKING:
+    from screens import IODetail
     from utils.data_types import JsonDict
 
 
 class LedgerTable(Container):
     """Hold Table related components"""
+    EMPTY_TABLE_LABEL = 'Create new record to fill the table 🤭'
+    SKELETON_COLUMNS: tuple[tuple[str, int], ...] = (('No', 2), ('Title', 24), ('Value', 8), ('Date', 10))
+    SKELETON_ROWS: int = 8
+    MAX_ROW_CHANGES: int = 32  # Added and removed rows applied in place, DataTable.remove_row costs O(rows)
 
-    def __init__(self, table_data: list[tuple]) -> None:
+    def __init__(self, table_data: list[tuple], skeleton: bool = False) -> None:
         super().__init__()
         self.table_content = table_data
+        self.skeleton = skeleton  # Show placeholder rows instead of the empty table label on mount
+        self.column_keys: list[ColumnKey] = []
+        self.rows: dict[str, tuple] = {}  # Row key (flow id) to displayed row
+        self.flow_columns: FlowColumns = FlowColumns()  # Aggregated by the footer
+        self.total_positions: tuple[int | None, ...] = (None, None, None)  # Value, Date and Prediction columns
+        self.table_index: TableIndex = TableIndex()  # Sorted column indexes used by sort and filter
+        self.sort_column: int | None = None  # Column picked in the header, None keeps the 'No' order
+        self.sort_reverse: bool = False
+        self.filter_conditions: list[Condition] = []
 
     def compose(self) -> ComposeResult:
         yield DataTable(id='data-table')
+        yield Static(id='ledger-footer')
+
+    @on(DataTable.HeaderSelected)
+    def sort_by_header(self, event: DataTable.HeaderSelected) -> None:
+        """Sort by the clicked column, clicking it again reverses the order."""
+        if self.table_content == [()]:
+            return
+        if self.sort_column == event.column_index:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column, self.sort_reverse = event.column_index, False
+        self.apply_view()
+
+    def set_filter(self, expression: str) -> None:
+        """
+        Show only rows matching filter expression like 'value>=100 prediction=no'.
+        Empty expression shows all rows.
+
+        Raises:
+            ValueError: When the expression is invalid.
+        """
+        header: tuple = self.table_content[0] if self.table_content != [()] else ()
+        self.filter_conditions = parse_filter(expression, header)
+        self.apply_view()
+        self.update_footer()
+
+    def apply_view(self) -> None:
+        """
+        Show rows passing the filter in the sort order using the column indexes.
+        Existing rows are only reordered, rows are added or removed only
+        when they enter or leave the filter. When more than MAX_ROW_CHANGES
+        rows enter or leave, the rows are rebuilt at once in the new order.
+        """
+        if self.table_content == [()]:
+            return
+        table: DataTable = self.query_one(DataTable)
+        visible: list[str] = (
+            list(self.rows) if self.sort_column is None
+            else self.table_index.order(self.sort_column, self.sort_reverse)
+        )
+        if self.filter_conditions:
+            selected: set[str] = self.table_index.select(self.filter_conditions)
+            visible = [key for key in visible if key in selected]
+
+        visible_keys: set[str] = set(visible)
+        shown_keys: set[str] = {cast(str, row_key.value) for row_key in table.rows}
+        if len(visible_keys ^ shown_keys) > self.MAX_ROW_CHANGES:
+            table.clear()
+            for key in visible:
+                table.add_row(*self.rows[key], key=key)
+            return
+
+        for key in shown_keys - visible_keys:
+            table.remove_row(key)
+        for key in visible:
+            if key not in shown_keys:
+                table.add_row(*self.rows[key], key=key)
+
+        rank: dict[str, int] = {key: position for position, key in enumerate(visible)}
+        table.sort(self.column_keys[1], key=lambda flow_id: rank[str(flow_id)])
 
     def on_mount(self) -> None:
         table: DataTable = self.query_one(DataTable)
         table.zebra_stripes = True
         table.cursor_type = "row"
+        if self.skeleton and self.table_content == [()]:
+            self.show_skeleton()
+        else:
+            self.fill_table(self.table_content)
 
-        if self.table_content == [()]:
-            table.add_column('Create new record to fill the table 🤭')
+    def show_skeleton(self) -> None:
+        """
+        Show placeholder rows until the first data arrives.
+        Table content stays empty, so the data replaces the placeholder as a whole.
+        Placeholder rows cannot be selected.
+        """
+        table: DataTable = self.query_one(DataTable)
+        table.clear(columns=True)
+        table.cursor_type = 'none'
+        self.table_content = [()]
+        self.rows = {}
+        self.column_keys = table.add_columns(*(label for label, _ in self.SKELETON_COLUMNS))
+        for _ in range(self.SKELETON_ROWS):
+            table.add_row(*('░' * width for _, width in self.SKELETON_COLUMNS))
+
+    @staticmethod
+    def row_key(row: tuple) -> str:
+        """Return key of the row: the flow id from the second column."""
+        return str(row[1])
+
+    def fill_table(self, table_data: list[tuple]) -> None:
+        """Rebuild columns and rows of the table from scratch."""
+        table: DataTable = self.query_one(DataTable)
+        table.clear(columns=True)
+        table.cursor_type = 'row'
+        self.table_content = table_data
+        self.rows = {}
+
+        if table_data == [()]:
+            self.column_keys = [table.add_column(self.EMPTY_TABLE_LABEL)]
+            self.flow_columns = FlowColumns()
+            self.table_index = TableIndex()
+            self.update_footer()
+            return
+
+        self.column_keys = table.add_columns(*table_data[0])
+        self.table_index = TableIndex(table_data[1:])
+        if self.sort_column is not None and self.sort_column >= len(table_data[0]):
+            self.sort_column = None
+        if any(condition.column >= len(table_data[0]) for condition in self.filter_conditions):
+            self.filter_conditions = []
+        filtered: set[str] | None = (
+            self.table_index.select(self.filter_conditions) if self.filter_conditions else None
+        )
+        for row in table_data[1:]:
+            key = self.row_key(row)
+            self.rows[key] = row
+            if filtered is None or key in filtered:
+                table.add_row(*row, key=key)
+        if self.sort_column is not None:
+            self.apply_view()
+
+        header: tuple = table_data[0]
+        self.total_positions = tuple(
+            header.index(column) if column in header else None for column in ('Value', 'Date', 'Prediction')
+        )
+        self.flow_columns = FlowColumns.from_rows(header, table_data[1:])
+        self.update_footer()
+
+    def total_values(self, row: tuple) -> tuple:
+        """Return value, date and prediction of the row, None for missing columns."""
+        return tuple(None if position is None else row[position] for position in self.total_positions)
+
+    def update_footer(self) -> None:
+        """Show totals of the displayed rows below the table, rows hidden by the filter are left out."""
+        footer: Static = self.query_one('#ledger-footer', Static)
+        if not len(self.flow_columns):
+            footer.update('')
+            return
+        totals: FlowTotals = self.flow_columns.totals(
+            keys=self.table_index.select(self.filter_conditions) if self.filter_conditions else None
+        )
+        footer.update(
+            f'Flows: {totals.count}    Total: {format_cents(totals.total)}    '
+            f'Average: {format_cents(totals.average)}    Actual: {format_cents(totals.actual)}    '
+            f'Predicted: {format_cents(totals.predicted)}'
+        )
+
+    def update_rows(self, table_data: list[tuple]) -> None:
+        """
+        Apply only the difference between displayed and new data:
+        add new rows, update changed cells and remove deleted rows
+        keeping cursor and scroll position.
+        Rebuild the table when columns are different or more than
+        MAX_ROW_CHANGES rows are added and removed, e.g. on a month switch.
+        """
+        if table_data == [()] or self.table_content == [()] or table_data[0] != self.table_content[0]:
+            self.fill_table(table_data)
+            return
+
+        table: DataTable = self.query_one(DataTable)
+        new_rows: dict[str, tuple] = {self.row_key(row): row for row in table_data[1:]}
+        row_changes: int = len(self.rows.keys() ^ new_rows.keys())
+        if row_changes > self.MAX_ROW_CHANGES:
+            self.fill_table(table_data)
+            return
+
+        custom_view: bool = self.sort_column is not None or bool(self.filter_conditions)
+
+        for key in self.rows.keys() - new_rows.keys():
+            if key in table.rows:
+                table.remove_row(key)
+            self.flow_columns.remove(key)
+            self.table_index.remove(key)
+
+        reordered = False
+        for key, row in new_rows.items():
+            old_row = self.rows.get(key)
+            if old_row is None:
+                if not custom_view:
+                    table.add_row(*row, key=key)
+                self.flow_columns.add(key, *self.total_values(row))
+                self.table_index.add(row)
+                reordered = True
+            elif old_row != row:
+                self.replace_row(key, old_row, row)
+                reordered = reordered or old_row[0] != row[0]
+
+        self.table_content = table_data
+        self.rows = new_rows
+        if custom_view:
+            self.apply_view()
+        elif reordered:
+            table.sort(self.column_keys[0])  # Restore order of the 'No' column
+        self.update_footer()
+
+    def merge_rows(self, table_data: list[tuple]) -> None:
+        """Add and update given rows keeping the other shown ones, e.g. for a part of a streamed response."""
+        if table_data == [()]:
+            return
+        if self.table_content == [()] or table_data[0] != self.table_content[0]:
+            self.fill_table(table_data)
+            return
+        merged: dict[str, tuple] = {**self.rows, **{self.row_key(row): row for row in table_data[1:]}}
+        self.update_rows([table_data[0], *merged.values()])
+
+    def replace_row(self, key: str, old_row: tuple, row: tuple) -> None:
+        """Update changed cells, totals and indexes of one row."""
+        table: DataTable = self.query_one(DataTable)
+        if key in table.rows:
+            for column_key, old_value, value in zip(self.column_keys, old_row, row):
+                if old_value != value:
+                    table.update_cell(key, column_key, value)
+        if self.total_values(old_row) != self.total_values(row):
+            self.flow_columns.update(key, *self.total_values(row))
+        self.table_index.add(row)
+
+    def patch_row(self, flow: 'JsonDict') -> bool:
+        """
+        Show changed flow in its row keeping the row number, without rebuilding the table.
+        Return False when the flow is not shown or its columns differ from the table ones.
+        """
+        key: str = str(flow.get('id'))
+        old_row: tuple | None = self.rows.get(key)
+        if old_row is None:
+            return False
+        flow_record: Flow = Flow.from_json(flow)
+        if ('No', *flow_record.headers) != self.table_content[0]:
+            return False
+
+        row: tuple = (old_row[0], *flow_record.values())
+        if row == old_row:
+            return True
+        self.replace_row(key, old_row, row)
+        self.rows[key] = row
+        position: int = old_row[0]  # Row number is its position below the header
+        if position >= len(self.table_content) or self.row_key(self.table_content[position]) != key:
+            position = next(  # Not yet renumbered, e.g. while a streamed response is shown
+                index for index, content_row in enumerate(self.table_content)
+                if index and self.row_key(content_row) == key
+            )
+        self.table_content[position] = row
+        if self.sort_column is not None or self.filter_conditions:
+            self.apply_view()
+        self.update_footer()
+        return True
+
+
+# Takes page number and page size, returns total row count, header and rows of the page
+PageLoader = Callable[[int, int], tuple[int, tuple, list[tuple]]]
+
+
+class VirtualLedgerTable(ScrollView, can_focus=True):
+    """
+    Table that renders only the rows in the viewport.
+
+    Rows are fetched page by page with `page_loader` when they scroll into view.
+    Only MAX_CACHED_PAGES pages are kept, so memory stays bounded for any row count.
+    """
+    DEFAULT_CSS = """
+    VirtualLedgerTable {
+        height: 1fr;
+        scrollbar-gutter: stable;
+    }
+
+    VirtualLedgerTable > .virtual-table--header {
+        text-style: bold;
+        background: $primary;
+    }
+
+    VirtualLedgerTable > .virtual-table--cursor {
+        background: $accent;
+    }
+
+    VirtualLedgerTable > .virtual-table--even-row {
+        background: $primary 10%;
+    }
+    """
+    COMPONENT_CLASSES: ClassVar[set[str]] = {
+        'virtual-table--header',
+        'virtual-table--cursor',
+        'virtual-table--even-row',
+    }
+    BINDINGS: ClassVar[list[BindingType]] = [
+        Binding('up', 'cursor_up', 'Up', show=False),
+        Binding('down', 'cursor_down', 'Down', show=False),
+        Binding('pageup', 'page_up', 'Page Up', show=False),
+        Binding('pagedown', 'page_down', 'Page Down', show=False),
+        Binding('home', 'scroll_home', 'Home', show=False),
+        Binding('end', 'scroll_end', 'End', show=False),
+        Binding('enter', 'select_cursor', 'Select', show=False),
+    ]
+    MAX_CACHED_PAGES: int = 8
+    MAX_COLUMN_WIDTH: int = 40
+    cursor_row: reactive[int] = reactive(0)
+
+    class RowSelected(Message):
+        """Posted when a row is selected with enter or click."""
+
+        def __init__(self, table: 'VirtualLedgerTable', row: tuple) -> None:
+            self.table = table
+            self.row = row
+            super().__init__()
+
+    def __init__(self, page_loader: PageLoader, page_size: int = 100, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.page_loader = page_loader
+        self.page_size = page_size
+        self.row_count: int = 0
+        self.header: tuple = ()
+        self.column_widths: list[int] = []
+        self.pages: OrderedDict[int, list[tuple]] = OrderedDict()
+        self._pending_pages: set[int] = set()
+
+    def on_mount(self) -> None:
+        self.loading = True
+        self.request_page(0)
+
+    def request_page(self, page: int) -> None:
+        """Start loading a page unless it is already on the way."""
+        if page in self._pending_pages:
+            return
+        self._pending_pages.add(page)
+        self.load_page(page)
+
+    @work(thread=True, group='virtual-table-pages', exit_on_error=False)
+    def load_page(self, page: int) -> None:
+        """Fetch a page outside the event loop."""
+        try:
+            row_count, header, rows = self.page_loader(page, self.page_size)
+        except RequestException:
+            if not get_current_worker().is_cancelled:
+                self.app.call_from_thread(self.page_failed, page)
+            return
+
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self.add_page, page, row_count, header, rows)
+
+    def add_page(self, page: int, row_count: int, header: tuple, rows: list[tuple]) -> None:
+        """Store fetched page, evict least recently used ones and repaint."""
+        self._pending_pages.discard(page)
+        self.pages[page] = rows
+        self.pages.move_to_end(page)
+        while len(self.pages) > self.MAX_CACHED_PAGES:
+            self.pages.popitem(last=False)
+
+        if not self.column_widths or header != self.header:
+            self.header = header or (LedgerTable.EMPTY_TABLE_LABEL,)
+            self.column_widths = [
+                min(max(len(str(cell)) for cell in column), self.MAX_COLUMN_WIDTH)
+                for column in zip(self.header, *rows)
+            ]
+        self.row_count = row_count
+        self.virtual_size = Size(sum(self.column_widths) + 2 * len(self.column_widths), row_count + 1)
+        self.loading = False
+        self.refresh()
+
+    def page_failed(self, page: int) -> None:
+        """Allow page to be requested again after a failed request."""
+        self._pending_pages.discard(page)
+        self.loading = False
+        self.notify('Cannot reach Pulporo API', severity='error')
+
+    def get_row(self, index: int) -> tuple | None:
+        """Return row by index or None and request its page when it is not loaded."""
+        page, offset = divmod(index, self.page_size)
+        rows = self.pages.get(page)
+        if rows is None:
+            self.request_page(page)
+            return None
+        self.pages.move_to_end(page)
+        return rows[offset] if offset < len(rows) else None
+
+    def render_cells(self, cells: Sequence) -> str:
+        """Join cells into one line of fixed width columns."""
+        return ''.join(
+            f' {set_cell_size(str(cell), width)} ' for cell, width in zip(cells, self.column_widths)
+        )
+
+    def render_line(self, y: int) -> Strip:
+        """Render header on the first line and visible rows below it."""
+        scroll_x, scroll_y = self.scroll_offset
+        width: int = self.size.width
+        if y == 0:
+            text = self.render_cells(self.header)
+            style = self.get_component_rich_style('virtual-table--header')
+        else:
+            index: int = scroll_y + y - 1
+            if index >= self.row_count:
+                return Strip.blank(width, self.rich_style)
+            row = self.get_row(index)
+            text = self.render_cells(row) if row is not None else ' …'
+            if index == self.cursor_row:
+                style = self.get_component_rich_style('virtual-table--cursor')
+            elif index % 2:
+                style = self.get_component_rich_style('virtual-table--even-row')
+            else:
+                style = self.rich_style
+        return Strip([Segment(text, style)]).crop_extend(scroll_x, scroll_x + width, style)
+
+    def validate_cursor_row(self, cursor_row: int) -> int:
+        return max(0, min(cursor_row, self.row_count - 1))
+
+    def watch_cursor_row(self) -> None:
+        """Keep cursor inside the viewport."""
+        visible_rows: int = max(self.size.height - 1, 1)
+        scroll_y: int = self.scroll_offset.y
+        if self.cursor_row < scroll_y:
+            self.scroll_to(y=self.cursor_row, animate=False)
+        elif self.cursor_row >= scroll_y + visible_rows:
+            self.scroll_to(y=self.cursor_row - visible_rows + 1, animate=False)
+        self.refresh()
+
+    def action_cursor_up(self) -> None:
+        self.cursor_row -= 1
+
+    def action_cursor_down(self) -> None:
+        self.cursor_row += 1
+
+    def action_page_up(self) -> None:
+        self.cursor_row -= self.size.height - 1
+
+    def action_page_down(self) -> None:
+        self.cursor_row += self.size.height - 1
+
+    def action_scroll_home(self) -> None:
+        self.cursor_row = 0
+
+    def action_scroll_end(self) -> None:
+        self.cursor_row = self.row_count - 1
+
+    def action_select_cursor(self) -> None:
+        """Post RowSelected for row under cursor when it is loaded."""
+        row = self.get_row(self.cursor_row) if self.row_count else None
+        if row is not None:
+            self.post_message(self.RowSelected(self, row))
+
+    def on_click(self, event: Click) -> None:
+        """Move cursor to clicked row and select it when it was already highlighted"""
+        if event.y == 0:
+            return
+        index: int = self.scroll_offset.y + event.y - 1
+        if index == self.cursor_row:
+            self.action_select_cursor()
         else:
-            table.add_columns(*self.table_content[0])
-            table.add_rows(self.table_content[1:])
+            self.cursor_row = index
 
 
 class Ledger(Container):
@@ -76,10 +549,41 @@ class Ledger(Container):
     }
 
     #data-table {
+        height: 1fr;
         scrollbar-gutter: stable;
     }
+
+    #ledger-tools {
+        layout: horizontal;
+        height: auto;
+    }
+
+    #ledger-search, #ledger-filter {
+        width: 1fr;
+        margin: 0 1;
+    }
+
+    #search-results {
+        display: none;
+        max-height: 10;
+        margin: 0 1;
+    }
+
+    #ledger-footer {
+        height: auto;
+        padding: 0 1;
+        text-style: bold;
+    }
     """
     ONE_OFF_API = OneOffAPI()
+    VIRTUAL_TABLE: bool = os.getenv('PULPORO_VIRTUAL_TABLE', '0') == '1'  # Render only visible rows
+    PAGE_SIZE: int = int(os.getenv('PULPORO_PAGE_SIZE', '100'))
+    PREFETCH_MONTHS: int = int(os.getenv('PULPORO_PREFETCH_MONTHS', '1'))  # Months before and after shown one
+    DELTA_SYNC: bool = os.getenv('PULPORO_DELTA_SYNC', '0') == '1'  # Refresh by syncing changes only
+    STREAM_RESPONSES: bool = os.getenv('PULPORO_STREAM_RESPONSES', '0') == '1'  # Show rows while decoding
+    STREAM_BATCH_SIZE: int = int(os.getenv('PULPORO_STREAM_BATCH_SIZE', '200'))  # Streamed rows shown at once
+    SNAPSHOT_NAME: str = 'ledger'  # Last shown table kept in the local store for the next start
+    ASYNC_ONE_OFF_API = AsyncOneOffAPI()
     MONTHS: list[str] = [
         "Jan", "Feb", "Mar", "Apr", "May", "Jun",
         "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"
@@ -88,6 +592,9 @@ class Ledger(Container):
     year: int = TODAY.year
     month: int = TODAY.month
     endpoint_url: Literal['outflows/', 'inflows/'] = 'outflows/'
+    search_index: SearchIndex | None = None  # Built from the local mirror on first search
+    search_results: list[SearchResult] = []
+    jump_to_pk: int | None = None  # Row selected once the table shows the searched month
 
     def compose(self) -> ComposeResult:
         with Container(id='ledger-menu'):
@@ -109,7 +616,29 @@ class Ledger(Container):
                 yield Button('Today', id='today')
                 yield Button('Next Month', id='next-month')
 
-        yield LedgerTable(table_data=self.request_table_data())
+        if self.VIRTUAL_TABLE:
+            yield self.create_virtual_table()
+        else:
+            with Container(id='ledger-tools'):
+                yield Input(placeholder='Search titles and notes', id='ledger-search')
+                yield Input(placeholder='Filter e.g. value>=100 date<2024-05-15 prediction=no', id='ledger-filter')
+            yield OptionList(id='search-results')
+            yield LedgerTable(table_data=self.read_snapshot(), skeleton=True)
+
+    def on_mount(self) -> None:
+        """
+        Load table data in the background once the menu is displayed.
+        The skeleton or the snapshot shown meanwhile is replaced in place.
+        """
+        if not self.VIRTUAL_TABLE:
+            self.load_table_data(self.endpoint_url, self.year, self.month)
+
+    def read_snapshot(self) -> list[tuple]:
+        """Return last shown table when it is of the opened flow and month, otherwise an empty table."""
+        snapshot = self.ONE_OFF_API.local_store.get_snapshot(self.SNAPSHOT_NAME)
+        if not snapshot or snapshot['request'] != [self.endpoint_url, self.year, self.month]:
+            return [()]
+        return [tuple(row) for row in snapshot['table']]
 
     @on(Button.Pressed, '#month-button')
     def month_button_pressed(self) -> None:
@@ -122,8 +651,7 @@ class Ledger(Container):
                 self.update_month_button_label()
                 self.reload_table()
 
-        popup: MonthYearPopup = MonthYearPopup(self.year, self.month)
-        self.app.push_screen(popup, update_table)
+        screens.MonthYearPopup.open(self.app, self.year, self.month, callback=update_table)
 
     @on(Button.Pressed, '#outflows, #inflows')
     def flow_section_pressed(self, event: Button.Pressed) -> None:
@@ -160,13 +688,7 @@ class Ledger(Container):
         and reload the table to reflect the new date.
         """
         month_delta: int = -1 if event.button.id == 'prev-month' else 1
-        self.month += month_delta
-        if self.month == 0:
-            self.year -= 1
-            self.month = 12
-        elif self.month == 13:
-            self.year += 1
-            self.month = 1
+        self.year, self.month = shift_month(self.year, self.month, month_delta)
         self.update_month_button_label()
         self.reload_table()
 
@@ -184,47 +706,401 @@ class Ledger(Container):
         self.reload_table()
 
     @on(DataTable.RowSelected)
-    def open_popup_with_details(self, event: DataTable.RowSelected) -> None:
+    async def open_popup_with_details(self, event: DataTable.RowSelected) -> None:
         """
         Open a popup with detailed information about a selected row in the DataTable.
         """
+        if self.query_one(LedgerTable).table_content == [()]:
+            return  # Skeleton or empty table label, not a flow
+        row_key: RowKey = event.row_key
+        table_row: list = self.query_one(DataTable).get_row(row_key)
+        await self.open_flow_details(table_row[1])
+
+    @on(VirtualLedgerTable.RowSelected)
+    async def open_popup_with_virtual_row_details(self, event: VirtualLedgerTable.RowSelected) -> None:
+        """
+        Open a popup with detailed information about a selected row in the VirtualLedgerTable.
+        """
+        await self.open_flow_details(event.row[1])
+
+    @on(Input.Submitted, '#ledger-filter')
+    def filter_table(self, event: Input.Submitted) -> None:
+        """Show only rows matching the submitted filter expression"""
+        try:
+            self.query_one(LedgerTable).set_filter(event.value)
+        except ValueError as error:
+            self.notify(str(error), severity='error')
+
+    @on(Input.Changed, '#ledger-search')
+    def search_changed(self, event: Input.Changed) -> None:
+        """Search flows in the background on every change of the query"""
+        if not event.value.strip():
+            self.workers.cancel_group(self, 'ledger-search')
+            self.show_search_results(event.value, [])
+            return
+        self.search_flows(event.value)
+
+    @work(thread=True, exclusive=True, group='ledger-search', exit_on_error=False)
+    def search_flows(self, query: str) -> None:
+        """Search all locally known flows outside the event loop."""
+        search_index: SearchIndex | None = self.search_index
+        if search_index is None:
+            search_index = SearchIndex.from_flows(self.ONE_OFF_API.local_store.all_flows())
+            self.search_index = search_index
+        results: list[SearchResult] = search_index.search(query)
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self.show_search_results, query, results)
+
+    def show_search_results(self, query: str, results: list[SearchResult]) -> None:
+        """List search results under the search bar unless the query has changed in the meantime."""
+        if query != self.query_one('#ledger-search', Input).value:
+            return
+        self.search_results = results
+        option_list: OptionList = self.query_one('#search-results', OptionList)
+        option_list.clear_options()
+        option_list.add_options([
+            Option(f"{result.date}  {'Inflow ' if result.endpoint == 'inflows/' else 'Outflow'}  {result.title}")
+            for result in results
+        ])
+        option_list.display = bool(results)
+
+    @on(OptionList.OptionSelected, '#search-results')
+    def open_search_result(self, event: OptionList.OptionSelected) -> None:
+        """Show month of the selected result and move cursor to its row"""
+        result: SearchResult = self.search_results[event.option_index]
+        year, month = (int(part) for part in result.date.split('-')[:2])
+        self.endpoint_url = 'inflows/' if result.endpoint == 'inflows/' else 'outflows/'
+        flow_id = self.endpoint_url.rstrip('/')
+        self.update_button_variants(('outflows', 'inflows'), self.get_widget_by_id(flow_id, Button))
+        self.year, self.month = year, month
+        self.update_month_button_label()
+        self.jump_to_pk = result.pk
+        self.query_one('#search-results', OptionList).display = False
+        self.reload_table()
+
+    def jump_to_row(self) -> None:
+        """Move cursor to the row of the opened search result when it is shown."""
+        key = str(self.jump_to_pk)
+        data_table: DataTable = self.query_one(LedgerTable).query_one(DataTable)
+        if key not in data_table.rows:
+            return
+        data_table.move_cursor(row=data_table.get_row_index(key))
+        data_table.focus()
+
+    async def open_flow_details(self, pk: int) -> None:
+        """
+        Show flow in IODetail popup. Fresh cached flow is shown immediately
+        and revalidated in the background, otherwise it is requested first.
+        """
+        endpoint: Literal['outflows/', 'inflows/'] = self.endpoint_url
 
         def reload_table(code: str):
-            """Reloads the DataTable if the given code is 'DELETE' or 'PATCH'."""
-            if code != 'DELETE' and code != 'PATCH':
-                return
+            """Reloads the DataTable on 'DELETE', patches the row in place on 'PATCH'."""
+            if code == 'DELETE':
+                self.reload_table()
+            elif code == 'PATCH':
+                patched: JsonDict | None = self.ONE_OFF_API.local_store.get_flow(endpoint, pk)
+                if patched is None:
+                    self.reload_table()
+                else:
+                    self.patch_flow_row(endpoint, patched)
+
+        flow_data: JsonDict | None = self.ONE_OFF_API.cached_flow(self.endpoint_url, pk)
+        from_cache: bool = flow_data is not None
+        if flow_data is None:
+            flow_data = cast(
+                'JsonDict | None',
+                await self.ASYNC_ONE_OFF_API.get_flow(self.endpoint_url, pk=pk)
+            )
+        if not flow_data or not isinstance(flow_data.get('id'), int):
+            # Row shows a temporary id replaced by the server one or a removed flow
             self.reload_table()
+            return
 
-        row_key: RowKey = event.row_key
-        table_row: list = self.query_one(DataTable).get_row(row_key)
-        flow_data: JsonDict = cast('JsonDict', self.ONE_OFF_API.get_flow(self.endpoint_url, pk=table_row[1]))
-        self.app.push_screen(IODetail(flow_data, self.endpoint_url), reload_table)
+        detail_screen: IODetail = screens.IODetail.open(
+            self.app, flow_data, self.endpoint_url, callback=reload_table
+        )
+        if from_cache:
+            self.revalidate_flow_details(detail_screen, self.endpoint_url, pk, flow_data)
+
+    def patch_flow_row(self, endpoint: str, flow: 'JsonDict') -> None:
+        """
+        Apply changed flow to its row and the totals in place instead of refetching the month.
+        Flows not shown are ignored, a flow moved to other month is removed by a reload.
+        """
+        if self.search_index is not None:
+            self.search_index.add(endpoint, flow)
+        if self.VIRTUAL_TABLE:
+            self.reload_table()
+            return
+        ledger_table: LedgerTable = self.query_one(LedgerTable)
+        if endpoint != self.endpoint_url or str(flow.get('id')) not in ledger_table.rows:
+            return
+        in_shown_month: bool = str(flow.get('date', '')).startswith(f'{self.year:04d}-{self.month:02d}')
+        if not in_shown_month or not ledger_table.patch_row(flow):
+            self.reload_table()
 
-    def request_table_data(self) -> list[tuple]:
+    @work(thread=True, exclusive=True, group='flow-details', exit_on_error=False)
+    def revalidate_flow_details(
+        self,
+        detail_screen: 'IODetail',
+        endpoint: Literal['outflows/', 'inflows/'],
+        pk: int,
+        shown_data: 'JsonDict'
+    ) -> None:
+        """Ask API for the shown flow and update popup when the flow has changed."""
+        try:
+            flow_data = self.ONE_OFF_API.get_flow(endpoint, pk=pk, revalidate=True)
+        except RequestException:
+            return
+        if not flow_data or get_current_worker().is_cancelled:
+            return
+        if flow_data != shown_data:
+            self.app.call_from_thread(detail_screen.refresh_data, flow_data)
+
+    def request_table_data(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        year: int,
+        month: int
+    ) -> list[tuple]:
         """
         Call Pulporo endpoint and return a 2D list representing table.
         Each row in the table is numbered sequentially starting from 1.
         If servers returns empty list return empty 2D list.
+        With delta sync only changed flows are requested and month is read from the local mirror.
         """
+        if self.DELTA_SYNC:
+            self.ONE_OFF_API.sync_flows(endpoint)
+            return self.format_table_data(
+                self.ONE_OFF_API.get_local_flow(endpoint, {'year': year, 'month': month}) or []
+            )
+
+        if self.STREAM_RESPONSES:
+            return self.request_streamed_table_data(endpoint, year, month)
+
         data = cast(
             list['JsonDict'] | list,
             self.ONE_OFF_API.get_flow(
-                endpoint=self.endpoint_url,
-                param_dict={'year': self.year, 'month': self.month}
+                endpoint=endpoint,
+                param_dict={'year': year, 'month': month}
             )
         )
-        if not data:
+        return self.format_table_data(data)
+
+    def request_streamed_table_data(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        year: int,
+        month: int
+    ) -> list[tuple]:
+        """
+        Call Pulporo endpoint with a streamed response and return a 2D list representing table.
+        Rows are shown in batches of STREAM_BATCH_SIZE while the response is being decoded,
+        the returned table then reconciles them. Runs in the worker loading the table.
+        """
+        worker = get_current_worker()
+        request = (endpoint, year, month)
+        flows = self.ONE_OFF_API.iter_flow(endpoint=endpoint, param_dict={'year': year, 'month': month})
+        table_data: list[tuple] = [()]
+        while batch := list(islice(flows, self.STREAM_BATCH_SIZE)):
+            batch_data: list[tuple] = self.format_table_data(batch, start=len(table_data))
+            if table_data == [()]:
+                table_data = batch_data
+            else:
+                table_data.extend(batch_data[1:])
+            if worker.is_cancelled:
+                break
+            self.app.call_from_thread(self.show_streamed_rows, request, [table_data[0], *batch_data[1:]])
+        return table_data
+
+    def request_local_table_data(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        year: int,
+        month: int
+    ) -> list[tuple] | None:
+        """
+        Read month from the local mirror and return a 2D list representing table
+        or None when the month has never been received from the API.
+        """
+        data = self.ONE_OFF_API.get_local_flow(endpoint, {'year': year, 'month': month})
+        return None if data is None else self.format_table_data(data)
+
+    @staticmethod
+    def format_table_data(data: Iterable['JsonDict'], start: int = 1) -> list[tuple]:
+        """
+        Turn list or stream of flows into a 2D list representing table.
+        Each row in the table is numbered sequentially starting from `start`.
+        Empty list becomes empty 2D list.
+        """
+        rows = iter(data)
+        first_row: JsonDict | None = next(rows, None)
+        if first_row is None:
             return [()]
 
         # Columns names are extracted from keys of first row (1st row of 2d array)
-        formatted_table: list[tuple] = [('No', *[key.capitalize() for key in data[0]])]
-        formatted_table.extend([(num, *row.values()) for num, row in enumerate(data, start=1)])
+        formatted_table: list[tuple] = [('No', *Flow.headers_of(first_row)), (start, *first_row.values())]
+        formatted_table.extend((num, *row.values()) for num, row in enumerate(rows, start=start + 1))
         return formatted_table
 
+    @staticmethod
+    def table_flows(table_data: list[tuple]) -> list['JsonDict']:
+        """Turn 2D list representing table back into flows, reverse of `format_table_data`."""
+        if not table_data[0]:
+            return []
+        keys: list[str] = [header.lower() for header in table_data[0][1:]]
+        return [dict(zip(keys, row[1:])) for row in table_data[1:]]
+
+    def request_table_page(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        year: int,
+        month: int,
+        page: int,
+        page_size: int
+    ) -> tuple[int, tuple, list[tuple]]:
+        """
+        Call Pulporo endpoint for one page of flows and return total row count,
+        table header and numbered rows of the page. Page numbers start from 0.
+        """
+        row_count, data = self.ONE_OFF_API.get_flow_page(
+            endpoint, {'year': year, 'month': month}, page + 1, page_size
+        )
+        if not data:
+            return row_count, (), []
+
+        table_data: list[tuple] = self.format_table_data(data, start=page * page_size + 1)
+        return row_count, table_data[0], table_data[1:]
+
+    def create_virtual_table(self) -> VirtualLedgerTable:
+        """Create virtual table paging through current flow and month."""
+        loader = partial(self.request_table_page, self.endpoint_url, self.year, self.month)
+        return VirtualLedgerTable(loader, page_size=self.PAGE_SIZE, id='virtual-table')
+
     def reload_table(self) -> None:
-        """Remove and mount a new table to the ledger."""
-        self.query_one(LedgerTable).remove()
-        self.mount(LedgerTable(table_data=self.request_table_data()))
+        """
+        Show loading state and fetch data for the current flow and month
+        in a background worker. Starting a new fetch cancels the previous one.
+        In virtual mode replace the table with one paging through new data.
+        """
+        if self.VIRTUAL_TABLE:
+            self.query_one(VirtualLedgerTable).remove()
+            self.mount(self.create_virtual_table())
+            return
+
+        self.workers.cancel_group(self, 'ledger-prefetch')
+        ledger_table: LedgerTable = self.query_one(LedgerTable)
+        if ledger_table.table_content == [()]:
+            ledger_table.show_skeleton()
+        else:
+            ledger_table.loading = True
+        self.load_table_data(self.endpoint_url, self.year, self.month)
+
+    @work(thread=True, exclusive=True, group='ledger-table', exit_on_error=False)
+    def load_table_data(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        year: int,
+        month: int
+    ) -> None:
+        """
+        Show month from the local mirror first, then request table data
+        outside the event loop and reconcile the table with it.
+        """
+        worker = get_current_worker()
+        request = (endpoint, year, month)
+        local_data: list[tuple] | None = self.request_local_table_data(endpoint, year, month)
+        if local_data is not None and not worker.is_cancelled:
+            self.app.call_from_thread(self.show_table_data, request, local_data, False)
+
+        try:
+            table_data: list[tuple] = self.request_table_data(endpoint, year, month)
+        except (RequestException, ValueError):  # Unreachable API or malformed response body
+            if not worker.is_cancelled:
+                self.app.call_from_thread(self.show_request_error, local_data is not None)
+            return
+
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self.show_table_data, request, table_data)
+            self.ONE_OFF_API.local_store.save_snapshot(
+                self.SNAPSHOT_NAME, {'request': list(request), 'table': table_data}
+            )
+
+    def show_table_data(
+        self,
+        request: tuple[Literal['outflows/', 'inflows/'], int, int],
+        table_data: list[tuple],
+        reconciled: bool = True
+    ) -> None:
+        """
+        Update ledger table with rows that changed.
+        Drop the data when user has moved to other flow or month in the meantime.
+        Prefetch adjacent months once the data is reconciled with the API.
+        """
+        if request != (self.endpoint_url, self.year, self.month):
+            return
+        ledger_table: LedgerTable = self.query_one(LedgerTable)
+        ledger_table.update_rows(table_data)
+        ledger_table.loading = False
+        startup_timer.mark('first_data')
+        if self.jump_to_pk is not None:
+            self.jump_to_row()
+        if reconciled:
+            self.jump_to_pk = None  # Kept until rows are in the final order
+            if self.search_index is not None:
+                self.search_index.replace_month(*request, self.table_flows(table_data))
+        if reconciled and self.PREFETCH_MONTHS > 0 and not self.DELTA_SYNC:
+            self.prefetch_adjacent_months(*request)
+
+    def show_streamed_rows(
+        self,
+        request: tuple[Literal['outflows/', 'inflows/'], int, int],
+        table_data: list[tuple]
+    ) -> None:
+        """
+        Show a batch of rows of a streamed response. Rows shown before are kept
+        until the whole response reconciles the table.
+        """
+        if request != (self.endpoint_url, self.year, self.month):
+            return
+        ledger_table: LedgerTable = self.query_one(LedgerTable)
+        ledger_table.merge_rows(table_data)
+        ledger_table.loading = False
+
+    @work(thread=True, exclusive=True, group='ledger-prefetch', exit_on_error=False)
+    def prefetch_adjacent_months(
+        self,
+        endpoint: Literal['outflows/', 'inflows/'],
+        year: int,
+        month: int
+    ) -> None:
+        """
+        Warm API client cache with months around the shown one, nearest first.
+        Started only after shown month is loaded and cancelled on navigation,
+        so it never delays the request user waits for.
+        """
+        worker = get_current_worker()
+        for distance in range(1, self.PREFETCH_MONTHS + 1):
+            for delta in (distance, -distance):
+                if worker.is_cancelled:
+                    return
+                prefetch_year, prefetch_month = shift_month(year, month, delta)
+                try:
+                    self.ONE_OFF_API.get_flow(endpoint, {'year': prefetch_year, 'month': prefetch_month})
+                except RequestException:
+                    return
+
+    def show_request_error(self, offline_copy_shown: bool = False) -> None:
+        """Stop loading state and inform user that Pulporo API is unreachable."""
+        ledger_table: LedgerTable = self.query_one(LedgerTable)
+        ledger_table.loading = False
+        if ledger_table.table_content == [()]:
+            ledger_table.fill_table([()])  # Replace skeleton
+        if offline_copy_shown:
+            self.notify('Cannot reach Pulporo API, showing offline copy', severity='warning')
+        else:
+            self.notify('Cannot reach Pulporo API', severity='error')
 
     def update_button_variants(self, list_of_ids: Sequence[str], bt: Button) -> None:
         """Change all buttons to default variant and the chosen button to primary."""
@@ -2,8 +2,6 @@ from textual.app import ComposeResult
 from textual.containers import Container
 from textual.widgets import Static
 
-from requests import get
-
 
 def json_to_list(json_file: dict[str, str]) -> str:
     result: str = ''
@@ -21,6 +19,7 @@ class StaticWithLink(Static):
 
 class Media(Container):
     def compose(self) -> ComposeResult:
+        from requests import get
         json_data = get('http://127.0.0.1:8000/images/').json()
         links_markup = json_to_list(json_data)
         yield StaticWithLink(links_markup)